@@ -0,0 +1,232 @@
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+from common.db_adapter import create_model_build_job, get_model_build_job, list_model_build_jobs, update_model_build_job
+from .compute_profiles import DEFAULT_COMPUTE_PROFILE, ComputeProfile
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+# Flask app of a worker process, created once by the pool initializer
+_worker_app = None
+
+
+class BuildCancelled(Exception):
+    """
+    Raised inside a build when its job has been asked to stop.
+    """
+
+
+def _init_worker():
+    """
+    Give each worker process its own Flask app and database engine; connections are never shared across processes.
+    """
+    global _worker_app
+    from flask import Flask
+    from common import Config, db
+
+    _worker_app = Flask(__name__)
+    _worker_app.config.from_object(Config)
+    db.init_app(_worker_app)
+
+
+def report_progress(job_id, stage, progress):
+    """
+    Persist a build's stage and progress, stopping the build if its job was cancelled or deleted.
+
+    Args:
+        job_id (str): The job ID.
+        stage (str): The stage the build has reached.
+        progress (float): Fraction of the build done.
+
+    Raises:
+        BuildCancelled: If the job asked to stop or its row no longer exists.
+    """
+    job = update_model_build_job(job_id, stage=stage, progress=progress)
+    if job is None:
+        raise BuildCancelled(f"Build job {job_id} no longer exists.")
+    if job.cancel_requested:
+        raise BuildCancelled(f"Build job {job_id} cancelled during {stage}.")
+
+
+def run_build_job(job_id, model_config_id, profile_dir=None, compute_profile=DEFAULT_COMPUTE_PROFILE, incremental=False):
+    """
+    Worker entry point: run ``DataPreparationPipeline.build_model`` (``retrain_incremental`` for incremental
+    jobs) and persist its progress and logs on the job.
+
+    The build runs under its compute profile: the estimators and parallel stages get the profile's thread
+    counts, and the BLAS and OpenMP pools of the worker are capped at them for the duration of the build.
+
+    Args:
+        job_id (str): The job ID.
+        model_config_id (int): The ID of the model config to build.
+        profile_dir (str): When set, the build runs under cProfile and dumps ``build_<job_id>.pstats`` there.
+        compute_profile (str): Name of the build's compute profile (see ``COMPUTE_PROFILES``).
+        incremental (bool): Update the saved model with the bars ingested since its last training instead.
+
+    Returns:
+        str: The final job status.
+    """
+    from .data_preparation_pipeline import DataPreparationPipeline
+
+    with _worker_app.app_context():
+        job = get_model_build_job(job_id)
+        if job is None or job.cancel_requested:
+            update_model_build_job(job_id, status=CANCELLED, finished_at=datetime.utcnow())
+            return CANCELLED
+        update_model_build_job(job_id, status=RUNNING, started_at=datetime.utcnow())
+
+        try:
+            profile_path = os.path.join(profile_dir, f"build_{job_id}.pstats") if profile_dir else None
+            profile = ComputeProfile.from_name(compute_profile)
+            with profile.limits():
+                pipeline = DataPreparationPipeline(model_config_id, compute_profile=profile)
+                if incremental:
+                    build_logs = pipeline.retrain_incremental(progress_callback=partial(report_progress, job_id))
+                else:
+                    build_logs = pipeline.build_model(progress_callback=partial(report_progress, job_id), profile_path=profile_path)
+            update_model_build_job(
+                job_id,
+                status=SUCCEEDED,
+                stage="completed",
+                progress=1.0,
+                build_logs=build_logs,
+                metrics=build_logs.get("model_metrics"),
+                finished_at=datetime.utcnow()
+            )
+            return SUCCEEDED
+        except BuildCancelled as e:
+            logging.info(str(e))
+            update_model_build_job(job_id, status=CANCELLED, finished_at=datetime.utcnow())
+            return CANCELLED
+        except Exception as e:
+            logging.error(f"Build job {job_id} failed", exc_info=True)
+            update_model_build_job(job_id, status=FAILED, error=str(e)[:2000], finished_at=datetime.utcnow())
+            return FAILED
+
+
+class BuildJobQueue:
+    """
+    Runs model builds in a pool of worker processes so HTTP requests only enqueue them.
+
+    Job state lives in the ``model_build_job`` table: the API process creates the row and the worker updates
+    its stage, progress and final build logs. Cancellation of a running build is cooperative and takes effect
+    when the build reaches its next stage.
+    """
+
+    def __init__(self, max_workers=2):
+        """
+        Initialize the BuildJobQueue.
+
+        Args:
+            max_workers (int): Number of worker processes.
+        """
+        # Spawned workers never inherit the server's threads, sockets or database connections
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+        self.futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, model_config_id, profile_dir=None, compute_profile=DEFAULT_COMPUTE_PROFILE, incremental=False):
+        """
+        Queue a build of a model config.
+
+        Args:
+            model_config_id (int): The ID of the model config to build.
+            profile_dir (str): Directory for the build's cProfile stats; None runs it without cProfile.
+            compute_profile (str): Name of the build's compute profile: "interactive", "batch" or "background".
+            incremental (bool): Queue an incremental retrain (see ``retrain_incremental``) instead of a full build.
+
+        Returns:
+            str: The job ID.
+
+        Raises:
+            ValueError: If the compute profile is unknown.
+        """
+        try:
+            # An unknown profile is rejected before a job is created for it
+            ComputeProfile.from_name(compute_profile)
+            job_id = uuid.uuid4().hex
+            create_model_build_job(job_id, model_config_id)
+            future = self.executor.submit(run_build_job, job_id, model_config_id, profile_dir, compute_profile, incremental)
+            with self._lock:
+                self.futures[job_id] = future
+            future.add_done_callback(lambda _: self._forget(job_id))
+            kind = "Incremental retrain" if incremental else "Build"
+            logging.info(f"{kind} job {job_id} queued for model config {model_config_id} with the {compute_profile} compute profile.")
+            return job_id
+        except Exception as e:
+            logging.error("Error submitting build job", exc_info=True)
+            raise e
+
+    def has_pending_job(self, model_config_id):
+        """
+        Whether a job of the model config is still queued or running.
+        """
+        return any(job.status not in FINISHED_STATUSES for job in list_model_build_jobs(model_config_id))
+
+    def _forget(self, job_id):
+        with self._lock:
+            self.futures.pop(job_id, None)
+
+    def cancel(self, job_id):
+        """
+        Cancel a job: a queued job is dropped immediately, a running one stops at its next stage.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            ModelBuildJob: The updated job, or None if not found.
+        """
+        try:
+            job = get_model_build_job(job_id)
+            if job is None or job.status in FINISHED_STATUSES:
+                return job
+
+            with self._lock:
+                future = self.futures.get(job_id)
+            if future is not None and future.cancel():
+                return update_model_build_job(job_id, status=CANCELLED, cancel_requested=True, finished_at=datetime.utcnow())
+            return update_model_build_job(job_id, cancel_requested=True)
+        except Exception as e:
+            logging.error("Error cancelling build job", exc_info=True)
+            raise e
+
+    def shutdown(self, wait=True):
+        """
+        Stop accepting jobs and shut the worker processes down.
+        """
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_build_job_queue(max_workers=2):
+    """
+    Return the process-wide BuildJobQueue, creating it on first use.
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = BuildJobQueue(max_workers)
+    return _queue
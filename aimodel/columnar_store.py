@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class ColumnarStore:
+    """
+    Append-only on-disk table with one raw binary file per column.
+
+    Chunks are appended column by column, and reads memory-map the files, so datasets larger than memory can be
+    produced and consumed a slice at a time.
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(self, path):
+        """
+        Initialize the ColumnarStore.
+
+        Args:
+            path (str): Directory holding the column files and the metadata.
+        """
+        self.path = path
+        self.meta = self._load_meta()
+
+    def _load_meta(self):
+        meta_path = os.path.join(self.path, self.META_FILE)
+        if not os.path.exists(meta_path):
+            return {"columns": [], "dtypes": {}, "rows": 0}
+        with open(meta_path) as f:
+            return json.load(f)
+
+    def _save_meta(self):
+        os.makedirs(self.path, exist_ok=True)
+        meta_path = os.path.join(self.path, self.META_FILE)
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(self.meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def _column_path(self, column):
+        return os.path.join(self.path, f"{column}.bin")
+
+    @property
+    def columns(self):
+        """
+        list: Stored column names, in order.
+        """
+        return list(self.meta["columns"])
+
+    @property
+    def rows(self):
+        """
+        int: Number of stored rows.
+        """
+        return self.meta["rows"]
+
+    def clear(self):
+        """
+        Delete every stored column and reset the metadata.
+        """
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+        self.meta = {"columns": [], "dtypes": {}, "rows": 0}
+
+    def append(self, df):
+        """
+        Append a chunk of rows. The first chunk fixes the schema.
+
+        Args:
+            df (pd.DataFrame): Chunk with the store's columns (numeric or datetime dtypes).
+
+        Raises:
+            ValueError: If the chunk's columns or dtypes do not match the stored schema.
+        """
+        if not self.meta["columns"]:
+            for column in df.columns:
+                if df[column].dtype == object:
+                    raise ValueError(f"Column '{column}' has object dtype and cannot be stored.")
+            self.meta["columns"] = [str(column) for column in df.columns]
+            self.meta["dtypes"] = {str(column): df[column].dtype.str for column in df.columns}
+        elif [str(column) for column in df.columns] != self.meta["columns"]:
+            raise ValueError(f"Chunk columns {list(df.columns)} do not match the store columns {self.meta['columns']}.")
+
+        os.makedirs(self.path, exist_ok=True)
+        for column in self.meta["columns"]:
+            values = np.ascontiguousarray(df[column].to_numpy(), dtype=np.dtype(self.meta["dtypes"][column]))
+            with open(self._column_path(column), "ab") as f:
+                values.tofile(f)
+
+        self.meta["rows"] += len(df)
+        self._save_meta()
+
+    def read(self, columns=None, start=0, stop=None):
+        """
+        Read a row range as a DataFrame backed by read-only memory maps.
+
+        Args:
+            columns (list): Columns to read, all by default.
+            start (int): First row.
+            stop (int): Row after the last one, the end of the store by default.
+
+        Returns:
+            pd.DataFrame: The requested slice.
+        """
+        columns = columns or self.columns
+        stop = self.rows if stop is None else min(stop, self.rows)
+        length = max(stop - start, 0)
+        data = {}
+        for column in columns:
+            dtype = np.dtype(self.meta["dtypes"][column])
+            if length == 0:
+                data[column] = np.empty(0, dtype=dtype)
+                continue
+            mapped = np.memmap(self._column_path(column), dtype=dtype, mode="r", shape=(self.rows,))
+            data[column] = mapped[start:stop]
+        return pd.DataFrame(data, index=pd.RangeIndex(start, start + length), copy=False)
+
+    def iter_chunks(self, chunk_rows, columns=None):
+        """
+        Iterate over the store in consecutive row ranges.
+
+        Args:
+            chunk_rows (int): Rows per chunk.
+            columns (list): Columns to read, all by default.
+
+        Yields:
+            pd.DataFrame: Memory-mapped chunks of at most ``chunk_rows`` rows.
+        """
+        for start in range(0, self.rows, chunk_rows):
+            yield self.read(columns, start, start + chunk_rows)
@@ -0,0 +1,112 @@
+import logging
+import os
+
+from joblib import effective_n_jobs
+from threadpoolctl import threadpool_limits
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Share of the cores a build may use, and the histogram bins of boosted trees (fewer bins, smaller histograms)
+COMPUTE_PROFILES = {
+    # Someone is waiting for the build: every core
+    "interactive": {"cpu_fraction": 1.0, "max_bin": 256},
+    # Queued builds, BUILD_JOB_WORKERS of which run side by side
+    "batch": {"cpu_fraction": 0.5, "max_bin": 256},
+    # Scheduled retrains next to the live server: a quarter of the cores and coarser histograms
+    "background": {"cpu_fraction": 0.25, "max_bin": 64},
+}
+DEFAULT_COMPUTE_PROFILE = "batch"
+
+
+class ComputeProfile:
+    """
+    Resources a build may take: the thread count of every estimator and parallel stage, and the tree method
+    and histogram size of boosted trees.
+
+    ``estimator_params`` overrides the resource parameters of the configured estimator (``n_jobs``, which
+    XGBoost maps to ``nthread``, and ``tree_method``/``max_bin``), ``n_jobs`` caps the worker processes of the
+    parallel stages, and ``limits`` caps the BLAS and OpenMP thread pools of the process (NumPy, SciPy,
+    scikit-learn and XGBoost's own OpenMP runtime) for code that takes no ``n_jobs``.
+    """
+
+    def __init__(self, name, threads, tree_method="hist", max_bin=256):
+        """
+        Initialize the ComputeProfile.
+
+        Args:
+            name (str): Profile name, for the build logs.
+            threads (int): Threads and worker processes a build may use.
+            tree_method (str): XGBoost tree method.
+            max_bin (int): XGBoost histogram bins per feature.
+        """
+        if threads < 1:
+            raise ValueError("A compute profile needs at least one thread.")
+        self.name = name
+        self.threads = threads
+        self.tree_method = tree_method
+        self.max_bin = max_bin
+
+    @classmethod
+    def from_name(cls, name, cpu_count=None):
+        """
+        Create one of the ``COMPUTE_PROFILES`` for this machine.
+
+        Args:
+            name (str): "interactive", "batch" or "background".
+            cpu_count (int): Cores of the machine; detected by default.
+
+        Returns:
+            ComputeProfile: The profile.
+        """
+        if name not in COMPUTE_PROFILES:
+            raise ValueError(f"Unsupported compute profile: {name}")
+        settings = COMPUTE_PROFILES[name]
+        cpu_count = cpu_count or os.cpu_count() or 1
+        return cls(name, max(1, int(cpu_count * settings["cpu_fraction"])), max_bin=settings["max_bin"])
+
+    def estimator_params(self, method):
+        """
+        Parameters of a ModelEngine method that the profile sets over the configured ones.
+
+        Args:
+            method (str): ModelEngine method, e.g. "xgboost".
+
+        Returns:
+            dict: The parameters; SVC has no thread setting and gets none.
+        """
+        params = {
+            "xgboost": {"n_jobs": self.threads, "tree_method": self.tree_method, "max_bin": self.max_bin},
+            "randomForest": {"n_jobs": self.threads},
+            "logisticRegression": {"n_jobs": self.threads},
+            "sgdClassifier": {"n_jobs": self.threads},
+        }
+        return params.get(method, {})
+
+    def n_jobs(self, requested=-1):
+        """
+        Worker processes of a parallel stage: the requested number (-1 for all cores), at most the profile's threads.
+        """
+        return min(effective_n_jobs(requested), self.threads)
+
+    def limits(self):
+        """
+        Context manager capping the BLAS and OpenMP thread pools of this process at the profile's threads.
+        """
+        return threadpool_limits(limits=self.threads)
+
+    def to_dict(self):
+        """
+        The profile's settings, for the build logs.
+        """
+        return {"name": self.name, "threads": self.threads, "tree_method": self.tree_method, "max_bin": self.max_bin}
+
+
+def resolve_compute_profile(profile):
+    """
+    A ComputeProfile from a profile or its name; None stays None (library defaults).
+    """
+    if profile is None or isinstance(profile, ComputeProfile):
+        return profile
+    return ComputeProfile.from_name(profile)
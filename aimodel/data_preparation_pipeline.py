@@ -1,12 +1,28 @@
 import logging
-from common.db_adapter import get_model_config_by_id, get_ohlcv_records_by_interval
+from common.db_adapter import get_model_config_by_id, get_ohlcv_records_by_interval, update_model_config, update_model_fields
 from .technical_indicator_generator import TechnicalIndicatorGenerator
+from .feature_engine import FeatureEngine, select_features_config
+from .columnar_store import ColumnarStore
+from .compute_profiles import resolve_compute_profile
 from .labeling_engine import LabelingEngine
 from .model_engine import ModelEngine
+from .feature_matrix import FeatureMatrix, clear_dmatrix_cache
+from .feature_pruning import FeaturePruner
+from .time_series_cv import WalkForwardCV, holdout_split
+from .hyperparameter_search import HyperparameterSearch
+from .incremental_training import continue_training
+from .model_registry import ARTIFACT_FILE, ModelRegistry, data_hash
+from .out_of_core import (
+    DEFAULT_MEMORY_BUDGET_MB, FEATURE_STORE_DIR, StoreChunks, chunk_rows_for_budget, out_of_core_mode, predict_out_of_core,
+    train_out_of_core,
+)
+from .sampling import MajoritySampler
+from .regime import REGIME_COLUMN, REGIMES, RegimeClassifier, RegimeRouter
+from .stage_profiler import StageProfiler
 import pandas as pd
 import os
+import time
 import joblib
-from sklearn.model_selection import train_test_split
 import numpy as np
 
 # Configure logging
@@ -18,15 +34,18 @@ def map_labels(y):
         return y.map(label_mapping)
 
 class DataPreparationPipeline:
-    def __init__(self, model_config_id):
+    def __init__(self, model_config_id, compute_profile=None):
         """
         Initialize the DataPreparationPipeline with a model configuration ID.
 
         Args:
             model_config_id (int): The ID of the model configuration.
+            compute_profile (ComputeProfile or str): Resources of the builds (see ``ComputeProfile``); None leaves
+                thread counts and tree methods to the configured parameters and library defaults.
         """
         self.model_config_id = model_config_id
         self.model_config = None
+        self.compute_profile = resolve_compute_profile(compute_profile)
 
     def fetch_model_config(self):
         """
@@ -68,21 +87,7 @@ class DataPreparationPipeline:
             if not records:
                 raise ValueError("No time series data found for the given configuration.")
 
-            # Convert records to DataFrame
-            data = [
-                {
-                    "open_time": record.open_time,
-                    "open": record.open,
-                    "high": record.high,
-                    "low": record.low,
-                    "close": record.close,
-                    "volume": record.volume,
-                    "time": record.close_time,
-                    "close_time": record.close_time,
-                }
-                for record in records
-            ]
-            df = pd.DataFrame(data)
+            df = self._records_to_dataframe(records)
             logging.info(f"Time series data fetched with {len(df)} rows.")
             return df
         except KeyError as e:
@@ -92,12 +97,86 @@ class DataPreparationPipeline:
             logging.error("Error fetching time series data", exc_info=True)
             raise e
 
-    def generate_indicators(self, df):
+    def fetch_timeseries_chunks(self, chunk_rows):
+        """
+        Fetch the training time series as consecutive, time-ordered chunks of at most ``chunk_rows`` bars.
+
+        Each chunk is a separate close-time range query, so only one chunk of records is held in memory.
+
+        Args:
+            chunk_rows (int): Number of bars per chunk.
+
+        Yields:
+            pd.DataFrame: OHLCV chunks with the same columns as ``fetch_timeseries_data``.
+        """
+        try:
+            training_config = self.model_config.training_dataset_config
+            if not training_config or not isinstance(training_config, dict):
+                raise ValueError("Invalid or missing training_dataset_config in model configuration.")
+
+            symbol = training_config["symbol"]
+            start_time = int(training_config["startdate"])
+            end_time = int(training_config["enddate"])
+            interval = int(training_config["interval"].rstrip('m'))
+            # Chunk spans are whole multiples of the interval so the interval filter stays aligned with start_time
+            span = chunk_rows * max(interval, 1) * 60 * 1000
+
+            total_rows = 0
+            for chunk_start in range(start_time, end_time + 1, span):
+                chunk_end = min(chunk_start + span - 1, end_time)
+                records = get_ohlcv_records_by_interval(symbol, chunk_start, chunk_end, interval)
+                if not records:
+                    continue
+                df = self._records_to_dataframe(records)
+                if not df["close_time"].is_monotonic_increasing:
+                    df = df.sort_values(by="close_time", ignore_index=True)
+                total_rows += len(df)
+                yield df
+
+            if total_rows == 0:
+                raise ValueError("No time series data found for the given configuration.")
+            logging.info(f"Time series data streamed with {total_rows} rows.")
+        except KeyError as e:
+            logging.error(f"Missing key in training_dataset_config: {e}, Config: {self.model_config.training_dataset_config}")
+            raise e
+        except Exception as e:
+            logging.error("Error fetching time series chunks", exc_info=True)
+            raise e
+
+    @staticmethod
+    def _records_to_dataframe(records):
+        """
+        Convert OHLCV records to a DataFrame.
+
+        Args:
+            records (list): OhlcvData records.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing OHLCV data.
+        """
+        data = [
+            {
+                "open_time": record.open_time,
+                "open": record.open,
+                "high": record.high,
+                "low": record.low,
+                "close": record.close,
+                "volume": record.volume,
+                "time": record.close_time,
+                "close_time": record.close_time,
+            }
+            for record in records
+        ]
+        return pd.DataFrame(data)
+
+    def generate_indicators(self, df, indicators=None):
         """
         Generate technical indicators for the provided DataFrame.
 
         Args:
             df (pd.DataFrame): The OHLCV DataFrame.
+            indicators (list): Indicator configurations to compute instead of those of the model config, e.g. the
+                reduced ``features_config`` a pruned model was registered with.
 
         Returns:
             pd.DataFrame: The DataFrame with technical indicators added.
@@ -107,7 +186,8 @@ class DataPreparationPipeline:
             if not hasattr(self.model_config, 'features_config') or not isinstance(self.model_config.features_config, dict):
                 raise ValueError("Invalid features_config in the model configuration.")
 
-            indicators = self.model_config.features_config.get("indicators", [])
+            if indicators is None:
+                indicators = self.model_config.features_config.get("indicators", [])
             if not isinstance(indicators, list):
                 raise ValueError("The 'indicators' field in features_config must be a list.")
 
@@ -120,6 +200,43 @@ class DataPreparationPipeline:
             logging.error("Error generating indicators", exc_info=True)
             raise e
 
+    def generate_indicators_to_store(self, store_path, chunk_rows=100_000):
+        """
+        Generate technical indicators out of core, chunk by chunk, into a columnar store.
+
+        Consecutive chunks overlap by the feature engine's warm-up, so the stored rows match
+        ``generate_indicators`` over the full history without ever holding it in memory.
+
+        Args:
+            store_path (str): Directory of the columnar store. Existing contents are replaced.
+            chunk_rows (int): Number of bars fetched and computed per chunk.
+
+        Returns:
+            ColumnarStore: The store holding the feature rows.
+        """
+        try:
+            if not hasattr(self.model_config, 'features_config') or not isinstance(self.model_config.features_config, dict):
+                raise ValueError("Invalid features_config in the model configuration.")
+
+            indicators = self.model_config.features_config.get("indicators", [])
+            if not isinstance(indicators, list):
+                raise ValueError("The 'indicators' field in features_config must be a list.")
+
+            interval = int(self.model_config.training_dataset_config["interval"].rstrip('m'))
+            engine = FeatureEngine(indicators)
+            store = ColumnarStore(store_path)
+            store.clear()
+
+            chunks = self.fetch_timeseries_chunks(chunk_rows)
+            for features in engine.compute_chunks(chunks, base_interval_ms=interval * 60 * 1000):
+                if not features.empty:
+                    store.append(features)
+            logging.info(f"Technical indicators streamed to {store_path} with {store.rows} rows.")
+            return store
+        except Exception as e:
+            logging.error("Error generating indicators to the columnar store", exc_info=True)
+            raise e
+
     def apply_labeling(self, df):
         """
         Apply labeling to the DataFrame using the labeling configuration.
@@ -145,16 +262,64 @@ class DataPreparationPipeline:
             logging.error("Error applying labeling", exc_info=True)
             raise e
 
-    def build_model(self, test_data=None):
+    def sweep_labels(self, horizons, thresholds, threshold_type="percent"):
+        """
+        Compute label distributions over a grid of horizons and thresholds with a single data fetch and
+        indicator pass.
+
+        Args:
+            horizons (list): Look-aheads in rows.
+            thresholds (list): Labeling thresholds.
+            threshold_type (str): "percent" or "absolute".
+
+        Returns:
+            list: Label distribution and class-balance stats per (horizon, threshold).
+        """
+        try:
+            df = self.fetch_timeseries_data()
+            df_with_indicators = self.generate_indicators(df)
+            labeling_engine = LabelingEngine(self.model_config.label_config)
+            results = labeling_engine.label_sweep(df_with_indicators, horizons, thresholds, threshold_type)
+            logging.info(f"Label sweep computed for {len(horizons)} horizons and {len(thresholds)} thresholds.")
+            return results
+        except Exception as e:
+            logging.error("Error sweeping labels", exc_info=True)
+            raise e
+
+    def build_model(self, test_data=None, progress_callback=None, profile_path=None):
         """
         Build and train a machine learning model, and return the logs.
 
+        Every stage is profiled (see ``StageProfiler``): ``build_logs["profile"]`` holds its wall time, CPU time,
+        peak memory growth and output rows/columns.
+
+        The final fit can stop boosting early (``early_stopping`` in the model config, validated on the end of the
+        training period). It, the regime models and the sampling baseline are bounded by ``time_budget_seconds``, a
+        wall-clock budget for the whole build: the time left of it when each of them starts is the time their
+        trees may grow. ``build_logs["training"]`` records the rounds used against those requested, and the
+        regime and baseline logs their own.
+
+        With ``sampling`` in the model config the HOLD majority of the training rows is downsampled before any fit
+        (see ``MajoritySampler``) and the kept rows carry inverse-probability weights into the final fit.
+        ``build_logs["sampling"]`` records the reduction and the fit time and test metrics of the sampled model,
+        and with ``compare_baseline`` those of a model trained on every training row.
+
+        The pipeline's compute profile sets the threads, tree method and histogram size of every estimator and
+        caps the worker processes of the parallel stages; ``build_logs["compute_profile"]`` records it. The BLAS
+        and OpenMP thread limits of the profile are applied around the build by the job runner.
+
         Args:
             test_data (tuple or None): External test dataset as (X_test, y_test) or None for auto-splitting.
+            progress_callback (callable): Called as ``progress_callback(stage, progress)`` when each stage starts,
+                with ``progress`` the completed fraction of the build. An exception raised by the callback aborts
+                the build, which is how background jobs are cancelled.
+            profile_path (str): When set, the build also runs under cProfile and its stats are dumped to this file.
 
         Returns:
-            dict: Logs summarizing the build process, including data summary, metrics, and execution steps.
+            dict: Logs summarizing the build process, including data summary, metrics, execution steps and profile.
         """
+        profiler = StageProfiler(progress_callback, profile_path).start()
+        build_start = time.perf_counter()
         try:
             # Initialize logging structure
             build_logs = {
@@ -165,65 +330,231 @@ class DataPreparationPipeline:
             }
 
             # Fetch and prepare model configuration
-            self.fetch_model_config()
+            with profiler.stage("fetch_model_config", 0.0):
+                self.fetch_model_config()
             build_logs["execution_summary"]["steps"].append("Model configuration fetched successfully.")
+            if self.compute_profile is not None:
+                build_logs["compute_profile"] = self.compute_profile.to_dict()
+
+            out_of_core_config = self.model_config.model_config.get("out_of_core")
+            if out_of_core_config and out_of_core_config.get("enabled", True):
+                if test_data is not None:
+                    raise ValueError("An external test dataset cannot be used with out-of-core training.")
+                build_logs = self._build_out_of_core(profiler, build_logs, out_of_core_config)
+                profiler.stop()
+                build_logs["profile"] = profiler.summary()
+                return self._make_json_serializable(build_logs)
 
             # Fetch and process time series data
-            df = self.fetch_timeseries_data()
+            with profiler.stage("fetch_timeseries_data", 0.05) as stage:
+                df = stage.shape(self.fetch_timeseries_data())
             build_logs["execution_summary"]["steps"].append(f"Time series data fetched with {len(df)} rows.")
-            df_with_indicators = self.generate_indicators(df)
+            with profiler.stage("generate_indicators", 0.25) as stage:
+                df_with_indicators = stage.shape(self.generate_indicators(df))
             build_logs["execution_summary"]["steps"].append("Technical indicators generated successfully.")
 
             # Apply labeling
-            labeled_df = self.apply_labeling(df_with_indicators)
+            with profiler.stage("apply_labeling", 0.4) as stage:
+                labeled_df = stage.shape(self.apply_labeling(df_with_indicators))
             build_logs["execution_summary"]["steps"].append("Labeling applied successfully.")
             build_logs["data_summary"]["label_distribution"] = labeled_df["label"].value_counts().to_dict()
 
-            # Prepare features and labels
-            feature_columns = [col for col in labeled_df.columns if col not in ["label", "open_time", "close_time"]]
-            X, y = labeled_df[feature_columns], labeled_df["label"]
-
-            # Stratified splitting or use external test data
-            if test_data is None:
-                X_train, X_test, y_train, y_test = train_test_split(
-                    X, y, test_size=0.2, random_state=42, stratify=y
+            # Regime of every bar, classified over the whole fetched history
+            regime_config = self.model_config.model_config.get("regimes")
+            if regime_config and regime_config.get("enabled", True):
+                with profiler.stage("classify_regimes", 0.42) as stage:
+                    labeled_df = stage.shape(self.classify_regimes(df, labeled_df, regime_config))
+                regime_counts = labeled_df[REGIME_COLUMN].value_counts()
+                build_logs["data_summary"]["regime_distribution"] = {REGIMES[code]: int(count) for code, count in regime_counts.items()}
+                build_logs["execution_summary"]["steps"].append("Market regimes classified successfully.")
+            else:
+                regime_config = None
+
+            with profiler.stage("prepare_training_matrix") as stage:
+                # Prepare features and labels
+                feature_columns, y = self._feature_columns(labeled_df), labeled_df["label"]
+
+                # Chronological splitting or use external test data
+                horizon = LabelingEngine(self.model_config.label_config).label_horizon()
+                if test_data is None:
+                    # The rows whose labels look into the test period are purged from the training set
+                    train_rows, test_rows = holdout_split(len(labeled_df), test_size=0.2, gap=horizon)
+                    # Only the test rows are copied out as a frame; the training rows go straight into the float32 matrix
+                    X_test = labeled_df.iloc[test_rows][feature_columns]
+                    y_train, y_test = y.iloc[train_rows], y.iloc[test_rows]
+                    logging.info(f"Training label distribution: {y_train.value_counts().to_dict()}")
+                    logging.info(f"Testing label distribution: {y_test.value_counts().to_dict()}")
+                    build_logs["data_summary"]["training_label_distribution"] = y_train.value_counts().to_dict()
+                    build_logs["data_summary"]["testing_label_distribution"] = y_test.value_counts().to_dict()
+                else:
+                    train_rows, X_test, y_train, y_test = slice(None), test_data[0], y, test_data[1]
+                    logging.info(f"Using external test dataset: Training samples={len(y_train)}, Testing samples={X_test.shape[0]}")
+                    build_logs["execution_summary"]["steps"].append(f"Using external test dataset with {len(y_train)} training samples and {X_test.shape[0]} testing samples.")
+
+                # Map labels for XGBoost compatibility if required
+                if self.model_config.model_config["method"] == "xgboost":
+                    logging.info("Mapping labels for XGBoost compatibility.")
+                    build_logs["execution_summary"]["steps"].append("Mapping labels for XGBoost compatibility.")
+                    y_train = map_labels(y_train)
+                    y_test = map_labels(y_test)
+
+                # One contiguous float32 matrix of the training period serves the search, every CV fold and the final fit
+                train_matrix = stage.shape(FeatureMatrix.from_frame(labeled_df, feature_columns, y_train, rows=train_rows))
+                build_logs["data_summary"]["training_matrix"] = {
+                    "rows": len(train_matrix), "columns": len(train_matrix.columns), "dtype": "float32", "nbytes": train_matrix.nbytes
+                }
+                # Incremental retrains continue from the bar after the last training row
+                last_train_row = range(len(labeled_df))[train_rows][-1]
+
+            # Downsample the majority (HOLD) label of the training rows; the test rows are never sampled
+            sampling_config = self.model_config.model_config.get("sampling")
+            sample_weight = None
+            if sampling_config and sampling_config.get("enabled", True):
+                full_train_rows, full_y_train = train_rows, y_train
+                with profiler.stage("sample_training_set", 0.44) as stage:
+                    sampling = MajoritySampler.from_config(sampling_config).sample(labeled_df["label"].to_numpy()[train_rows])
+                    kept, sample_weight = sampling["rows"], sampling["sample_weight"]
+                    # The weights travel with the matrix into the search, pruning, CV and regime fits
+                    train_matrix = stage.shape(FeatureMatrix(
+                        train_matrix.values[kept], train_matrix.labels[kept], columns=train_matrix.columns, sample_weight=sample_weight
+                    ))
+                    train_rows, y_train = np.arange(len(labeled_df))[train_rows][kept], y_train.iloc[kept]
+                build_logs["sampling"] = sampling["summary"]
+                build_logs["data_summary"]["training_matrix"].update(rows=len(train_matrix), nbytes=train_matrix.nbytes)
+                build_logs["execution_summary"]["steps"].append(
+                    f"Training set sampled from {sampling['summary']['rows_before']} to {sampling['summary']['rows_after']} rows."
                 )
-                logging.info(f"Training label distribution: {y_train.value_counts().to_dict()}")
-                logging.info(f"Testing label distribution: {y_test.value_counts().to_dict()}")
-                build_logs["data_summary"]["training_label_distribution"] = y_train.value_counts().to_dict()
-                build_logs["data_summary"]["testing_label_distribution"] = y_test.value_counts().to_dict()
             else:
-                X_train, X_test, y_train, y_test = X, test_data[0], y, test_data[1]
-                logging.info(f"Using external test dataset: Training samples={X_train.shape[0]}, Testing samples={X_test.shape[0]}")
-                build_logs["execution_summary"]["steps"].append(f"Using external test dataset with {X_train.shape[0]} training samples and {X_test.shape[0]} testing samples.")
+                sampling_config = None
+
+            # Hyperparameter search on the training period; the best parameters replace those of the config
+            search_config = self.model_config.model_config.get("search")
+            if search_config and search_config.get("enabled", True):
+                with profiler.stage("search_hyperparameters", 0.45) as stage:
+                    stage.shape(train_matrix)
+                    build_logs["hyperparameter_search"] = self.search_hyperparameters(train_matrix, y_train, search_config, purge=horizon)
+                build_logs["execution_summary"]["steps"].append(
+                    f"Hyperparameter search completed with best parameters {build_logs['hyperparameter_search']['best_params']}."
+                )
 
-            # Map labels for XGBoost compatibility if required
-            if self.model_config.model_config["method"] == "xgboost":
-                logging.info("Mapping labels for XGBoost compatibility.")
-                build_logs["execution_summary"]["steps"].append("Mapping labels for XGBoost compatibility.")
-                y_train = map_labels(y_train)
-                y_test = map_labels(y_test)
+            # Importance-driven pruning; validation and the final fit run on the kept features only
+            pruning_config = self.model_config.model_config.get("pruning")
+            if pruning_config and pruning_config.get("enabled", True):
+                with profiler.stage("prune_features", 0.48) as stage:
+                    pruning = FeaturePruner.from_config({**pruning_config, "n_jobs": self._n_jobs(pruning_config.get("n_jobs", -1))}).fit(
+                        self._model_engine().create_model(), train_matrix, purge=horizon
+                    )
+                    feature_columns = pruning["selected"]
+                    train_matrix = stage.shape(train_matrix.select(feature_columns))
+                    X_test = X_test[feature_columns]
+                build_logs["feature_pruning"] = pruning
+                build_logs["data_summary"]["training_matrix"].update(columns=len(feature_columns), nbytes=train_matrix.nbytes)
+                build_logs["execution_summary"]["steps"].append(
+                    f"Feature pruning kept {len(feature_columns)} of {len(pruning['importances'])} features."
+                )
 
-            # Train and test the model
-            model_engine = ModelEngine(self.model_config.model_config)
+            model_engine = self._model_engine()
             model_engine.create_model()
             build_logs["execution_summary"]["steps"].append("Model created successfully.")
 
-            model_engine.train_model(X_train, y_train)
-            build_logs["execution_summary"]["steps"].append("Model trained successfully.")
+            # Walk-forward cross-validation on the training period; "validation": {"n_splits": 0} turns it off
+            validation_config = self.model_config.model_config.get("validation") or {}
+            if validation_config.get("n_splits", 5) > 0:
+                with profiler.stage("cross_validate", 0.5) as stage:
+                    stage.shape(train_matrix)
+                    cv = WalkForwardCV.from_config(validation_config, purge=horizon)
+                    build_logs["cross_validation"] = cv.evaluate(
+                        model_engine.model, train_matrix, y_train, n_jobs=self._n_jobs(validation_config.get("n_jobs", -1))
+                    )
+                build_logs["execution_summary"]["steps"].append(
+                    f"Walk-forward cross-validation completed over {cv.n_splits} folds."
+                )
+
+            # Train and test the model; boosting can stop early on the end of the training period, and tree
+            # growth stops when the build's time budget runs out
+            early_stopping = self.model_config.model_config.get("early_stopping")
+            if early_stopping and early_stopping.get("enabled", True):
+                early_stopping = {**early_stopping, "gap": horizon}
+            else:
+                early_stopping = None
+            time_budget = self._remaining_time_budget(build_start)
+            with profiler.stage("train_model", 0.7) as stage:
+                build_logs["training"] = model_engine.train_model(
+                    stage.shape(train_matrix.frame()), y_train, early_stopping=early_stopping, time_budget=time_budget,
+                    sample_weight=train_matrix.sample_weight
+                )
+                clear_dmatrix_cache()
+            build_logs["training"]["time_budget_seconds"] = time_budget
+            build_logs["execution_summary"]["steps"].append(
+                f"Model trained successfully with {build_logs['training']['used_rounds']} of {build_logs['training']['requested_rounds']} rounds."
+                if build_logs["training"]["requested_rounds"] is not None else "Model trained successfully."
+            )
+
+            # One model per regime behind a router; the model trained on all rows serves the regimes left without one
+            if regime_config is not None:
+                with profiler.stage("train_regime_models", 0.78) as stage:
+                    model_engine.model = RegimeRouter.train(
+                        self._model_engine().create_model(), stage.shape(train_matrix),
+                        labeled_df[REGIME_COLUMN].to_numpy()[train_rows], fallback=model_engine.model,
+                        min_rows=regime_config.get("min_rows", 1000), n_jobs=self._n_jobs(regime_config.get("n_jobs", -1)),
+                        time_budget=self._remaining_time_budget(build_start)
+                    )
+                    if test_data is None:
+                        X_test = X_test.assign(**{REGIME_COLUMN: labeled_df[REGIME_COLUMN].to_numpy()[test_rows]})
+                build_logs["regimes"] = model_engine.model.summary
+                build_logs["execution_summary"]["steps"].append("Regime models trained successfully.")
 
             # Test the model and collect metrics
-            test_results = model_engine.test_model(X_test, y_test)
+            with profiler.stage("test_model", 0.85) as stage:
+                test_results = model_engine.test_model(stage.shape(X_test), y_test)
             build_logs["model_metrics"]["classification_report"] = test_results["classification_rep"]
             build_logs["confusion_matrix"] = test_results["conf_matrix"].tolist() if isinstance(test_results["conf_matrix"], np.ndarray) else test_results["conf_matrix"]
 
             if test_results["roc_auc"] is not None:
                 build_logs["model_metrics"]["roc_auc"] = test_results["roc_auc"]
 
-            # Save the model
-            model_file_path = f"models/model_{self.model_config_id}.joblib"
-            model_engine.save_model(model_file_path)
-            build_logs["execution_summary"]["steps"].append(f"Model saved successfully at {model_file_path}.")
+            # Effect of the sampling: the sampled model against one trained the same way on every training row
+            if sampling_config is not None:
+                build_logs["sampling"]["sampled"] = self._sampling_effect(build_logs["training"], test_results)
+                if sampling_config.get("compare_baseline", False):
+                    with profiler.stage("train_sampling_baseline", 0.9) as stage:
+                        baseline = self._model_engine()
+                        baseline.create_model()
+                        baseline_matrix = FeatureMatrix.from_frame(labeled_df, feature_columns, full_y_train, rows=full_train_rows)
+                        baseline_training = baseline.train_model(
+                            stage.shape(baseline_matrix.frame()), full_y_train, early_stopping=early_stopping,
+                            time_budget=self._remaining_time_budget(build_start)
+                        )
+                        del baseline_matrix
+                        clear_dmatrix_cache()
+                        baseline_results = baseline.test_model(X_test[feature_columns], y_test)
+                    build_logs["sampling"]["baseline"] = self._sampling_effect(baseline_training, baseline_results)
+                    build_logs["execution_summary"]["steps"].append("Sampling compared against a model trained on every training row.")
+
+            # Register the model as a new version
+            with profiler.stage("save_model", 0.95):
+                metrics = {
+                    "accuracy": test_results["classification_rep"].get("accuracy"),
+                    "f1_macro": test_results["classification_rep"].get("macro avg", {}).get("f1-score"),
+                    "cross_validation": build_logs.get("cross_validation", {}).get("mean"),
+                }
+                # Live feature computation only needs the indicators producing the kept columns
+                extra = {"features_config": select_features_config(self.model_config.features_config.get("indicators", []), feature_columns)}
+                if "feature_pruning" in build_logs:
+                    extra["pruned_features"] = build_logs["feature_pruning"]["dropped"]
+                model_inputs = feature_columns
+                if regime_config is not None:
+                    # The router also reads the regime column, classified as configured here
+                    model_inputs = feature_columns + [REGIME_COLUMN]
+                    extra["regimes"] = {"config": regime_config, "models": build_logs["regimes"]}
+                version = self._register_model(model_engine, model_inputs, metrics, data_hash(train_matrix.frame(), y_train), **extra)
+                # Only a registered model moves the incremental retrain point past its training rows
+                self._update_training_dataset_config(trained_until=int(labeled_df["close_time"].iloc[last_train_row]))
+            build_logs["model_version"] = version["version"]
+            build_logs["execution_summary"]["steps"].append(f"Model saved successfully as version {version['version']} at {version['path']}.")
+
+            profiler.stop()
+            build_logs["profile"] = profiler.summary()
 
             # Ensure all logs are JSON-serializable
             build_logs = self._make_json_serializable(build_logs)
@@ -233,6 +564,347 @@ class DataPreparationPipeline:
         except Exception as e:
             logging.error("Error building the model", exc_info=True)
             raise e
+        finally:
+            profiler.stop()
+
+    def _build_out_of_core(self, profiler, build_logs, out_of_core_config):
+        """
+        The stages of ``build_model`` for histories larger than memory.
+
+        Indicators are streamed chunk by chunk into a columnar store (see ``generate_indicators_to_store``), and
+        the model is trained and tested on labeled chunks read back from it (see ``train_out_of_core``), so
+        memory is bounded by ``memory_budget_mb`` whatever the length of the history. Hyperparameter search,
+        feature pruning, cross-validation, regimes, early stopping and the time budget need the training
+        matrix in memory and are skipped.
+
+        Args:
+            profiler (StageProfiler): The build's profiler.
+            build_logs (dict): The build logs so far.
+            out_of_core_config (dict): ``memory_budget_mb``, ``store_path`` and ``epochs`` (``partial_fit``
+                passes of linear models), all optional.
+
+        Returns:
+            dict: The build logs.
+        """
+        model_config = self.model_config.model_config
+        label_config = self.model_config.label_config
+        indicators = self.model_config.features_config.get("indicators", [])
+        memory_budget_mb = out_of_core_config.get("memory_budget_mb", DEFAULT_MEMORY_BUDGET_MB)
+        # The store holds the OHLCV bar columns next to the features
+        chunk_rows = chunk_rows_for_budget(len(FeatureEngine(indicators).columns) + 8, memory_budget_mb)
+        store_path = out_of_core_config.get("store_path") or os.path.join(FEATURE_STORE_DIR, self.registry_name())
+        # Fail before streaming the history if the model cannot be trained out of core
+        model_engine = self._model_engine()
+        out_of_core_mode(model_engine.create_model())
+
+        with profiler.stage("generate_indicators_to_store", 0.05) as stage:
+            store = self.generate_indicators_to_store(store_path, chunk_rows)
+            stage.rows, stage.columns = store.rows, len(store.columns)
+        build_logs["execution_summary"]["steps"].append(f"Technical indicators streamed to {store_path} with {store.rows} rows.")
+
+        # The rows whose labels look into the test period are purged from the training set
+        horizon = LabelingEngine(label_config).label_horizon()
+        train_rows, test_rows = holdout_split(store.rows, test_size=0.2, gap=horizon)
+        feature_columns = self._feature_columns(pd.DataFrame(columns=store.columns))
+        label_mapping = {-1: 0, 0: 1, 1: 2} if model_config["method"] == "xgboost" else None
+        train_chunks = StoreChunks(store, feature_columns, label_config, chunk_rows, train_rows, label_mapping)
+        test_chunks = StoreChunks(store, feature_columns, label_config, chunk_rows, test_rows, label_mapping)
+
+        with profiler.stage("train_model", 0.4) as stage:
+            model_engine.model, build_logs["training"] = train_out_of_core(
+                model_engine.model, stage.shape(train_chunks), epochs=out_of_core_config.get("epochs", 1)
+            )
+        build_logs["training"]["memory_budget_mb"] = memory_budget_mb
+        build_logs["execution_summary"]["steps"].append(
+            f"Model trained out of core on {build_logs['training']['rows']} rows in chunks of {chunk_rows}."
+        )
+
+        with profiler.stage("test_model", 0.85) as stage:
+            y_test, y_pred = predict_out_of_core(model_engine.model, stage.shape(test_chunks))
+            test_results = model_engine.evaluate_predictions(y_test, y_pred)
+        build_logs["model_metrics"]["classification_report"] = test_results["classification_rep"]
+        build_logs["confusion_matrix"] = test_results["conf_matrix"].tolist()
+        if test_results["roc_auc"] is not None:
+            build_logs["model_metrics"]["roc_auc"] = test_results["roc_auc"]
+
+        with profiler.stage("save_model", 0.95):
+            metrics = {
+                "accuracy": test_results["classification_rep"].get("accuracy"),
+                "f1_macro": test_results["classification_rep"].get("macro avg", {}).get("f1-score"),
+            }
+            version = self._register_model(
+                model_engine, feature_columns, metrics, train_chunks.data_hash(),
+                features_config=self.model_config.features_config.get("indicators", []),
+                out_of_core={"store_path": store_path, "chunk_rows": chunk_rows, "memory_budget_mb": memory_budget_mb},
+            )
+            # Incremental retrains continue from the bar after the last training row, once the model is registered
+            self._update_training_dataset_config(trained_until=int(store.read(["close_time"], train_rows.stop - 1, train_rows.stop)["close_time"].iloc[0]))
+        build_logs["model_version"] = version["version"]
+        build_logs["execution_summary"]["steps"].append(f"Model saved successfully as version {version['version']} at {version['path']}.")
+        return build_logs
+
+    def retrain_incremental(self, end_time=None, progress_callback=None):
+        """
+        Update the saved model with the bars that arrived since it was last trained instead of rebuilding it.
+
+        Only the new bars and the indicator warm-up before them are fetched. XGBoost continues boosting, random
+        forests grow trees and ``partial_fit`` models take a pass over the new rows (see
+        ``incremental_training.continue_training``), with ``n_estimators`` and ``max_estimators`` read from the
+        ``incremental`` section of the model config. Models that cannot be updated, or that have not been
+        built yet, are rebuilt from scratch over the extended range.
+
+        Args:
+            end_time (int): Close time in epoch milliseconds up to which bars are used. Defaults to now.
+            progress_callback (callable): Called as ``progress_callback(stage, progress)``, as in ``build_model``.
+
+        Returns:
+            dict: Logs with the retrain ``mode`` ("incremental", "full" or "skipped"), the number of new rows,
+            the accuracy of the previous model on them (its out-of-sample drift), the update time and the stage
+            profile.
+        """
+        try:
+            profiler = StageProfiler(progress_callback).start()
+            with profiler.stage("fetch_model_config", 0.0):
+                self.fetch_model_config()
+            end_time = int(end_time or time.time() * 1000)
+            training_config = self.model_config.training_dataset_config
+            incremental_config = self.model_config.model_config.get("incremental") or {}
+            registry = ModelRegistry()
+            name = self.registry_name()
+
+            if "trained_until" not in training_config or registry.latest_version(name) is None:
+                logging.info(f"No trained model for config {self.model_config_id}; building it from scratch.")
+                return self._full_rebuild(end_time, progress_callback, "no trained model")
+
+            # Only the indicators the registered model uses are computed (all of them for models registered
+            # before pruning existed)
+            latest = registry.metadata(name)
+            indicators = latest.get("features_config")
+            if indicators is None:
+                indicators = self.model_config.features_config.get("indicators", [])
+            regime_config = (latest.get("regimes") or {}).get("config")
+
+            # Fetch the new bars with enough history before them to warm the indicators up
+            trained_until = int(training_config["trained_until"])
+            interval = int(training_config["interval"].rstrip('m'))
+            interval_ms = interval * 60 * 1000
+            warmup = FeatureEngine(indicators).warmup_rows(interval_ms)
+            if regime_config is not None:
+                warmup = max(warmup, RegimeClassifier.from_config(regime_config).warmup_rows())
+            with profiler.stage("fetch_timeseries_data", 0.1) as stage:
+                records = get_ohlcv_records_by_interval(training_config["symbol"], trained_until - warmup * interval_ms, end_time, interval)
+                if not records:
+                    return {"mode": "skipped", "reason": "no new bars", "new_rows": 0}
+                df = stage.shape(self._records_to_dataframe(records).sort_values(by="close_time", ignore_index=True))
+
+            with profiler.stage("generate_indicators", 0.3) as stage:
+                df_with_indicators = stage.shape(self.generate_indicators(df, indicators))
+            with profiler.stage("apply_labeling", 0.45) as stage:
+                labeled_df = stage.shape(self.apply_labeling(df_with_indicators))
+            if regime_config is not None:
+                labeled_df = self.classify_regimes(df, labeled_df, regime_config)
+            # Bars whose label is not final yet stay for the next retrain
+            new_rows = labeled_df[labeled_df["close_time"] > trained_until]
+            if new_rows.empty:
+                return {"mode": "skipped", "reason": "no new labeled bars", "new_rows": 0}
+
+            y_new = new_rows["label"]
+            if self.model_config.model_config["method"] == "xgboost":
+                y_new = map_labels(y_new)
+
+            model_engine = self._model_engine()
+            # A private, fully loaded copy: the update modifies the model
+            model, previous = registry.load(name, mmap_mode=None, cache=False)
+            X_new = new_rows[previous["feature_columns"]]
+            # Score the previous model before it sees the new rows: its drift since the last training
+            pre_update_accuracy = float((np.asarray(model.predict(X_new)) == np.asarray(y_new)).mean())
+
+            fallback_reason = None
+            with profiler.stage("train_model", 0.6) as stage:
+                stage.shape(X_new)
+                try:
+                    model_engine.model = continue_training(
+                        model, X_new, y_new,
+                        n_estimators=incremental_config.get("n_estimators", 50),
+                        max_estimators=incremental_config.get("max_estimators")
+                    )
+                except ValueError as e:
+                    fallback_reason = str(e)
+            if fallback_reason is not None:
+                logging.info(f"Falling back to a full rebuild: {fallback_reason}")
+                return self._full_rebuild(end_time, progress_callback, fallback_reason)
+            update_seconds = profiler.stages[-1]["wall_seconds"]
+
+            with profiler.stage("save_model", 0.9):
+                metrics = {**previous["metrics"], "pre_update_accuracy": pre_update_accuracy}
+                version = self._register_model(
+                    model_engine, previous["feature_columns"], metrics, data_hash(X_new, y_new),
+                    update_accuracy=False, parent_version=previous["version"], new_rows=len(new_rows),
+                    features_config=indicators
+                )
+            trained_until = int(new_rows["close_time"].iloc[-1])
+            self._update_training_dataset_config(trained_until=trained_until, enddate=max(int(training_config["enddate"]), end_time))
+
+            logs = {
+                "mode": "incremental",
+                "new_rows": len(new_rows),
+                "pre_update_accuracy": pre_update_accuracy,
+                "update_seconds": update_seconds,
+                "trained_until": trained_until,
+                "model_version": version["version"],
+                "profile": profiler.summary(),
+            }
+            logging.info(f"Model {self.model_config_id} updated incrementally: {logs}")
+            return logs
+        except Exception as e:
+            logging.error("Error retraining the model incrementally", exc_info=True)
+            raise e
+
+    @staticmethod
+    def classify_regimes(df, labeled_df, regime_config):
+        """
+        Add the regime code of every labeled bar (see ``RegimeClassifier``) as the ``regime`` column.
+
+        The regimes are classified on the closes of ``df``, the fetched bars before indicator warm-up rows were
+        dropped, so the moving average is already warm on the first labeled bar.
+
+        Args:
+            df (pd.DataFrame): The fetched OHLCV bars.
+            labeled_df (pd.DataFrame): The labeled rows of ``df``, with its index.
+            regime_config (dict): The ``regimes`` section of the model config.
+
+        Returns:
+            pd.DataFrame: ``labeled_df`` with the regime column.
+        """
+        regimes = pd.Series(RegimeClassifier.from_config(regime_config).classify(df["close"]), index=df.index)
+        labeled_df[REGIME_COLUMN] = regimes.loc[labeled_df.index].to_numpy()
+        return labeled_df
+
+    @staticmethod
+    def _sampling_effect(training, test_results):
+        """
+        Fit time and test metrics of a model, the figures the sampling logs compare.
+        """
+        report = test_results["classification_rep"]
+        return {
+            "fit_seconds": training["fit_seconds"],
+            "accuracy": report.get("accuracy"),
+            "f1_macro": report.get("macro avg", {}).get("f1-score"),
+            "recall": {label: scores["recall"] for label, scores in report.items() if isinstance(scores, dict) and label not in ("macro avg", "weighted avg")},
+        }
+
+    def _remaining_time_budget(self, build_start):
+        """
+        Seconds left of the build's ``time_budget_seconds`` (None without one), for the fits that grow trees.
+        """
+        time_budget = self.model_config.model_config.get("time_budget_seconds")
+        if time_budget is None:
+            return None
+        return float(time_budget) - (time.perf_counter() - build_start)
+
+    def _model_engine(self):
+        """
+        A ModelEngine of the model config under the pipeline's compute profile.
+        """
+        return ModelEngine(self.model_config.model_config, self.compute_profile)
+
+    def _n_jobs(self, requested):
+        """
+        Worker processes of a parallel stage, capped by the compute profile.
+        """
+        return requested if self.compute_profile is None else self.compute_profile.n_jobs(requested)
+
+    def registry_name(self):
+        """
+        Name of this model config in the model registry.
+        """
+        return f"model_{self.model_config_id}"
+
+    def _register_model(self, model_engine, feature_columns, metrics, training_data_hash, update_accuracy=True, **extra):
+        """
+        Register the trained model as a new version and point the model config at it.
+
+        Args:
+            model_engine (ModelEngine): Engine holding the trained model.
+            feature_columns (list): Input columns of the model.
+            metrics (dict): Evaluation metrics.
+            training_data_hash (str): Fingerprint of the training data.
+            update_accuracy (bool): Also set ``accuracy_percent`` from ``metrics["accuracy"]``.
+            **extra: Further metadata.
+
+        Returns:
+            dict: The version metadata.
+        """
+        label_mapping = {-1: 0, 0: 1, 1: 2} if model_engine.method == "xgboost" else None
+        version = ModelRegistry().register(
+            self.registry_name(), model_engine.model, feature_columns,
+            label_mapping=label_mapping, data_hash=training_data_hash, metrics=metrics, params=model_engine.params,
+            model_config_id=self.model_config_id, **extra
+        )
+        fields = {"physical_location": version["path"], "file_name": ARTIFACT_FILE}
+        if update_accuracy and metrics.get("accuracy") is not None:
+            fields["accuracy_percent"] = round(float(metrics["accuracy"]) * 100, 2)
+        update_model_config(self.model_config_id, fields)
+        return version
+
+    def _full_rebuild(self, end_time, progress_callback, reason):
+        """
+        Rebuild the model from scratch over the training range extended to ``end_time``.
+        """
+        training_config = self.model_config.training_dataset_config
+        self._update_training_dataset_config(enddate=max(int(training_config["enddate"]), end_time))
+        build_logs = self.build_model(progress_callback=progress_callback)
+        return {"mode": "full", "reason": reason, "build_logs": build_logs}
+
+    def _update_training_dataset_config(self, **fields):
+        """
+        Merge ``fields`` into the training dataset config and persist it.
+        """
+        training_dataset_config = {**self.model_config.training_dataset_config, **fields}
+        update_model_config(self.model_config_id, {"training_dataset_config": training_dataset_config})
+        self.model_config.training_dataset_config = training_dataset_config
+
+    @staticmethod
+    def _feature_columns(labeled_df):
+        """
+        Model input columns of a labeled frame: everything but the label, the bar times, the label outcomes and the regime.
+        """
+        # Epoch-millisecond times are not features, and float32 could not even tell consecutive bars apart
+        excluded_columns = ["label", "time", "open_time", "close_time", REGIME_COLUMN] + LabelingEngine.OUTCOME_COLUMNS
+        return [col for col in labeled_df.columns if col not in excluded_columns]
+
+    def search_hyperparameters(self, X_train, y_train, search_config, purge=0):
+        """
+        Search the model hyperparameters and write the best ones back to the model config.
+
+        Args:
+            X_train (FeatureMatrix or pd.DataFrame): Training features in time order.
+            y_train (pd.Series): Training labels; ignored for a ``FeatureMatrix``.
+            search_config (dict): The ``search`` section of the model config, see ``HyperparameterSearch.from_config``.
+            purge (int): Labeling horizon purged before every validation window.
+
+        Returns:
+            dict: The search results, see ``HyperparameterSearch.fit``.
+        """
+        try:
+            model_config = self.model_config.model_config
+            validation_config = search_config.get("validation") or model_config.get("validation") or {}
+            # The search always validates, even when the build itself skips cross-validation
+            cv = WalkForwardCV.from_config({**validation_config, "n_splits": validation_config.get("n_splits") or 5}, purge=purge)
+            results = HyperparameterSearch.from_config(
+                model_config["method"], search_config, cv=cv, compute_profile=self.compute_profile
+            ).fit(X_train, y_train)
+
+            # Parameters outside the search space keep their configured values
+            params = {**ModelEngine(model_config).params, **results["best_params"]}
+            model_config = {**model_config, "params": ModelEngine.format_params(params)}
+            update_model_fields(self.model_config_id, model_config=model_config)
+            self.model_config.model_config = model_config
+            logging.info(f"Best hyperparameters saved to model config {self.model_config_id}: {results['best_params']}")
+            return results
+        except Exception as e:
+            logging.error("Error searching hyperparameters", exc_info=True)
+            raise e
 
     def _make_json_serializable(self, logs):
         """
@@ -0,0 +1,267 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from .indicator_kernels import as_float_array
+
+# Tokens: numbers, identifiers with an optional [lookback], comparison operators and parentheses
+_TOKEN = re.compile(r"\s*(?:(?P<number>-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)|(?P<name>[A-Za-z_][A-Za-z0-9_]*)"
+                    r"|(?P<op><=|>=|==|!=|<|>)|(?P<punct>[()\[\]]))")
+_KEYWORDS = {"and", "or", "not", "crosses", "above", "below"}
+_COMPARISONS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match:
+            position = len(text) - len(text[position:].lstrip())
+            raise ValueError(f"Unexpected character {text[position]!r} at position {position} in {text!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "name" and value.lower() in _KEYWORDS:
+            kind, value = "keyword", value.lower()
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive-descent parser producing a tuple AST.
+
+        expression := and_term ("or" and_term)*
+        and_term   := factor ("and" factor)*
+        factor     := "not" factor | "(" expression ")" | comparison
+        comparison := operand (OP operand | "crosses" ("above" | "below") operand)
+        operand    := NUMBER | NAME ["[" INT "]"]
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.index = 0
+
+    def parse(self):
+        node = self._expression()
+        if self.index != len(self.tokens):
+            self._error("end of expression")
+        return node
+
+    def _peek(self):
+        return self.tokens[self.index] if self.index < len(self.tokens) else (None, None)
+
+    def _take(self, kind=None, value=None):
+        token = self._peek()
+        if token[0] is None or (kind and token[0] != kind) or (value and token[1] != value):
+            self._error(value or kind or "an operand")
+        self.index += 1
+        return token
+
+    def _error(self, expected):
+        found = self._peek()[1]
+        raise ValueError(f"Expected {expected} but found {found if found is not None else 'end of input'} in {self.text!r}")
+
+    def _expression(self):
+        node = self._and_term()
+        while self._peek() == ("keyword", "or"):
+            self.index += 1
+            node = ("or", node, self._and_term())
+        return node
+
+    def _and_term(self):
+        node = self._factor()
+        while self._peek() == ("keyword", "and"):
+            self.index += 1
+            node = ("and", node, self._factor())
+        return node
+
+    def _factor(self):
+        if self._peek() == ("keyword", "not"):
+            self.index += 1
+            return ("not", self._factor())
+        if self._peek() == ("punct", "("):
+            self.index += 1
+            node = self._expression()
+            self._take("punct", ")")
+            return node
+        return self._comparison()
+
+    def _comparison(self):
+        left = self._operand()
+        kind, value = self._peek()
+        if kind == "op":
+            self.index += 1
+            return ("compare", value, left, self._operand())
+        if (kind, value) == ("keyword", "crosses"):
+            self.index += 1
+            direction = self._take("keyword")[1]
+            if direction not in ("above", "below"):
+                raise ValueError(f"Expected 'above' or 'below' after 'crosses' in {self.text!r}")
+            return ("cross", direction, left, self._operand())
+        self._error("a comparison or 'crosses'")
+
+    def _operand(self):
+        kind, value = self._take()
+        if kind == "number":
+            return ("number", float(value))
+        if kind != "name":
+            self.index -= 1
+            self._error("a column name or a number")
+        lookback = 0
+        if self._peek() == ("punct", "["):
+            self.index += 1
+            lookback = self._take("number")[1]
+            if not lookback.isdigit():
+                raise ValueError(f"Lookback must be a non-negative integer, got {lookback} in {self.text!r}")
+            lookback = int(lookback)
+            self._take("punct", "]")
+        return ("column", value, lookback)
+
+
+def parse_expression(text):
+    """
+    Parse an event expression into a tuple AST.
+
+    Examples: ``"RSI crosses below 30"``, ``"MACD crosses above Signal_Line and RSI < 50"``,
+    ``"close > close[5] or not (volume <= volume[1])"``. ``name[k]`` is the column ``k`` bars ago.
+
+    Args:
+        text (str): The expression.
+
+    Returns:
+        tuple: The AST.
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+    return _Parser(text).parse()
+
+
+def _compile_operand(node):
+    if node[0] == "number":
+        value = node[1]
+        return lambda frame, n: np.full(n, value)
+    _, name, lookback = node
+
+    def column(frame, n):
+        if name not in frame:
+            raise ValueError(f"Unknown column '{name}' in event expression.")
+        values = as_float_array(frame[name].to_numpy())
+        if lookback == 0:
+            return values
+        shifted = np.full(n, np.nan)
+        shifted[min(lookback, n):] = values[:max(n - lookback, 0)]
+        return shifted
+    return column
+
+
+def _compile(node):
+    """
+    Compile an AST node into ``evaluate(frame, n) -> (truth, known)`` boolean arrays.
+
+    Missing values make a comparison unknown rather than false, and unknowns propagate with three-valued logic
+    (``not`` of unknown stays unknown, ``false and unknown`` is false, ``true or unknown`` is true), so an event
+    never fires because of a NaN.
+    """
+    kind = node[0]
+    if kind == "compare":
+        _, op, left, right = node
+        left, right, ufunc = _compile_operand(left), _compile_operand(right), _COMPARISONS[op]
+
+        def compare(frame, n):
+            a, b = left(frame, n), right(frame, n)
+            known = ~(np.isnan(a) | np.isnan(b))
+            return ufunc(a, b) & known, known
+        return compare
+    if kind == "cross":
+        _, direction, left, right = node
+        left, right = _compile_operand(left), _compile_operand(right)
+        above = direction == "above"
+
+        def cross(frame, n):
+            # Above now and at or below on the previous bar (mirrored for crosses below)
+            difference = left(frame, n) - right(frame, n)
+            current, previous = difference[1:], difference[:-1]
+            truth = np.zeros(n, dtype=bool)
+            known = np.zeros(n, dtype=bool)
+            known[1:] = ~(np.isnan(current) | np.isnan(previous))
+            if above:
+                np.logical_and(current > 0, previous <= 0, out=truth[1:])
+            else:
+                np.logical_and(current < 0, previous >= 0, out=truth[1:])
+            return truth, known
+        return cross
+    if kind == "not":
+        operand = _compile(node[1])
+
+        def negate(frame, n):
+            truth, known = operand(frame, n)
+            return ~truth & known, known
+        return negate
+
+    left, right = _compile(node[1]), _compile(node[2])
+    if kind == "and":
+        def conjunction(frame, n):
+            (t1, k1), (t2, k2) = left(frame, n), right(frame, n)
+            return t1 & t2, (k1 & k2) | (k1 & ~t1) | (k2 & ~t2)
+        return conjunction
+
+    def disjunction(frame, n):
+        (t1, k1), (t2, k2) = left(frame, n), right(frame, n)
+        return t1 | t2, (k1 & k2) | t1 | t2
+    return disjunction
+
+
+def _lookback(node):
+    kind = node[0]
+    if kind == "number":
+        return 0
+    if kind == "column":
+        return node[2]
+    if kind == "compare":
+        return max(_lookback(node[2]), _lookback(node[3]))
+    if kind == "cross":
+        # A cross also reads the bar before its operands
+        return max(_lookback(node[2]), _lookback(node[3])) + 1
+    return max(_lookback(operand) for operand in node[1:])
+
+
+def expression_lookback(text):
+    """
+    Number of bars before a row that an event expression reads to evaluate it.
+
+    Args:
+        text (str): The expression.
+
+    Returns:
+        int: The deepest ``[lookback]``, plus one under ``crosses``.
+    """
+    return _lookback(parse_expression(text))
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text):
+    """
+    Parse and compile an event expression once; later calls with the same text reuse the compiled form.
+
+    Args:
+        text (str): The expression.
+
+    Returns:
+        callable: ``evaluate(df) -> np.ndarray`` of booleans, one per row of the feature frame, True only
+        where the expression is known to hold.
+    """
+    evaluate = _compile(parse_expression(text))
+    return lambda df: evaluate(df, len(df))[0]
@@ -0,0 +1,683 @@
+import hashlib
+import json
+import logging
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from . import indicator_kernels as kernels
+from . import rolling_kernels
+from .window_features import lag_matrix, rolling_returns, rolling_differences
+
+try:
+    import talib
+except ImportError:  # The NumPy kernels reproduce every TA-Lib indicator used here
+    talib = None
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+# Feature set used by the training scripts and the backtester. It reproduces the
+# historical pandas semantics (simple-mean RSI, first-value seeded EMAs).
+TRAINING_FEATURES_CONFIG = [
+    {"name": "RSI", "params": {"timeperiod": 14, "smoothing": "sma", "column": "RSI_14"}},
+    {"name": "MACD", "params": {"fastperiod": 12, "slowperiod": 26, "signalperiod": 9, "seed": "first"}},
+    {"name": "Lag Features", "params": {"lag_period": 2, "columns": ["close", "volume"]}},
+]
+
+# warmup: rows of history a value needs before it matches a run over the full history
+# (in bars of ``timeframe_ms`` for higher-timeframe groups)
+PlannedFeature = namedtuple("PlannedFeature", ["name", "columns", "compute", "warmup", "timeframe_ms"], defaults=(0, None))
+
+# Residual weight below which an exponentially smoothed value counts as independent of its seed
+EMA_CONVERGENCE_TOLERANCE = 1e-15
+
+TIMEFRAME_UNITS_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+# Resampled higher-timeframe features kept per process, shared by every FeatureEngine
+TIMEFRAME_CACHE_SIZE = 16
+_timeframe_cache = OrderedDict()
+# Base columns a higher-timeframe group reads: the bar times and what ``resample_ohlcv`` aggregates
+TIMEFRAME_SOURCE_COLUMNS = ("open_time", "close_time", "open", "high", "low", "close", "volume")
+
+
+def timeframe_to_ms(timeframe):
+    """
+    Convert a Binance style interval ("5m", "1h", "1d") to milliseconds.
+    """
+    unit = timeframe[-1]
+    if unit not in TIMEFRAME_UNITS_MS or not timeframe[:-1].isdigit():
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return int(timeframe[:-1]) * TIMEFRAME_UNITS_MS[unit]
+
+
+def _convergence(alpha):
+    """
+    Bars after which the seed of an exponential smoother with factor ``alpha`` has decayed below tolerance.
+    """
+    if alpha >= 1.0:
+        return 0
+    return int(np.ceil(np.log(EMA_CONVERGENCE_TOLERANCE) / np.log(1.0 - alpha)))
+
+
+def _ema_warmup(span):
+    return span + _convergence(2.0 / (span + 1.0))
+
+
+def _ma_warmup(period, matype):
+    if matype not in kernels.MA_TYPES:
+        raise ValueError(f"Unsupported moving average type: {matype}")
+    # SMA, WMA and TRIMA are finite windows; the others are recursive, cascaded for DEMA, TEMA and T3
+    if matype in (0, 2, 5):
+        return period
+    cascades = {1: 1, 3: 2, 4: 3, 8: 6}
+    if matype in cascades:
+        return cascades[matype] * _ema_warmup(period)
+    if matype == 6:
+        return period + _convergence((2.0 / (kernels.KAMA_SLOW_PERIOD + 1.0)) ** 2)
+    return kernels.MAMA_LOOKBACK + _convergence(kernels.MAMA_SLOW_LIMIT)
+
+
+class _Sources:
+    """
+    Lazily converted input columns of the frame being processed.
+    """
+
+    def __init__(self, df, lag_depths=None):
+        self.df = df
+        self.lag_depths = lag_depths or {}
+        self._columns = {}
+
+    def __call__(self, column):
+        if column not in self._columns:
+            self._columns[column] = kernels.as_float_array(self.df[column].to_numpy())
+        return self._columns[column]
+
+    def times(self, column):
+        """
+        Return a time column as int64 epoch milliseconds, accepting raw epochs or datetimes.
+        """
+        key = ("times", column)
+        if key not in self._columns:
+            values = self.df[column]
+            if pd.api.types.is_datetime64_any_dtype(values):
+                values = values.to_numpy().astype("datetime64[ms]").astype(np.int64)
+            else:
+                values = values.to_numpy().astype(np.int64, copy=False)
+            self._columns[key] = values
+        return self._columns[key]
+
+    def lags(self, column):
+        """
+        Return the shared (n, depth) lag view of a column, deep enough for every planned lag of it.
+        """
+        key = ("lags", column)
+        if key not in self._columns:
+            self._columns[key] = lag_matrix(self(column), self.lag_depths[column])
+        return self._columns[key]
+
+
+def clear_timeframe_cache():
+    """
+    Release the cached higher-timeframe features of this process.
+    """
+    _timeframe_cache.clear()
+
+
+def resample_ohlcv(open_time, sources, timeframe_ms):
+    """
+    Aggregate sorted base bars into higher-timeframe OHLCV bars in one vectorized pass.
+
+    Args:
+        open_time (np.ndarray): Base bar open times in epoch milliseconds, ascending.
+        sources (_Sources): Column accessor of the base frame.
+        timeframe_ms (int): Higher timeframe length in milliseconds.
+
+    Returns:
+        pd.DataFrame: One row per higher-timeframe bar with open_time, close_time and OHLCV columns.
+    """
+    bucket = open_time // timeframe_ms
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+    ends = np.concatenate((starts[1:], [len(bucket)])) - 1
+
+    bars = {
+        "open_time": bucket[starts] * timeframe_ms,
+        "close_time": (bucket[starts] + 1) * timeframe_ms - 1,
+    }
+    for column, reduce in (("open", None), ("high", np.maximum), ("low", np.minimum), ("close", None), ("volume", np.add)):
+        if column not in sources.df.columns:
+            continue
+        values = sources(column)
+        if column == "open":
+            bars[column] = values[starts]
+        elif column == "close":
+            bars[column] = values[ends]
+        else:
+            bars[column] = reduce.reduceat(values, starts)
+    return pd.DataFrame(bars)
+
+
+class FeatureEngine:
+    """
+    Canonical feature generator shared by the training scripts, the backtester and the API pipeline.
+
+    Every output column is written straight into one preallocated column-major block, which is attached
+    to the source frame once at the end instead of growing the DataFrame indicator by indicator.
+    """
+
+    BACKENDS = ("talib", "numpy")
+
+    def __init__(self, features_config, backend=None):
+        """
+        Initialize the FeatureEngine.
+
+        Args:
+            features_config (list): List of indicator configurations (``features_config["indicators"]``).
+            backend (str): ``"talib"`` or ``"numpy"`` for the TA-Lib flavoured indicators. Defaults to TA-Lib
+                when it is installed and to the equivalent NumPy kernels otherwise.
+
+        Raises:
+            ValueError: If the backend or an indicator is not supported.
+            ImportError: If the TA-Lib backend is requested but TA-Lib is not installed.
+        """
+        if backend is None:
+            backend = "talib" if talib is not None else "numpy"
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unsupported indicator backend: {backend}")
+        if backend == "talib" and talib is None:
+            raise ImportError("TA-Lib is not installed; use the 'numpy' indicator backend.")
+        self.backend = backend
+        self.features_config = features_config
+        planners = {
+            "RSI": self._plan_rsi,
+            "MACD": self._plan_macd,
+            "Simple Moving Average (SMA)": self._plan_sma,
+            "Exponential Moving Average (EMA)": self._plan_ema,
+            "Average True Range (ATR)": self._plan_atr,
+            "Stochastic Oscillator": self._plan_stochastic,
+            "Bollinger Band": self._plan_bollinger,
+            "Percentage Price Oscillator (PPO)": self._plan_ppo,
+            "Lag Features": self._plan_lags,
+            "Rolling Returns": self._plan_returns,
+            "Rolling Differences": self._plan_differences,
+            "Rolling Z-Score": self._plan_zscore,
+            "Realized Volatility": self._plan_realized_volatility,
+            "Rolling Skew": self._plan_skew,
+            "Rolling Kurtosis": self._plan_kurtosis,
+            "Rolling Min/Max Distance": self._plan_extreme_distance,
+            "Volume-Weighted Return": self._plan_volume_weighted_return,
+        }
+        self._lag_depths = {}
+
+        self.plan = []
+        timeframes = {}
+        for feature in features_config:
+            name = feature["name"]
+            if name not in planners:
+                raise ValueError(f"Unsupported indicator: {name}")
+
+            timeframe = feature.get("timeframe")
+            if timeframe:
+                # Higher-timeframe indicators are grouped so each timeframe is resampled and computed once
+                if timeframe not in timeframes:
+                    timeframes[timeframe] = []
+                    self.plan.append(timeframe)
+                timeframes[timeframe].append({key: value for key, value in feature.items() if key != "timeframe"})
+            else:
+                self.plan.append(planners[name](feature.get("params", {})))
+
+        self.plan = [
+            self._plan_timeframe(planned, timeframes[planned]) if isinstance(planned, str) else planned
+            for planned in self.plan
+        ]
+
+    @property
+    def columns(self):
+        """
+        list: Names of the generated feature columns, in output order.
+        """
+        return [column for planned in self.plan for column in planned.columns]
+
+    def warmup_rows(self, base_interval_ms=None):
+        """
+        Rows of history needed before every feature matches a run over the full history.
+
+        Args:
+            base_interval_ms (int): Base bar length, required to convert higher-timeframe warm-ups to base rows.
+
+        Returns:
+            int: The warm-up length in base rows.
+        """
+        rows = 0
+        for planned in self.plan:
+            warmup = planned.warmup
+            if planned.timeframe_ms is not None:
+                if base_interval_ms is None:
+                    raise ValueError("base_interval_ms is required for higher-timeframe features.")
+                warmup *= -(-planned.timeframe_ms // base_interval_ms)
+            rows = max(rows, warmup)
+        return rows
+
+    def compute_chunks(self, chunks, base_interval_ms=None):
+        """
+        Stream feature generation over consecutive chunks of bars.
+
+        Each chunk is extended with the trailing ``warmup_rows`` of the previous one, so the rows emitted for it
+        match an in-memory ``compute`` over the concatenated data to rounding (recursive indicators to within
+        ``EMA_CONVERGENCE_TOLERANCE``). Rows with missing values are dropped as in ``compute``.
+
+        Args:
+            chunks (iterable): DataFrames of consecutive, time-ordered bars.
+            base_interval_ms (int): Base bar length, needed for higher-timeframe features.
+
+        Yields:
+            pd.DataFrame: The feature frame for each chunk's own rows.
+        """
+        warmup = self.warmup_rows(base_interval_ms)
+        carry = None
+        for chunk in chunks:
+            frame = chunk if carry is None or carry.empty else pd.concat([carry, chunk])
+            result = self.compute(frame, dropna=False).iloc[len(frame) - len(chunk):]
+            valid = result.notna().all(axis=1).to_numpy()
+            yield result if valid.all() else result[valid]
+            carry = frame.iloc[max(len(frame) - warmup, 0):] if warmup else None
+
+    def compute(self, df, dropna=True):
+        """
+        Compute all configured features for an OHLCV DataFrame.
+
+        Args:
+            df (pd.DataFrame): Dataset with the OHLCV columns required by the configured indicators.
+            dropna (bool): Drop the warm-up rows (and any row with missing values) like ``DataFrame.dropna``.
+
+        Returns:
+            pd.DataFrame: The source columns followed by the feature columns. The input is not modified.
+        """
+        n = len(df)
+        columns = self.columns
+        block = np.empty((n, len(columns)), dtype=np.float64, order="F")
+
+        source = _Sources(df, self._lag_depths)
+
+        position = 0
+        for planned in self.plan:
+            width = len(planned.columns)
+            planned.compute(source, block[:, position:position + width])
+            position += width
+
+        # A dict of column views with copy=False wraps the existing buffers instead of consolidating them
+        base_columns = [column for column in df.columns if column not in set(columns)]
+        data = {column: df[column] for column in base_columns}
+        data.update({column: block[:, j] for j, column in enumerate(columns)})
+        result = pd.DataFrame(data, index=df.index, copy=False)
+
+        if not dropna:
+            return result
+
+        valid = ~np.isnan(block).any(axis=1)
+        if base_columns:
+            valid &= df[base_columns].notna().all(axis=1).to_numpy()
+        if valid.all():
+            return result
+        first_valid = int(valid.argmax()) if valid.any() else n
+        if valid[first_valid:].all():
+            return result.iloc[first_valid:]
+        return result[valid]
+
+    @staticmethod
+    def _single_column(params, default):
+        return [params.get("column", default)]
+
+    @property
+    def _talib(self):
+        return self.backend == "talib"
+
+    def _plan_timeframe(self, timeframe, features_config):
+        """
+        Plan indicators computed on ``timeframe`` bars and attached to each base bar with a causal as-of join.
+
+        A higher-timeframe bar becomes visible on the first base bar whose close time reaches the higher bar's
+        close time, so a base bar only ever sees completed higher-timeframe bars. The resampled features are
+        cached in the process, keyed on the timeframe's indicators and a digest of every base column the
+        resampling reads, so any engine computing the same group on the same bars reuses them.
+        """
+        timeframe_ms = timeframe_to_ms(timeframe)
+        engine = FeatureEngine(features_config, backend=self.backend)
+        config_key = (timeframe, self.backend, json.dumps(features_config, sort_keys=True, default=str))
+
+        def compute(source, out):
+            open_time = source.times("open_time")
+            close_time = source.times("close_time")
+
+            digest = hashlib.blake2b(digest_size=16)
+            for column in TIMEFRAME_SOURCE_COLUMNS:
+                if column in source.df.columns:
+                    values = source.times(column) if column.endswith("_time") else source(column)
+                    digest.update(column.encode())
+                    digest.update(np.ascontiguousarray(values).tobytes())
+            key = (config_key, digest.hexdigest())
+
+            cached = _timeframe_cache.get(key)
+            if cached is None:
+                bars = resample_ohlcv(open_time, source, timeframe_ms)
+                features = engine.compute(bars, dropna=False)
+                cached = (bars["close_time"].to_numpy(), features[engine.columns].to_numpy(dtype=np.float64))
+                _timeframe_cache[key] = cached
+                while len(_timeframe_cache) > TIMEFRAME_CACHE_SIZE:
+                    _timeframe_cache.popitem(last=False)
+            else:
+                _timeframe_cache.move_to_end(key)
+            bar_close_time, values = cached
+
+            # Index of the last higher-timeframe bar closed at or before each base bar's close
+            index = np.searchsorted(bar_close_time, close_time, side="right") - 1
+            pending = index < 0
+            np.maximum(index, 0, out=index)
+            for j in range(values.shape[1]):
+                np.take(values[:, j], index, out=out[:, j])
+            if pending.any():
+                out[pending] = np.nan
+
+        columns = [f"{column}_{timeframe}" for column in engine.columns]
+        # One extra bar covers the partially built first bar of a chunk
+        return PlannedFeature(f"TIMEFRAME_{timeframe}", columns, compute, engine.warmup_rows() + 2, timeframe_ms)
+
+    def _plan_rsi(self, params):
+        timeperiod = params["timeperiod"]
+        smoothing = params.get("smoothing", "wilder")
+
+        def compute(source, out):
+            if smoothing == "wilder" and self._talib:
+                out[:, 0] = talib.RSI(source("close"), timeperiod=timeperiod)
+            else:
+                kernels.rsi(source("close"), timeperiod, smoothing=smoothing, out=out[:, 0])
+
+        warmup = timeperiod if smoothing == "sma" else timeperiod + _convergence(1.0 / timeperiod)
+        return PlannedFeature("RSI", self._single_column(params, "RSI"), compute, warmup)
+
+    def _plan_macd(self, params):
+        seed = params.get("seed", "sma")
+
+        def compute(source, out):
+            if seed == "first" or not self._talib:
+                kernels.macd(source("close"), params["fastperiod"], params["slowperiod"], params["signalperiod"], out=out, seed=seed)
+            else:
+                macd, signal, _ = talib.MACD(
+                    source("close"),
+                    fastperiod=params["fastperiod"],
+                    slowperiod=params["slowperiod"],
+                    signalperiod=params["signalperiod"]
+                )
+                out[:, 0] = macd
+                out[:, 1] = signal
+
+        warmup = _ema_warmup(params["slowperiod"]) + _ema_warmup(params["signalperiod"])
+        return PlannedFeature("MACD", ["MACD", "Signal_Line"], compute, warmup)
+
+    def _plan_sma(self, params):
+        window = params["window"]
+
+        def compute(source, out):
+            if self._talib:
+                out[:, 0] = talib.SMA(source("close"), timeperiod=window)
+            else:
+                kernels.rolling_mean(source("close"), window, out=out[:, 0])
+
+        return PlannedFeature("SMA", self._single_column(params, f"SMA_{window}"), compute, window)
+
+    def _plan_ema(self, params):
+        span = params["span"]
+
+        def compute(source, out):
+            if self._talib:
+                out[:, 0] = talib.EMA(source("close"), timeperiod=span)
+            else:
+                kernels.ema(source("close"), span, out=out[:, 0], seed="sma")
+
+        return PlannedFeature("EMA", self._single_column(params, f"EMA_{span}"), compute, _ema_warmup(span))
+
+    def _plan_atr(self, params):
+        def compute(source, out):
+            if self._talib:
+                out[:, 0] = talib.ATR(source("high"), source("low"), source("close"), timeperiod=params["timeperiod"])
+            else:
+                kernels.atr(source("high"), source("low"), source("close"), params["timeperiod"], out=out[:, 0])
+
+        warmup = params["timeperiod"] + 1 + _convergence(1.0 / params["timeperiod"])
+        return PlannedFeature("ATR", self._single_column(params, "ATR"), compute, warmup)
+
+    def _plan_stochastic(self, params):
+        def compute(source, out):
+            if self._talib:
+                slowk, slowd = talib.STOCH(
+                    source("high"),
+                    source("low"),
+                    source("close"),
+                    fastk_period=params["fastk_period"],
+                    slowk_period=params["slowk_period"],
+                    slowk_matype=params["slowk_matype"],
+                    slowd_period=params["slowd_period"],
+                    slowd_matype=params["slowd_matype"]
+                )
+                out[:, 0] = slowk
+                out[:, 1] = slowd
+            else:
+                rolling_kernels.stoch(
+                    source("high"),
+                    source("low"),
+                    source("close"),
+                    fastk_period=params["fastk_period"],
+                    slowk_period=params["slowk_period"],
+                    slowk_matype=params["slowk_matype"],
+                    slowd_period=params["slowd_period"],
+                    slowd_matype=params["slowd_matype"],
+                    out=out
+                )
+
+        warmup = (
+            params["fastk_period"]
+            + _ma_warmup(params["slowk_period"], params["slowk_matype"])
+            + _ma_warmup(params["slowd_period"], params["slowd_matype"])
+        )
+        return PlannedFeature("STOCH", ["Stochastic_K", "Stochastic_D"], compute, warmup)
+
+    def _plan_bollinger(self, params):
+        def compute(source, out):
+            if self._talib:
+                upper, middle, lower = talib.BBANDS(
+                    source("close"),
+                    timeperiod=params["timeperiod"],
+                    nbdevup=params["nbdevup"],
+                    nbdevdn=params["nbdevdn"],
+                    matype=params["matype"]
+                )
+                out[:, 0] = upper
+                out[:, 1] = middle
+                out[:, 2] = lower
+            else:
+                rolling_kernels.bollinger_bands(
+                    source("close"),
+                    timeperiod=params["timeperiod"],
+                    nbdevup=params["nbdevup"],
+                    nbdevdn=params["nbdevdn"],
+                    matype=params["matype"],
+                    out=out
+                )
+
+        warmup = _ma_warmup(params["timeperiod"], params["matype"])
+        return PlannedFeature("BBANDS", ["Upper_Band", "Middle_Band", "Lower_Band"], compute, warmup)
+
+    def _plan_ppo(self, params):
+        def compute(source, out):
+            if self._talib:
+                out[:, 0] = talib.PPO(
+                    source("close"),
+                    fastperiod=params["fastperiod"],
+                    slowperiod=params["slowperiod"],
+                    matype=params["matype"]
+                )
+            else:
+                kernels.ppo(
+                    source("close"),
+                    fastperiod=params["fastperiod"],
+                    slowperiod=params["slowperiod"],
+                    matype=params["matype"],
+                    out=out[:, 0]
+                )
+
+        warmup = _ma_warmup(params["slowperiod"], params["matype"])
+        return PlannedFeature("PPO", self._single_column(params, "PPO"), compute, warmup)
+
+    def _require_lags(self, columns, depth):
+        for column in columns:
+            self._lag_depths[column] = max(self._lag_depths.get(column, 0), depth)
+
+    @staticmethod
+    def _periods(params):
+        periods = params["periods"]
+        return list(range(1, periods + 1)) if isinstance(periods, int) else list(periods)
+
+    def _plan_lags(self, params):
+        lag_period = params["lag_period"]
+        lag_columns = params.get("columns", ["close"])
+        self._require_lags(lag_columns, lag_period)
+
+        def compute(source, out):
+            for i, column in enumerate(lag_columns):
+                out[:, i * lag_period:(i + 1) * lag_period] = source.lags(column)[:, :lag_period]
+
+        columns = [f"{column}_lag_{lag}" for column in lag_columns for lag in range(1, lag_period + 1)]
+        return PlannedFeature("LAG", columns, compute, lag_period)
+
+    def _plan_returns(self, params):
+        periods = self._periods(params)
+        return_columns = params.get("columns", ["close"])
+        self._require_lags(return_columns, max(periods))
+
+        def compute(source, out):
+            width = len(periods)
+            for i, column in enumerate(return_columns):
+                rolling_returns(source(column), periods, lags=source.lags(column), out=out[:, i * width:(i + 1) * width])
+
+        columns = [f"{column}_return_{period}" for column in return_columns for period in periods]
+        return PlannedFeature("RETURNS", columns, compute, max(periods))
+
+    def _plan_differences(self, params):
+        periods = self._periods(params)
+        diff_columns = params.get("columns", ["close"])
+        self._require_lags(diff_columns, max(periods))
+
+        def compute(source, out):
+            width = len(periods)
+            for i, column in enumerate(diff_columns):
+                rolling_differences(source(column), periods, lags=source.lags(column), out=out[:, i * width:(i + 1) * width])
+
+        columns = [f"{column}_diff_{period}" for column in diff_columns for period in periods]
+        return PlannedFeature("DIFFERENCES", columns, compute, max(periods))
+
+    def _plan_zscore(self, params):
+        window = params["window"]
+        column = params.get("column", "close")
+
+        def compute(source, out):
+            rolling_kernels.rolling_zscore(source(column), window, out=out[:, 0])
+
+        return PlannedFeature("ZSCORE", [f"{column}_zscore_{window}"], compute, window)
+
+    def _plan_realized_volatility(self, params):
+        window = params["window"]
+
+        def compute(source, out):
+            rolling_kernels.realized_volatility(source("close"), window, out=out[:, 0])
+
+        return PlannedFeature("REALIZED_VOL", [f"realized_vol_{window}"], compute, window + 1)
+
+    def _plan_skew(self, params):
+        window = params["window"]
+        column = params.get("column", "close")
+
+        def compute(source, out):
+            rolling_kernels.rolling_skew(rolling_kernels.log_returns(source(column)), window, out=out[:, 0])
+
+        return PlannedFeature("SKEW", [f"{column}_return_skew_{window}"], compute, window + 1)
+
+    def _plan_kurtosis(self, params):
+        window = params["window"]
+        column = params.get("column", "close")
+
+        def compute(source, out):
+            rolling_kernels.rolling_kurt(rolling_kernels.log_returns(source(column)), window, out=out[:, 0])
+
+        return PlannedFeature("KURT", [f"{column}_return_kurt_{window}"], compute, window + 1)
+
+    def _plan_extreme_distance(self, params):
+        window = params["window"]
+        column = params.get("column", "close")
+
+        def compute(source, out):
+            values = source(column)
+            rolling_kernels.rolling_max(values, window, out=out[:, 0])
+            rolling_kernels.rolling_min(values, window, out=out[:, 1])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                np.divide(values[:, None], out, out=out)
+            out -= 1.0
+
+        columns = [f"{column}_dist_max_{window}", f"{column}_dist_min_{window}"]
+        return PlannedFeature("EXTREME_DISTANCE", columns, compute, window)
+
+    def _plan_volume_weighted_return(self, params):
+        window = params["window"]
+
+        def compute(source, out):
+            rolling_kernels.volume_weighted_return(source("close"), source("volume"), window, out=out[:, 0])
+
+        return PlannedFeature("VW_RETURN", [f"vw_return_{window}"], compute, window + 1)
+
+
+def add_features(df, features_config, dropna=True, backend=None):
+    """
+    Convenience wrapper computing ``features_config`` on ``df`` with a one-off FeatureEngine.
+
+    Args:
+        df (pd.DataFrame): OHLCV dataset.
+        features_config (list): List of indicator configurations.
+        dropna (bool): Drop warm-up rows with missing values.
+        backend (str): Indicator backend, see ``FeatureEngine``.
+
+    Returns:
+        pd.DataFrame: Dataset with the feature columns appended.
+    """
+    return FeatureEngine(features_config, backend=backend).compute(df, dropna=dropna)
+
+
+def select_features_config(features_config, columns):
+    """
+    The part of ``features_config`` needed to compute ``columns``, e.g. the inputs a pruned model kept.
+
+    Indicators producing none of the columns are left out, and lag features only go as deep as the deepest lag
+    still used. Indicators with several outputs (MACD, Bollinger Bands) are kept whole.
+
+    Args:
+        features_config (list): List of indicator configurations.
+        columns (list): Feature columns that must still be computed.
+
+    Returns:
+        list: The reduced indicator configurations, in their original order.
+    """
+    columns = set(columns)
+    selected = []
+    for feature in features_config:
+        produced = FeatureEngine([feature], backend="numpy").columns
+        if not columns.intersection(produced):
+            continue
+        if feature["name"] == "Lag Features" and not feature.get("timeframe"):
+            params = feature["params"]
+            used = [(column, lag) for column in params.get("columns", ["close"])
+                    for lag in range(1, params["lag_period"] + 1) if f"{column}_lag_{lag}" in columns]
+            lag_columns = list(dict.fromkeys(column for column, _ in used))
+            feature = {**feature, "params": {**params, "lag_period": max(lag for _, lag in used), "columns": lag_columns}}
+        selected.append(feature)
+    return selected
@@ -0,0 +1,184 @@
+import logging
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from xgboost import XGBClassifier
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# QuantileDMatrix windows kept per process; each holds one byte per cell, a quarter of the float32 values
+DMATRIX_CACHE_SIZE = 32
+_dmatrix_cache = OrderedDict()
+
+
+class FeatureMatrix:
+    """
+    Training features as one C-contiguous float32 array with their labels.
+
+    The array is built once per training set and shared by every fit: cross-validation folds and search trials
+    slice row windows out of it, joblib memory-maps it into worker processes, and scikit-learn trees (which
+    work in float32) use it without another conversion. XGBoost windows are turned into ``QuantileDMatrix``
+    objects binned on the quantiles of the whole matrix and cached per process, so every trial on the same
+    window reuses one instead of rebuilding its own. Sample weights (e.g. those undoing a downsampling, see
+    ``MajoritySampler``) travel with the rows, so every fit and score on the matrix uses them.
+    """
+
+    def __init__(self, X, y=None, columns=None, sample_weight=None):
+        """
+        Initialize the FeatureMatrix.
+
+        Args:
+            X (pd.DataFrame or np.ndarray): Features in time order.
+            y (pd.Series or np.ndarray): Labels (optional).
+            columns (list): Feature names. Defaults to the columns of ``X``.
+            sample_weight (np.ndarray): Weight per row (optional).
+        """
+        self.columns = [str(column) for column in (columns if columns is not None else getattr(X, "columns", range(np.shape(X)[1])))]
+        self.values = np.ascontiguousarray(X, dtype=np.float32)
+        self.labels = None if y is None else np.asarray(y)
+        self.sample_weight = None if sample_weight is None else np.asarray(sample_weight, dtype=np.float64)
+        # Identifies the matrix in the DMatrix cache, also after it was pickled to a worker
+        self.token = uuid.uuid4().hex
+
+    @classmethod
+    def from_frame(cls, df, feature_columns, y=None, rows=slice(None)):
+        """
+        Create a FeatureMatrix from a window of rows of a frame, one column at a time.
+
+        Selecting the columns of a frame first would copy all of them as float64; filling the float32 matrix
+        column by column never holds more than one converted column on top of it.
+
+        Args:
+            df (pd.DataFrame): Frame holding the features.
+            feature_columns (list): Columns to use, in order.
+            y (pd.Series or np.ndarray): Labels of the window (optional).
+            rows (slice or np.ndarray): Window of rows, or the positions of the rows to take (e.g. a sample).
+
+        Returns:
+            FeatureMatrix: The matrix.
+        """
+        n_rows = len(range(*rows.indices(len(df)))) if isinstance(rows, slice) else len(rows)
+        values = np.empty((n_rows, len(feature_columns)), dtype=np.float32)
+        for i, column in enumerate(feature_columns):
+            values[:, i] = df[column].to_numpy()[rows]
+        return cls(values, y, columns=feature_columns)
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + sum(0 if array is None else array.nbytes for array in (self.labels, self.sample_weight))
+
+    def select(self, columns):
+        """
+        A new FeatureMatrix with only ``columns``, in that order, and the same labels and weights.
+        """
+        positions = [self.columns.index(str(column)) for column in columns]
+        return FeatureMatrix(self.values[:, positions], self.labels, columns=columns, sample_weight=self.sample_weight)
+
+    def take(self, rows):
+        """
+        A new FeatureMatrix with only ``rows`` (a slice or positions), their labels and their weights.
+        """
+        return FeatureMatrix(self.values[rows], None if self.labels is None else self.labels[rows], columns=self.columns,
+                             sample_weight=self.weights(rows))
+
+    def weights(self, rows=slice(None)):
+        """
+        Sample weights of a window of rows, or None for an unweighted matrix.
+        """
+        return None if self.sample_weight is None else self.sample_weight[rows]
+
+    def frame(self, rows=slice(None)):
+        """
+        Rows of the matrix as a DataFrame view with the feature names, without copying the values.
+        """
+        return pd.DataFrame(self.values[rows], columns=self.columns, copy=False)
+
+    def quantile_dmatrix(self, rows=None, max_bin=256):
+        """
+        QuantileDMatrix of a window of rows, cached in this process.
+
+        The bins of every window come from a reference QuantileDMatrix over the whole matrix, so the quantiles
+        are sketched once and the windows only have to be binned.
+
+        Args:
+            rows (slice): Window of rows. None is the whole matrix.
+            max_bin (int): Histogram bins per feature; must match the booster's ``max_bin``.
+
+        Returns:
+            xgb.QuantileDMatrix: The window with its labels and weights.
+        """
+        if rows is not None and rows.indices(len(self)) == (0, len(self), 1):
+            rows = None
+        key = (self.token, None if rows is None else (rows.start, rows.stop), max_bin)
+        if key in _dmatrix_cache:
+            _dmatrix_cache.move_to_end(key)
+            return _dmatrix_cache[key]
+
+        if rows is None:
+            dmatrix = xgb.QuantileDMatrix(self.values, label=self.labels, weight=self.sample_weight,
+                                          feature_names=self.columns, max_bin=max_bin)
+        else:
+            reference = self.quantile_dmatrix(None, max_bin)
+            dmatrix = xgb.QuantileDMatrix(self.values[rows], label=self.labels[rows], weight=self.weights(rows),
+                                          feature_names=self.columns, max_bin=max_bin, ref=reference)
+        _dmatrix_cache[key] = dmatrix
+        while len(_dmatrix_cache) > DMATRIX_CACHE_SIZE:
+            _dmatrix_cache.popitem(last=False)
+        return dmatrix
+
+    def fit(self, estimator, rows=slice(None)):
+        """
+        Fit an unfitted estimator on a window of rows, with their sample weights.
+
+        XGBoost classifiers with the ``hist`` tree method train a booster directly on the cached QuantileDMatrix
+        of the window; other estimators are fitted on a float32 view of it.
+
+        Args:
+            estimator: Unfitted scikit-learn compatible estimator.
+            rows (slice): Training rows.
+
+        Returns:
+            The fitted estimator, or an ``xgb.Booster`` for XGBoost; pass it to ``predict``.
+        """
+        if not uses_quantile_dmatrix(estimator):
+            weights = self.weights(rows)
+            return estimator.fit(self.frame(rows), self.labels[rows], **({} if weights is None else {"sample_weight": weights}))
+
+        params = estimator.get_xgb_params()
+        # Labels are encoded 0..k-1, so every window gets the class layout of the whole matrix
+        n_classes = int(self.labels.max()) + 1
+        if n_classes > 2:
+            params.update(objective="multi:softprob", num_class=n_classes)
+        return xgb.train(params, self.quantile_dmatrix(rows, params.get("max_bin") or 256),
+                         num_boost_round=estimator.n_estimators or 100)
+
+    def predict(self, model, rows=slice(None)):
+        """
+        Predict the labels of a window of rows with a model returned by ``fit``.
+        """
+        if not isinstance(model, xgb.Booster):
+            return model.predict(self.frame(rows))
+        probabilities = model.inplace_predict(self.values[rows])
+        return probabilities.argmax(axis=1) if probabilities.ndim == 2 else (probabilities > 0.5).astype(int)
+
+
+def uses_quantile_dmatrix(estimator):
+    """
+    Whether ``FeatureMatrix.fit`` trains this estimator on a cached QuantileDMatrix.
+    """
+    return isinstance(estimator, XGBClassifier) and estimator.get_params().get("tree_method") in (None, "hist")
+
+
+def clear_dmatrix_cache():
+    """
+    Release the cached QuantileDMatrix windows of this process.
+    """
+    _dmatrix_cache.clear()
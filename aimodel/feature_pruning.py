@@ -0,0 +1,224 @@
+import logging
+import time
+from functools import partial
+
+import numpy as np
+import xgboost as xgb
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, f1_score
+
+from .feature_matrix import FeatureMatrix, clear_dmatrix_cache
+from .time_series_cv import holdout_split
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+SCORERS = {
+    "accuracy": accuracy_score,
+    "f1_macro": lambda y_true, y_pred, sample_weight=None: f1_score(y_true, y_pred, average="macro", zero_division=0, sample_weight=sample_weight),
+}
+
+# Most recent training rows the feature correlations are estimated on
+CORRELATION_ROWS = 100_000
+
+
+def _permutation_importances(model, matrix, columns, baseline, scoring, n_repeats, seed, n_threads):
+    """
+    Mean drop of the validation score when each of ``columns`` is shuffled, run in a worker process.
+
+    The model predicts with ``n_threads`` threads, its share of the cores split between the workers.
+    """
+    if isinstance(model, xgb.Booster):
+        model.set_param({"nthread": n_threads})
+    elif "n_jobs" in model.get_params():
+        model.set_params(n_jobs=n_threads)
+    rng = np.random.default_rng(seed)
+    # One writable copy per worker; each column is restored after its repeats
+    values = np.array(matrix.values)
+    permuted = FeatureMatrix(values, matrix.labels, columns=matrix.columns)
+    scorer = partial(SCORERS[scoring], matrix.labels, sample_weight=matrix.sample_weight)
+    importances = []
+    for column in columns:
+        original = values[:, column].copy()
+        drops = []
+        for _ in range(n_repeats):
+            values[:, column] = rng.permutation(original)
+            drops.append(baseline - scorer(permuted.predict(model)))
+        values[:, column] = original
+        importances.append(float(np.mean(drops)))
+    return importances
+
+
+def _gain_importances(model, columns):
+    """
+    Split gain of every column as a fraction of the total, from an XGBoost booster or a fitted tree model.
+    """
+    if isinstance(model, xgb.Booster):
+        scores = model.get_score(importance_type="total_gain")
+        importances = np.array([scores.get(column, 0.0) for column in columns], dtype=np.float64)
+    elif hasattr(model, "feature_importances_"):
+        importances = np.asarray(model.feature_importances_, dtype=np.float64)
+    else:
+        raise ValueError(f"{type(model).__name__} has no gain importances; use the permutation method.")
+    total = importances.sum()
+    return importances / total if total > 0 else importances
+
+
+class FeaturePruner:
+    """
+    Importance-driven feature selection on a held-out window of the training period.
+
+    A clone of the estimator is fitted on the earlier part of the training rows and the features are ranked on
+    the last ``validation_size`` of them, either by permutation importance (the drop of the validation score
+    when a feature is shuffled, computed for groups of features in parallel worker processes that split the
+    ``n_jobs`` cores between them) or by the split
+    gain of the fitted trees. Features at or below ``min_importance`` are dropped; the others are then visited
+    from the most to the least important and a feature whose absolute correlation with one already kept exceeds
+    ``max_correlation`` is dropped as redundant. ``max_features`` finally caps the number kept.
+    """
+
+    METHODS = ("permutation", "gain")
+
+    def __init__(self, method="permutation", min_importance=0.0, max_correlation=0.95, max_features=None,
+                 validation_size=0.2, n_repeats=3, scoring="accuracy", n_jobs=-1, random_state=42):
+        """
+        Initialize the FeaturePruner.
+
+        Args:
+            method (str): "permutation" or "gain".
+            min_importance (float): Features with an importance at or below this are dropped. Permutation
+                importances are score drops, gain importances fractions of the total gain.
+            max_correlation (float): Largest absolute correlation allowed between two kept features; None
+                skips the correlation filter.
+            max_features (int): Most features kept; None keeps every feature that passes the filters.
+            validation_size (float): Fraction of the training rows used to rank the features.
+            n_repeats (int): Shuffles per feature of the permutation method.
+            scoring (str): "accuracy" or "f1_macro".
+            n_jobs (int): Worker processes of the permutation method; -1 uses all cores.
+            random_state (int): Seed of the shuffles.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unsupported pruning method: {method}")
+        if scoring not in SCORERS:
+            raise ValueError(f"Unsupported pruning scoring: {scoring}")
+        self.method = method
+        self.min_importance = min_importance
+        self.max_correlation = max_correlation
+        self.max_features = max_features
+        self.validation_size = validation_size
+        self.n_repeats = n_repeats
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    @classmethod
+    def from_config(cls, pruning_config):
+        """
+        Create a FeaturePruner from the ``pruning`` section of a model config.
+
+        Args:
+            pruning_config (dict): Optional ``method``, ``min_importance``, ``max_correlation``, ``max_features``,
+                ``validation_size``, ``n_repeats``, ``scoring``, ``n_jobs`` and ``random_state``.
+
+        Returns:
+            FeaturePruner: The pruner.
+        """
+        keys = ("method", "min_importance", "max_correlation", "max_features", "validation_size", "n_repeats",
+                "scoring", "n_jobs", "random_state")
+        return cls(**{key: pruning_config[key] for key in keys if key in pruning_config})
+
+    def importances(self, model, matrix):
+        """
+        Importance of every feature of a fitted model on a validation window.
+
+        Args:
+            model: Model returned by ``FeatureMatrix.fit``.
+            matrix (FeatureMatrix): The validation rows with their labels and weights.
+
+        Returns:
+            np.ndarray: Importance per column of ``matrix``.
+        """
+        if self.method == "gain":
+            return _gain_importances(model, matrix.columns)
+
+        baseline = SCORERS[self.scoring](matrix.labels, matrix.predict(model), sample_weight=matrix.sample_weight)
+        groups = [group for group in np.array_split(np.arange(len(matrix.columns)), effective_n_jobs(self.n_jobs)) if len(group)]
+        n_threads = max(1, effective_n_jobs(self.n_jobs) // len(groups))
+        # joblib memory-maps the validation window into the workers instead of pickling a copy per group
+        results = Parallel(n_jobs=len(groups), backend="loky")(
+            delayed(_permutation_importances)(
+                model, matrix, group.tolist(), baseline, self.scoring, self.n_repeats, self.random_state + i, n_threads
+            )
+            for i, group in enumerate(groups)
+        )
+        return np.array([importance for result in results for importance in result])
+
+    def _correlations(self, values, candidates):
+        window = values[-CORRELATION_ROWS:, candidates].astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            correlations = np.abs(np.corrcoef(window, rowvar=False))
+        # Constant columns have no correlation
+        return np.nan_to_num(np.atleast_2d(correlations), nan=0.0)
+
+    def fit(self, estimator, X, y=None, purge=0):
+        """
+        Select the features.
+
+        Args:
+            estimator: Unfitted scikit-learn compatible estimator.
+            X (FeatureMatrix or pd.DataFrame): Training features in time order.
+            y (pd.Series or np.ndarray): Labels; ignored for a ``FeatureMatrix``.
+            purge (int): Rows dropped between the fitting and validation windows (the labeling horizon).
+
+        Returns:
+            dict: ``selected`` feature names in their original order, ``dropped`` with the reason per dropped
+            feature, ``importances`` per feature, the ``method``, the ``baseline_score`` of the full feature
+            set on the validation window and ``wall_seconds``.
+        """
+        try:
+            start = time.perf_counter()
+            matrix = X if isinstance(X, FeatureMatrix) else FeatureMatrix(X, y)
+            train, valid = holdout_split(len(matrix), self.validation_size, gap=purge)
+            model = matrix.fit(clone(estimator), train)
+            validation = matrix.take(valid)
+            baseline_score = float(SCORERS[self.scoring](validation.labels, validation.predict(model), sample_weight=validation.sample_weight))
+            importances = self.importances(model, validation)
+            clear_dmatrix_cache()
+
+            columns = matrix.columns
+            dropped = {columns[i]: "low importance" for i in np.flatnonzero(importances <= self.min_importance)}
+            # Visit the remaining features from the most important; if none is left the best one is kept
+            ranked = [int(i) for i in np.argsort(-importances, kind="stable") if columns[i] not in dropped]
+            if not ranked:
+                ranked = [int(np.argmax(importances))]
+                del dropped[columns[ranked[0]]]
+
+            correlations = self._correlations(matrix.values[train], ranked) if self.max_correlation is not None else None
+            kept = []
+            for position, i in enumerate(ranked):
+                if self.max_features is not None and len(kept) >= self.max_features:
+                    dropped[columns[i]] = "max features"
+                    continue
+                if correlations is not None and kept:
+                    closest = max(kept, key=lambda k: correlations[position, k])
+                    if correlations[position, closest] > self.max_correlation:
+                        dropped[columns[i]] = f"correlated with {columns[ranked[closest]]} ({correlations[position, closest]:.3f})"
+                        continue
+                kept.append(position)
+
+            selected = [columns[i] for i in sorted(ranked[position] for position in kept)]
+            wall_seconds = time.perf_counter() - start
+            logging.info(f"Feature pruning kept {len(selected)} of {len(columns)} features in {wall_seconds:.2f}s; dropped {dropped}")
+            return {
+                "method": self.method,
+                "selected": selected,
+                "dropped": dropped,
+                "importances": dict(zip(columns, importances.tolist())),
+                "baseline_score": baseline_score,
+                "wall_seconds": wall_seconds,
+            }
+        except Exception as e:
+            logging.error("Error pruning features", exc_info=True)
+            raise e
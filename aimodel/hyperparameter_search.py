@@ -0,0 +1,245 @@
+import logging
+import math
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+
+from .feature_matrix import FeatureMatrix
+from .model_engine import ModelEngine
+from .time_series_cv import WalkForwardCV, evaluate_fold
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Search spaces used when the model config does not give its own ``param_distributions``
+DEFAULT_DISTRIBUTIONS = {
+    "randomForest": {
+        "n_estimators": {"type": "int", "low": 50, "high": 400},
+        "max_depth": [None, 4, 8, 16],
+        "min_samples_leaf": {"type": "int", "low": 1, "high": 50, "log": True},
+        "max_features": ["sqrt", "log2", None],
+    },
+    "logisticRegression": {
+        "C": {"type": "float", "low": 1e-3, "high": 1e2, "log": True},
+        "max_iter": [1000],
+    },
+    "svc": {
+        "C": {"type": "float", "low": 1e-2, "high": 1e2, "log": True},
+        "gamma": ["scale", "auto"],
+        "kernel": ["rbf", "linear"],
+    },
+    "xgboost": {
+        "n_estimators": {"type": "int", "low": 50, "high": 500},
+        "max_depth": {"type": "int", "low": 2, "high": 10},
+        "learning_rate": {"type": "float", "low": 0.01, "high": 0.3, "log": True},
+        "subsample": {"type": "float", "low": 0.5, "high": 1.0},
+        "colsample_bytree": {"type": "float", "low": 0.5, "high": 1.0},
+    },
+    "sgdClassifier": {
+        "loss": ["log_loss", "modified_huber", "hinge"],
+        "alpha": {"type": "float", "low": 1e-6, "high": 1e-2, "log": True},
+        "penalty": ["l2", "l1", "elasticnet"],
+    },
+}
+
+
+def sample_params(distributions, rng):
+    """
+    Draw one parameter set.
+
+    A distribution is either a list of choices or ``{"type": "int" | "float", "low": ..., "high": ..., "log": bool}``.
+
+    Args:
+        distributions (dict): Distribution per parameter name.
+        rng (np.random.Generator): Random generator.
+
+    Returns:
+        dict: The sampled parameters, as plain Python values.
+    """
+    params = {}
+    for name, distribution in distributions.items():
+        if isinstance(distribution, (list, tuple)):
+            value = distribution[rng.integers(len(distribution))]
+        else:
+            low, high = distribution["low"], distribution["high"]
+            if distribution.get("log"):
+                value = math.exp(rng.uniform(math.log(low), math.log(high)))
+            else:
+                value = rng.uniform(low, high)
+            if distribution.get("type") == "int":
+                value = int(min(high, max(low, round(value))))
+            else:
+                value = float(value)
+        params[name] = value.item() if isinstance(value, np.generic) else value
+    return params
+
+
+class HyperparameterSearch:
+    """
+    Successive-halving and Hyperband search over a ModelEngine method.
+
+    Every candidate is scored with walk-forward cross-validation on a budget: the most recent fraction of each
+    fold's training window. A rung scores all surviving candidates at the same budget, keeps the best
+    ``1 / factor`` of them and multiplies the budget by ``factor``, so poor candidates stop after a cheap fit
+    on little data and only the best few are fitted on whole windows. Hyperband runs several such brackets,
+    trading the number of candidates against their starting budget.
+    """
+
+    STRATEGIES = ("successive_halving", "hyperband")
+
+    def __init__(self, method, param_distributions=None, strategy="successive_halving", n_candidates=None,
+                 factor=3, min_resource=None, scoring="accuracy", cv=None, n_jobs=-1, random_state=42, compute_profile=None):
+        """
+        Initialize the HyperparameterSearch.
+
+        Args:
+            method (str): ModelEngine method, e.g. "xgboost".
+            param_distributions (dict): Distribution per parameter; defaults to ``DEFAULT_DISTRIBUTIONS[method]``.
+            strategy (str): "successive_halving" or "hyperband".
+            n_candidates (int): Candidates of successive halving. Defaults to ``factor ** 3``.
+            factor (int): Fraction of candidates kept per rung, as ``1 / factor``.
+            min_resource (float): Smallest training budget, as a fraction of each training window. Defaults
+                to ``1 / factor ** 2``.
+            scoring (str): Fold metric to maximize, e.g. "accuracy" or "f1_macro".
+            cv (WalkForwardCV): Splitter; defaults to five walk-forward folds.
+            n_jobs (int): Trials run at once; -1 uses all cores.
+            random_state (int): Seed of the candidate sampling.
+            compute_profile (ComputeProfile): Resource profile of the candidates; also caps ``n_jobs``.
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unsupported search strategy: {strategy}")
+        if param_distributions is None and method not in DEFAULT_DISTRIBUTIONS:
+            raise ValueError(f"No parameter distributions for model method: {method}")
+        if factor < 2:
+            raise ValueError("factor must be at least 2.")
+        self.method = method
+        self.param_distributions = param_distributions or DEFAULT_DISTRIBUTIONS[method]
+        self.strategy = strategy
+        self.factor = factor
+        self.n_candidates = n_candidates or factor ** 3
+        self.min_resource = min_resource or 1.0 / factor ** 2
+        self.scoring = scoring
+        self.cv = cv or WalkForwardCV()
+        self.compute_profile = compute_profile
+        self.n_jobs = n_jobs if compute_profile is None else compute_profile.n_jobs(n_jobs)
+        self.rng = np.random.default_rng(random_state)
+
+    @classmethod
+    def from_config(cls, method, search_config, cv=None, compute_profile=None):
+        """
+        Create a HyperparameterSearch from the ``search`` section of a model config.
+
+        Args:
+            method (str): ModelEngine method.
+            search_config (dict): Optional ``param_distributions``, ``strategy``, ``n_candidates``, ``factor``,
+                ``min_resource``, ``scoring``, ``n_jobs`` and ``random_state``.
+            cv (WalkForwardCV): Splitter.
+            compute_profile (ComputeProfile): Resource profile of the build.
+
+        Returns:
+            HyperparameterSearch: The search.
+        """
+        keys = ("param_distributions", "strategy", "n_candidates", "factor", "min_resource", "scoring", "n_jobs", "random_state")
+        return cls(method, cv=cv, compute_profile=compute_profile, **{key: search_config[key] for key in keys if key in search_config})
+
+    def brackets(self):
+        """
+        (number of candidates, starting budget) of every successive-halving bracket the strategy runs.
+        """
+        if self.strategy == "successive_halving":
+            return [(self.n_candidates, self.min_resource)]
+        # Hyperband: from many candidates on the smallest budget to a few on whole training windows
+        s_max = int(round(math.log(1.0 / self.min_resource, self.factor)))
+        return [
+            (int(math.ceil((s_max + 1) / (s + 1) * self.factor ** s)), self.factor ** -s)
+            for s in range(s_max, -1, -1)
+        ]
+
+    def fit(self, X, y):
+        """
+        Run the search.
+
+        The features are converted once to a float32 ``FeatureMatrix`` and dumped to a memory-mapped file; every
+        trial of every rung reads that file instead of receiving its own copy, and XGBoost trials on the same
+        window share one cached QuantileDMatrix.
+
+        Args:
+            X (FeatureMatrix, pd.DataFrame or np.ndarray): Feature matrix in time order.
+            y (pd.Series or np.ndarray): Labels; ignored for a ``FeatureMatrix``.
+
+        Returns:
+            dict: ``best_params``, ``best_score``, ``trials`` (params, budget, score and fit time of every
+            candidate at every rung) and ``wall_seconds``.
+        """
+        try:
+            start = time.perf_counter()
+            folds = self.cv.split(len(X))
+            concurrent = effective_n_jobs(self.n_jobs)
+            trials = []
+
+            with tempfile.TemporaryDirectory() as folder:
+                path = os.path.join(folder, "features.joblib")
+                joblib.dump(X if isinstance(X, FeatureMatrix) else FeatureMatrix(X, y), path)
+                matrix = joblib.load(path, mmap_mode="r")
+
+                with Parallel(n_jobs=concurrent, backend="loky") as parallel:
+                    for bracket, (n_candidates, budget) in enumerate(self.brackets()):
+                        candidates = [sample_params(self.param_distributions, self.rng) for _ in range(n_candidates)]
+                        trials.extend(self._successive_halving(parallel, concurrent, candidates, budget, folds, matrix, bracket))
+
+            # Only candidates that reached the whole training windows are comparable
+            finalists = [trial for trial in trials if trial["budget"] == 1.0]
+            best = max(finalists, key=lambda trial: trial["score"])
+            wall_seconds = time.perf_counter() - start
+            logging.info(f"{self.strategy} search over {len(trials)} trials in {wall_seconds:.2f}s: best {self.scoring}={best['score']:.4f} with {best['params']}")
+            return {
+                "strategy": self.strategy,
+                "scoring": self.scoring,
+                "best_params": best["params"],
+                "best_score": best["score"],
+                "trials": trials,
+                "wall_seconds": wall_seconds,
+            }
+        except Exception as e:
+            logging.error("Error running hyperparameter search", exc_info=True)
+            raise e
+
+    def _successive_halving(self, parallel, concurrent, candidates, budget, folds, matrix, bracket):
+        trials = []
+        while True:
+            # Snap to whole windows so rounding never adds a rung
+            budget = 1.0 if budget > 1.0 - 1e-9 else budget
+            jobs = []
+            for params in candidates:
+                estimator = ModelEngine.from_params(self.method, params, self.compute_profile).create_model()
+                if concurrent > 1 and "n_jobs" in estimator.get_params():
+                    estimator.set_params(n_jobs=1)
+                for fold, (train, test) in enumerate(folds):
+                    # The budget keeps the most recent rows of the training window
+                    rows = max(1, int(round((train.stop - train.start) * budget)))
+                    jobs.append(delayed(evaluate_fold)(estimator, matrix, None, fold, slice(train.stop - rows, train.stop), test))
+            results = parallel(jobs)
+
+            rung = []
+            for i, params in enumerate(candidates):
+                scores = results[i * len(folds):(i + 1) * len(folds)]
+                rung.append({
+                    "bracket": bracket,
+                    "budget": budget,
+                    "params": params,
+                    "score": float(np.mean([fold[self.scoring] for fold in scores])),
+                    "fit_seconds": float(sum(fold["fit_seconds"] for fold in scores)),
+                })
+            trials.extend(rung)
+            logging.info(f"Bracket {bracket}: {len(candidates)} candidates at budget {budget:.3f}, best {self.scoring}={max(t['score'] for t in rung):.4f}")
+
+            if budget >= 1.0:
+                return trials
+            keep = max(1, len(candidates) // self.factor)
+            candidates = [trial["params"] for trial in sorted(rung, key=lambda trial: trial["score"], reverse=True)[:keep]]
+            budget *= self.factor
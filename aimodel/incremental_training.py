@@ -0,0 +1,114 @@
+import logging
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from xgboost import XGBClassifier
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def _with_all_classes(model, X, y):
+    """
+    Append a zero-weight row for every class of ``model`` missing from ``y``.
+
+    Refitting on a short window that happens to miss a class would otherwise change the model's class layout.
+    The extra rows carry no weight, so they only keep the classes in place.
+
+    Returns:
+        tuple: (X, y, sample_weight).
+
+    Raises:
+        ValueError: If ``y`` contains a class the model was not trained on.
+    """
+    classes = np.asarray(model.classes_)
+    present = np.unique(np.asarray(y))
+    unknown = np.setdiff1d(present, classes)
+    if len(unknown):
+        raise ValueError(f"New data has classes {unknown.tolist()} the model was not trained on; rebuild it from scratch.")
+    missing = np.setdiff1d(classes, present)
+    weight = np.ones(len(y))
+    if len(missing) == 0:
+        return X, y, weight
+
+    if hasattr(X, "iloc"):
+        X = pd.concat([X, X.iloc[[0] * len(missing)]], ignore_index=True)
+    else:
+        X = np.concatenate([X, np.repeat(np.asarray(X)[:1], len(missing), axis=0)])
+    y = np.concatenate([np.asarray(y), missing.astype(np.asarray(y).dtype)])
+    return X, y, np.concatenate([weight, np.zeros(len(missing))])
+
+
+def _continue_boosting(model, X, y, n_estimators, max_estimators):
+    # The new rounds fit the residuals of the saved booster on the new rows only
+    X, y, weight = _with_all_classes(model, X, y)
+    params = {**model.get_params(), "n_estimators": n_estimators}
+    updated = XGBClassifier(**params)
+    updated.fit(X, y, sample_weight=weight, xgb_model=model.get_booster())
+    total = updated.get_booster().num_boosted_rounds()
+    if max_estimators and total > max_estimators:
+        logging.warning(f"Booster has {total} rounds, above max_estimators={max_estimators}; a full rebuild is due.")
+    return updated
+
+
+def _grow_forest(model, X, y, n_estimators, max_estimators):
+    # warm_start keeps the fitted trees and adds n_estimators new ones grown on the new rows
+    X, y, weight = _with_all_classes(model, X, y)
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_estimators)
+    model.fit(X, y, sample_weight=weight)
+    if max_estimators and len(model.estimators_) > max_estimators:
+        # Forget the oldest trees so the forest tracks the recent regime and keeps a bounded size
+        model.estimators_ = model.estimators_[-max_estimators:]
+        model.set_params(n_estimators=max_estimators)
+    return model
+
+
+def _partial_fit(model, X, y, n_estimators, max_estimators):
+    model.partial_fit(X, y, classes=model.classes_)
+    return model
+
+
+def supports_incremental(model):
+    """
+    Whether ``continue_training`` can update this model.
+    """
+    return isinstance(model, (XGBClassifier, RandomForestClassifier)) or hasattr(model, "partial_fit")
+
+
+def continue_training(model, X, y, n_estimators=50, max_estimators=None):
+    """
+    Update a fitted model with new rows instead of refitting it on the whole history.
+
+    XGBoost models continue boosting from their booster with ``n_estimators`` more rounds, random forests grow
+    ``n_estimators`` more trees on the new rows through ``warm_start``, and estimators with ``partial_fit``
+    (e.g. ``SGDClassifier``) take one pass over the new rows.
+
+    Args:
+        model: The fitted model.
+        X (pd.DataFrame or np.ndarray): Features of the new rows.
+        y (pd.Series or np.ndarray): Labels of the new rows, encoded like the training labels.
+        n_estimators (int): Boosting rounds or trees to add.
+        max_estimators (int): Upper bound on the trees of a random forest (the oldest are dropped); for XGBoost
+            only a warning, since boosting rounds depend on each other.
+
+    Returns:
+        The updated model. XGBoost returns a new estimator; the others are updated in place.
+
+    Raises:
+        ValueError: If the model does not support incremental updates or the new rows bring an unseen class.
+    """
+    try:
+        if isinstance(model, XGBClassifier):
+            update = _continue_boosting
+        elif isinstance(model, RandomForestClassifier):
+            update = _grow_forest
+        elif hasattr(model, "partial_fit"):
+            update = _partial_fit
+        else:
+            raise ValueError(f"{type(model).__name__} cannot be updated incrementally; rebuild it from scratch.")
+        return update(model, X, y, n_estimators, max_estimators)
+    except Exception as e:
+        logging.error("Error updating the model incrementally", exc_info=True)
+        raise e
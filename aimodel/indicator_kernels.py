@@ -0,0 +1,589 @@
+import math
+
+import numpy as np
+from scipy.signal import lfilter
+
+
+def as_float_array(values):
+    """
+    Return the input as a contiguous float64 array without copying when possible.
+    """
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _output(n, out):
+    """
+    Return the caller supplied output buffer, or allocate one of length n.
+    """
+    if out is None:
+        return np.empty(n, dtype=np.float64)
+    if out.shape[0] != n:
+        raise ValueError(f"Output buffer has {out.shape[0]} rows, expected {n}.")
+    return out
+
+
+def diff(values, out=None):
+    """
+    First difference of a series, NaN in the first position (pandas ``Series.diff``).
+
+    Args:
+        values (array-like): Input series.
+        out (np.ndarray): Optional preallocated output buffer.
+
+    Returns:
+        np.ndarray: The differenced series.
+    """
+    values = as_float_array(values)
+    out = _output(len(values), out)
+    if len(values) == 0:
+        return out
+    out[0] = np.nan
+    np.subtract(values[1:], values[:-1], out=out[1:])
+    return out
+
+
+def rolling_mean(values, period, out=None):
+    """
+    Rolling mean over a fixed window, computed from a running sum so the cost does not depend on the window.
+
+    A window containing a NaN yields NaN, matching ``Series.rolling(period, min_periods=period).mean()``.
+
+    Args:
+        values (array-like): Input series.
+        period (int): Window length.
+        out (np.ndarray): Optional preallocated output buffer.
+
+    Returns:
+        np.ndarray: The rolling mean, NaN for the first ``period - 1`` rows.
+    """
+    values = as_float_array(values)
+    n = len(values)
+    out = _output(n, out)
+    out[:] = np.nan
+    if n < period:
+        return out
+
+    missing = np.isnan(values)
+    csum = np.empty(n + 1)
+    csum[0] = 0.0
+    np.cumsum(np.where(missing, 0.0, values), out=csum[1:])
+    np.subtract(csum[period:], csum[:-period], out=out[period - 1:])
+    out[period - 1:] /= period
+
+    if missing.any():
+        ccount = np.concatenate(([0], np.cumsum(missing)))
+        out[period - 1:][(ccount[period:] - ccount[:-period]) > 0] = np.nan
+    return out
+
+
+def ema(values, span, out=None, seed="first"):
+    """
+    Exponential moving average with smoothing factor ``2 / (span + 1)``.
+
+    ``seed="first"`` starts from the first value (pandas ``ewm(span=span, adjust=False)``); ``seed="sma"``
+    starts from the mean of the first ``span`` values, NaN before it (TA-Lib ``EMA``). Leading NaN values are
+    skipped and stay NaN in the output.
+
+    Args:
+        values (array-like): Input series.
+        span (int): EMA span.
+        out (np.ndarray): Optional preallocated output buffer.
+        seed (str): ``"first"`` or ``"sma"``.
+
+    Returns:
+        np.ndarray: The EMA series.
+    """
+    values = as_float_array(values)
+    out = _output(len(values), out)
+    alpha = 2.0 / (span + 1.0)
+    if seed == "first":
+        return _recursive_smooth(values, alpha, out)
+    if seed == "sma":
+        return _sma_seeded_smooth(values, span, alpha, out)
+    raise ValueError(f"Unsupported EMA seed: {seed}")
+
+
+# Bars MAMA's price smoother and Hilbert transform take before the first output
+MAMA_LOOKBACK = 32
+
+
+def _first_finite(values):
+    finite = np.flatnonzero(~np.isnan(values))
+    return int(finite[0]) if len(finite) else len(values)
+
+
+def _sma_seeded_smooth(values, period, alpha, out, seed_index=None):
+    """
+    Recursive smoothing seeded at ``seed_index`` with the mean of the ``period`` values ending there.
+
+    By default the seed sits ``period - 1`` rows after the first finite value, which is how TA-Lib starts its
+    EMA and Wilder averages; MACD moves the fast average's seed to the slow one's.
+    """
+    if seed_index is None:
+        seed_index = _first_finite(values) + period - 1
+    if seed_index >= len(values):
+        out[:] = np.nan
+        return out
+    seed = values[seed_index - period + 1:seed_index + 1].mean()
+    return _recursive_smooth(values, alpha, out, start=seed_index, seed=seed)
+
+
+# TA-Lib MA_Type codes
+MA_TYPES = {0: "SMA", 1: "EMA", 2: "WMA", 3: "DEMA", 4: "TEMA", 5: "TRIMA", 6: "KAMA", 7: "MAMA", 8: "T3"}
+
+# Fixed parameters TA-Lib uses when KAMA, MAMA and T3 are selected through an MA type
+KAMA_FAST_PERIOD = 2
+KAMA_SLOW_PERIOD = 30
+MAMA_FAST_LIMIT = 0.5
+MAMA_SLOW_LIMIT = 0.05
+T3_VOLUME_FACTOR = 0.7
+
+
+def moving_average(values, period, matype=0, out=None):
+    """
+    TA-Lib style moving average selected by ``matype`` (TA-Lib ``MA``).
+
+    Args:
+        values (array-like): Input series.
+        period (int): Averaging period (ignored by MAMA, which adapts its own).
+        matype (int): One of ``MA_TYPES``: 0 SMA, 1 SMA-seeded EMA, 2 WMA, 3 DEMA, 4 TEMA, 5 TRIMA, 6 KAMA,
+            7 MAMA, 8 T3.
+        out (np.ndarray): Optional preallocated output buffer.
+
+    Returns:
+        np.ndarray: The moving average.
+    """
+    averages = {
+        0: rolling_mean,
+        1: lambda values, period, out: ema(values, period, out=out, seed="sma"),
+        2: wma,
+        3: dema,
+        4: tema,
+        5: trima,
+        6: kama,
+        7: lambda values, period, out: mama(values, out=out),
+        8: t3,
+    }
+    if matype not in averages:
+        raise ValueError(f"Unsupported moving average type: {matype}")
+    if period == 1:
+        # TA-Lib returns the input unchanged for a one-bar average of any type
+        out = _output(len(values), out)
+        out[:] = values
+        return out
+    return averages[matype](values, period, out=out)
+
+
+def wma(values, period, out=None):
+    """
+    Linearly weighted moving average, the newest value weighted ``period`` (TA-Lib ``WMA``).
+
+    Args:
+        values (array-like): Input series.
+        period (int): Window length.
+        out (np.ndarray): Optional preallocated output buffer.
+
+    Returns:
+        np.ndarray: The WMA, NaN until a full window exists.
+    """
+    values = as_float_array(values)
+    n = len(values)
+    out = _output(n, out)
+    out[:] = np.nan
+    if n < period:
+        return out
+    # Convolution flips the kernel, so ascending weights land on the newest values
+    weights = np.arange(period, 0, -1, dtype=np.float64) / (period * (period + 1) / 2.0)
+    out[period - 1:] = np.convolve(values, weights, mode="valid")
+    return out
+
+
+def dema(values, period, out=None):
+    """
+    Double exponential moving average, ``2 * EMA - EMA(EMA)`` (TA-Lib ``DEMA``).
+    """
+    out = ema(values, period, out=out, seed="sma")
+    smoothed = ema(out, period, seed="sma")
+    out *= 2.0
+    out -= smoothed
+    return out
+
+
+def tema(values, period, out=None):
+    """
+    Triple exponential moving average, ``3 * EMA - 3 * EMA(EMA) + EMA(EMA(EMA))`` (TA-Lib ``TEMA``).
+    """
+    out = ema(values, period, out=out, seed="sma")
+    second = ema(out, period, seed="sma")
+    third = ema(second, period, seed="sma")
+    out -= second
+    out *= 3.0
+    out += third
+    return out
+
+
+def trima(values, period, out=None):
+    """
+    Triangular moving average, a simple average of a simple average (TA-Lib ``TRIMA``).
+
+    Odd periods average twice over ``(period + 1) / 2`` rows, even ones over ``period / 2`` and then
+    ``period / 2 + 1`` rows, which gives TA-Lib's triangular weights.
+    """
+    first = period // 2 if period % 2 == 0 else (period + 1) // 2
+    second = first + 1 if period % 2 == 0 else first
+    return rolling_mean(rolling_mean(values, first), second, out=out)
+
+
+def kama(values, period, out=None):
+    """
+    Kaufman adaptive moving average (TA-Lib ``KAMA``).
+
+    The smoothing factor moves between the 2- and 30-period EMA factors with the efficiency ratio, the net
+    change over ``period`` rows divided by the sum of the absolute changes. The average starts from the value
+    ``period`` rows after the first finite one.
+
+    Args:
+        values (array-like): Input series.
+        period (int): Period of the efficiency ratio.
+        out (np.ndarray): Optional preallocated output buffer.
+
+    Returns:
+        np.ndarray: The KAMA, NaN for the first ``period`` rows.
+    """
+    values = as_float_array(values)
+    n = len(values)
+    out = _output(n, out)
+    out[:] = np.nan
+    start = _first_finite(values)
+    if n - start <= period:
+        return out
+
+    series = values[start:]
+    change = np.abs(np.diff(series))
+    csum = np.concatenate(([0.0], np.cumsum(change)))
+    volatility = csum[period:] - csum[:-period]
+    direction = np.abs(series[period:] - series[:-period])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        efficiency = np.where(volatility > 0.0, direction / volatility, 1.0)
+    slowest = 2.0 / (KAMA_SLOW_PERIOD + 1.0)
+    fastest = 2.0 / (KAMA_FAST_PERIOD + 1.0)
+    alphas = (efficiency * (fastest - slowest) + slowest) ** 2
+
+    # The smoothing factor changes every row, so the recursion has no fixed-coefficient filter form
+    previous = series[period - 1]
+    target = out[start + period:]
+    for i, (alpha, value) in enumerate(zip(alphas.tolist(), series[period:].tolist())):
+        previous += alpha * (value - previous)
+        target[i] = previous
+    return out
+
+
+def mama(values, out=None, fast_limit=MAMA_FAST_LIMIT, slow_limit=MAMA_SLOW_LIMIT):
+    """
+    Ehlers' MESA adaptive moving average (TA-Lib ``MAMA``, the MAMA line).
+
+    The smoothing factor follows the rate of change of the phase of a Hilbert transform of the price, between
+    ``slow_limit`` and ``fast_limit``. The transform runs bar by bar, as in TA-Lib, with separate delay lines
+    for even and odd bars counted from the first finite value.
+
+    Args:
+        values (array-like): Input series.
+        out (np.ndarray): Optional preallocated output buffer.
+        fast_limit (float): Largest smoothing factor.
+        slow_limit (float): Smallest smoothing factor.
+
+    Returns:
+        np.ndarray: The MAMA, NaN for the first 32 rows.
+    """
+    values = as_float_array(values)
+    n = len(values)
+    out = _output(n, out)
+    out[:] = np.nan
+    start = _first_finite(values)
+    if n - start <= MAMA_LOOKBACK:
+        return out
+
+    series = values[start:].tolist()
+    a, b = 0.0962, 0.5769
+    degrees = 180.0 / math.pi
+
+    # Four-bar weighted price smoother, primed on the first three values
+    wma_sub = series[0] + series[1] + series[2]
+    wma_sum = series[0] + 2.0 * series[1] + 3.0 * series[2]
+    trailing_value = 0.0
+    trailing_index = 0
+    smoothed = 0.0
+
+    # Hilbert transform state of the detrender, Q1, jI and jQ (slots 0-3 for even bars, 4-7 for odd ones)
+    delay_lines = [[0.0, 0.0, 0.0] for _ in range(8)]
+    previous_output = [0.0] * 8
+    previous_input = [0.0] * 8
+    hilbert_index = 0
+
+    def hilbert(slot, value, scale):
+        weighted = a * value
+        line = delay_lines[slot]
+        result = weighted - line[hilbert_index] - previous_output[slot]
+        line[hilbert_index] = weighted
+        previous_output[slot] = b * previous_input[slot]
+        previous_input[slot] = value
+        return (result + previous_output[slot]) * scale
+
+    period = 0.0
+    previous_i2 = previous_q2 = re = im = 0.0
+    # The detrender delayed by three bars, for even and odd bars
+    i1_prev3 = [0.0, 0.0]
+    i1_prev2 = [0.0, 0.0]
+    previous_phase = 0.0
+    mama_value = 0.0
+    result = out[start:]
+    for today in range(3, len(series)):
+        price = series[today]
+        wma_sub += price - trailing_value
+        wma_sum += 4.0 * price
+        trailing_value = series[trailing_index]
+        trailing_index += 1
+        smoothed = wma_sum * 0.1
+        wma_sum -= wma_sub
+        if today < 12:
+            continue
+
+        scale = 0.075 * period + 0.54
+        parity = today % 2
+        slot = 4 * parity
+        detrender = hilbert(slot, smoothed, scale)
+        q1 = hilbert(slot + 1, detrender, scale)
+        i1 = i1_prev3[parity]
+        j_i = hilbert(slot + 2, i1, scale)
+        j_q = hilbert(slot + 3, q1, scale)
+        if parity == 0:
+            hilbert_index = (hilbert_index + 1) % 3
+        q2 = 0.2 * (q1 + j_i) + 0.8 * previous_q2
+        i2 = 0.2 * (i1 - j_q) + 0.8 * previous_i2
+        i1_prev3[1 - parity] = i1_prev2[1 - parity]
+        i1_prev2[1 - parity] = detrender
+        phase = math.atan(q1 / i1) * degrees if i1 != 0.0 else 0.0
+
+        delta_phase = max(previous_phase - phase, 1.0)
+        previous_phase = phase
+        alpha = max(fast_limit / delta_phase, slow_limit) if delta_phase > 1.0 else fast_limit
+        mama_value = alpha * price + (1.0 - alpha) * mama_value
+        if today >= MAMA_LOOKBACK:
+            result[today] = mama_value
+
+        re = 0.2 * (i2 * previous_i2 + q2 * previous_q2) + 0.8 * re
+        im = 0.2 * (i2 * previous_q2 - q2 * previous_i2) + 0.8 * im
+        previous_q2, previous_i2 = q2, i2
+        previous_period = period
+        if im != 0.0 and re != 0.0:
+            period = 360.0 / (math.atan(im / re) * degrees)
+        period = min(max(period, 0.67 * previous_period), 1.5 * previous_period)
+        period = min(max(period, 6.0), 50.0)
+        period = 0.2 * period + 0.8 * previous_period
+    return out
+
+
+def t3(values, period, out=None, volume_factor=T3_VOLUME_FACTOR):
+    """
+    Tillson T3, a weighted sum of six cascaded SMA-seeded EMAs (TA-Lib ``T3``).
+    """
+    v2 = volume_factor * volume_factor
+    v3 = v2 * volume_factor
+    weights = (-v3, 3.0 * v2 + 3.0 * v3, -6.0 * v2 - 3.0 * volume_factor - 3.0 * v3, 1.0 + 3.0 * volume_factor + v3 + 3.0 * v2)
+
+    cascade = [ema(values, period, seed="sma")]
+    for _ in range(5):
+        cascade.append(ema(cascade[-1], period, seed="sma"))
+    out = _output(len(cascade[0]), out)
+    np.multiply(cascade[5], weights[0], out=out)
+    for weight, level in zip(weights[1:], cascade[4:1:-1]):
+        out += weight * level
+    return out
+
+
+def _recursive_smooth(values, alpha, out, start=None, seed=None):
+    """
+    Run ``y[t] = (1 - alpha) * y[t-1] + alpha * x[t]`` from ``start`` (seeded with ``seed``) as one IIR filter.
+    """
+    if start is None:
+        finite = np.flatnonzero(~np.isnan(values))
+        if len(finite) == 0:
+            out[:] = np.nan
+            return out
+        start = finite[0]
+        seed = values[start]
+
+    out[:start] = np.nan
+    out[start] = seed
+    if start + 1 < len(values):
+        out[start + 1:], _ = lfilter([alpha], [1.0, alpha - 1.0], values[start + 1:], zi=[(1.0 - alpha) * seed])
+    return out
+
+
+def rsi(close, timeperiod=14, smoothing="sma", out=None):
+    """
+    Relative Strength Index.
+
+    Args:
+        close (array-like): Close prices.
+        timeperiod (int): Averaging period for gains and losses.
+        smoothing (str): ``"sma"`` averages gains and losses with a simple rolling mean (the historical
+            training features); ``"wilder"`` uses Wilder's recursive average seeded with the mean of the
+            first ``timeperiod`` changes (TA-Lib ``RSI``).
+        out (np.ndarray): Optional preallocated output buffer.
+
+    Returns:
+        np.ndarray: RSI values in the 0-100 range.
+    """
+    if smoothing not in ("sma", "wilder"):
+        raise ValueError(f"Unsupported RSI smoothing: {smoothing}")
+
+    close = as_float_array(close)
+    n = len(close)
+    out = _output(n, out)
+
+    delta = diff(close)
+    # NaN compares False, so the first delta counts as a zero gain and a zero loss.
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+
+    if smoothing == "sma":
+        avg_gain = rolling_mean(gain, timeperiod, out=delta)
+        avg_loss = rolling_mean(loss, timeperiod, out=gain)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.divide(avg_gain, avg_loss, out=out)
+            out += 1.0
+            np.divide(100.0, out, out=out)
+            np.subtract(100.0, out, out=out)
+        return out
+
+    seed_index = _first_finite(close) + timeperiod
+    avg_gain = _sma_seeded_smooth(gain, timeperiod, 1.0 / timeperiod, delta, seed_index)
+    avg_loss = _sma_seeded_smooth(loss, timeperiod, 1.0 / timeperiod, np.empty(n), seed_index)
+    avg_loss += avg_gain
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(avg_gain, avg_loss, out=out)
+    out *= 100.0
+    # A flat window (no gains and no losses) reads 0, as in TA-Lib
+    out[avg_loss == 0.0] = 0.0
+    return out
+
+
+def macd(close, fastperiod=12, slowperiod=26, signalperiod=9, out=None, seed="first"):
+    """
+    MACD line and signal line.
+
+    Args:
+        close (array-like): Close prices.
+        fastperiod (int): Span of the fast EMA.
+        slowperiod (int): Span of the slow EMA.
+        signalperiod (int): Span of the signal EMA.
+        out (np.ndarray): Optional preallocated (n, 2) buffer receiving MACD and signal columns.
+        seed (str): ``"first"`` seeds every EMA with its first value (historical training features);
+            ``"sma"`` seeds both price EMAs at the slow period with simple means and the signal EMA with the
+            mean of the first MACD values, NaN until the signal exists (TA-Lib ``MACD``).
+
+    Returns:
+        np.ndarray: An (n, 2) array with the MACD line and the signal line.
+    """
+    close = as_float_array(close)
+    n = len(close)
+    if out is None:
+        out = np.empty((n, 2), dtype=np.float64, order="F")
+
+    if seed == "first":
+        macd_line = ema(close, fastperiod, out=out[:, 0])
+        macd_line -= ema(close, slowperiod, out=out[:, 1])
+        ema(macd_line, signalperiod, out=out[:, 1])
+        return out
+    if seed != "sma":
+        raise ValueError(f"Unsupported EMA seed: {seed}")
+
+    seed_index = _first_finite(close) + slowperiod - 1
+    macd_line = _sma_seeded_smooth(close, fastperiod, 2.0 / (fastperiod + 1.0), out[:, 0], seed_index)
+    macd_line -= _sma_seeded_smooth(close, slowperiod, 2.0 / (slowperiod + 1.0), out[:, 1], seed_index)
+    ema(macd_line, signalperiod, out=out[:, 1], seed="sma")
+    out[:min(seed_index + signalperiod - 1, n), 0] = np.nan
+    return out
+
+
+def atr(high, low, close, timeperiod=14, out=None):
+    """
+    Average True Range with Wilder smoothing seeded by the mean of the first ``timeperiod`` true ranges
+    (TA-Lib ``ATR``).
+
+    Args:
+        high (array-like): High prices.
+        low (array-like): Low prices.
+        close (array-like): Close prices.
+        timeperiod (int): Averaging period.
+        out (np.ndarray): Optional preallocated output buffer.
+
+    Returns:
+        np.ndarray: The ATR, NaN for the first ``timeperiod`` rows.
+    """
+    high = as_float_array(high)
+    low = as_float_array(low)
+    close = as_float_array(close)
+    n = len(close)
+    out = _output(n, out)
+    if n == 0:
+        return out
+
+    true_range = np.empty(n)
+    true_range[0] = np.nan
+    prev_close = close[:-1]
+    np.subtract(high[1:], low[1:], out=true_range[1:])
+    np.maximum(true_range[1:], np.abs(high[1:] - prev_close), out=true_range[1:])
+    np.maximum(true_range[1:], np.abs(low[1:] - prev_close), out=true_range[1:])
+    return _sma_seeded_smooth(true_range, timeperiod, 1.0 / timeperiod, out, _first_finite(close) + timeperiod)
+
+
+def ppo(close, fastperiod=12, slowperiod=26, matype=0, out=None):
+    """
+    Percentage Price Oscillator, ``100 * (fast MA - slow MA) / slow MA`` (TA-Lib ``PPO``).
+
+    Args:
+        close (array-like): Close prices.
+        fastperiod (int): Period of the fast moving average.
+        slowperiod (int): Period of the slow moving average.
+        matype (int): Moving average type (see ``moving_average``).
+        out (np.ndarray): Optional preallocated output buffer.
+
+    Returns:
+        np.ndarray: The PPO, NaN until the slow average exists.
+    """
+    close = as_float_array(close)
+    n = len(close)
+    out = _output(n, out)
+
+    slow = moving_average(close, slowperiod, matype)
+    moving_average(close, fastperiod, matype, out=out)
+
+    out -= slow
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out /= slow
+    out *= 100.0
+    out[slow == 0.0] = 0.0
+    return out
+
+
+def lag(values, periods, out=None):
+    """
+    Shift a series forward by ``periods`` rows, NaN-filling the head (pandas ``Series.shift``).
+
+    Args:
+        values (array-like): Input series.
+        periods (int): Number of rows to shift.
+        out (np.ndarray): Optional preallocated output buffer.
+
+    Returns:
+        np.ndarray: The lagged series.
+    """
+    values = as_float_array(values)
+    n = len(values)
+    out = _output(n, out)
+    periods = min(periods, n)
+    out[:periods] = np.nan
+    out[periods:] = values[:n - periods]
+    return out
@@ -1,23 +1,41 @@
 import logging
+from functools import lru_cache
+import numpy as np
 import pandas as pd
+from . import indicator_kernels
+from . import labeling_kernels as kernels
+from .event_expressions import compile_expression, expression_lookback
+from .feature_engine import FeatureEngine
 
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class LabelingEngine:
-    BUY_SIGNAL = 1
-    SELL_SIGNAL = -1
-    HOLD_SIGNAL = 0
+    BUY_SIGNAL = kernels.BUY_SIGNAL
+    SELL_SIGNAL = kernels.SELL_SIGNAL
+    HOLD_SIGNAL = kernels.HOLD_SIGNAL
+    # Columns derived from future prices; they describe the label and must never be used as features
+    OUTCOME_COLUMNS = ["future_close", "predicted_return", "touch_bars", "touch_time", "realized_return"]
+    # Parameter holding the look-ahead in rows of each method
+    HORIZON_PARAMS = {
+        "Next-Step Classification": "horizon",
+        "Multi-Class Trend Labeling": "timeHorizon",
+        "Triple-Barrier Labeling": "maxTime",
+        "Regression on Future Returns": "lookahead",
+        "Event-Based Labeling": "lookahead",
+    }
 
-    def __init__(self, label_config):
+    def __init__(self, label_config, label_dtype=np.int8):
         """
         Initialize the LabelingEngine with a label configuration object.
 
         Args:
             label_config (dict): Configuration dictionary for labeling.
+            label_dtype (np.dtype): Integer dtype of the BUY/SELL/HOLD label column.
         """
         self.label_config = label_config
+        self.label_dtype = label_dtype
 
     def apply_labeling_strategy(self, df):
         """
@@ -55,64 +73,201 @@ class LabelingEngine:
             logging.error("Error applying labeling strategy", exc_info=True)
             raise e
 
-    def _next_step_classification(self, df, horizon, threshold, threshold_type):
+    def label_horizon(self):
         """
-        Apply the Next-Step Classification strategy.
+        Number of future rows a label depends on; training rows this close to a test set must be purged.
+
+        Returns:
+            int: The look-ahead of the configured method.
         """
-        df = df.copy()
-        future_close = df["close"].shift(-horizon)
+        param = self.HORIZON_PARAMS.get(self.label_config.get("method"))
+        return int(self.label_config.get("params", {}).get(param, 0)) if param else 0
 
-        if threshold_type == "percent":
-            pct_change = (future_close - df["close"]) / df["close"]
-            df["label"] = pct_change.apply(lambda x: self.BUY_SIGNAL if x > threshold else (self.SELL_SIGNAL if x < -threshold else self.HOLD_SIGNAL))
-        else:
-            df["label"] = (future_close - df["close"]).apply(lambda x: self.BUY_SIGNAL if x > threshold else (self.SELL_SIGNAL if x < -threshold else self.HOLD_SIGNAL))
+    def warmup_rows(self):
+        """
+        Rows of history before a row that its label depends on, the past-side counterpart of ``label_horizon``.
+
+        Labeling a range together with this many rows before it gives the labels of labeling the whole history
+        (ATR barriers to within the EMA convergence tolerance of ``FeatureEngine``).
+
+        Returns:
+            int: The warm-up of the configured method.
+        """
+        method = self.label_config.get("method")
+        params = self.label_config.get("params", {})
+        if method == "Triple-Barrier Labeling" and params.get("atr_period"):
+            atr = {"name": "Average True Range (ATR)", "params": {"timeperiod": int(params["atr_period"])}}
+            return FeatureEngine([atr]).warmup_rows()
+        if method == "Event-Based Labeling":
+            events = self._event_key(params.get("eventDefinition", []))
+            return max((expression_lookback(expression) for expression, _ in events), default=0)
+        return 0
+
+    def label_sweep(self, df, horizons, thresholds, threshold_type="percent"):
+        """
+        Next-Step Classification label distributions for every horizon and threshold in one pass.
 
-        return df.dropna()
+        All horizons share one future-change matrix, and each threshold is counted with a binary search over
+        the sorted changes, so no labeled frame is ever built.
+
+        Args:
+            df (pd.DataFrame): DataFrame with a close column.
+            horizons (list): Look-aheads in rows.
+            thresholds (list): Non-negative thresholds (fractions when ``threshold_type`` is "percent").
+            threshold_type (str): "percent" for fractional changes, anything else for absolute ones.
+
+        Returns:
+            list: One dict per (horizon, threshold) with the label counts, proportions and class-balance stats.
+        """
+        try:
+            if not horizons or not thresholds:
+                raise ValueError("Both horizons and thresholds must be non-empty lists.")
+            if min(horizons) < 1 or min(thresholds) < 0:
+                raise ValueError("Horizons must be positive and thresholds non-negative.")
+
+            changes = kernels.future_change_matrix(df["close"].to_numpy(), horizons, relative=threshold_type == "percent")
+            counts = kernels.threshold_label_counts(changes, thresholds)
+
+            results = []
+            for j, horizon in enumerate(horizons):
+                for i, threshold in enumerate(thresholds):
+                    sell, hold, buy = (int(count) for count in counts[j, i])
+                    results.append({
+                        "horizon": int(horizon),
+                        "threshold": float(threshold),
+                        **self._class_balance({self.SELL_SIGNAL: sell, self.HOLD_SIGNAL: hold, self.BUY_SIGNAL: buy}),
+                    })
+            return results
+        except Exception as e:
+            logging.error("Error running the label sweep", exc_info=True)
+            raise e
+
+    @staticmethod
+    def _class_balance(distribution):
+        """
+        Proportions, minority/majority ratio and normalized entropy of a label distribution.
+        """
+        total = sum(distribution.values())
+        proportions = {label: count / total if total else 0.0 for label, count in distribution.items()}
+        present = [p for p in proportions.values() if p > 0]
+        entropy = -sum(p * np.log(p) for p in present) / np.log(len(distribution)) if total else 0.0
+        return {
+            "total": total,
+            "label_distribution": distribution,
+            "label_proportions": proportions,
+            "minority_to_majority_ratio": min(distribution.values()) / max(distribution.values()) if total else 0.0,
+            "normalized_entropy": float(entropy),
+        }
+
+    @staticmethod
+    def _labeled(df, valid, **columns):
+        """
+        Return ``df`` with ``columns`` added, keeping the rows where ``valid`` holds and nothing is missing.
+        """
+        valid = valid & df.notna().all(axis=1).to_numpy()
+        if valid.all():
+            return df.assign(**columns)
+        # Usually only the tail without a future close is invalid, so a slice avoids a masked copy
+        stop = len(valid) - int(valid[::-1].argmax()) if valid.any() else 0
+        rows = slice(0, stop) if valid[:stop].all() else valid
+        return df.iloc[rows].assign(**{name: values[rows] for name, values in columns.items()})
+
+    def _signals(self, values, threshold):
+        return kernels.threshold_labels(values, threshold, -threshold, dtype=self.label_dtype)
+
+    def _next_step_classification(self, df, horizon, threshold, threshold_type):
+        """
+        Apply the Next-Step Classification strategy.
+
+        Rows within ``horizon`` of the end have no future close and are dropped.
+        """
+        change = kernels.future_change(df["close"].to_numpy(), horizon, relative=threshold_type == "percent")
+        return self._labeled(df, ~np.isnan(change), label=self._signals(change, threshold))
 
     def _multi_class_trend_labeling(self, df, timeHorizon, bins, bin_labels):
         """
         Apply the Multi-Class Trend Labeling strategy.
         """
-        df = df.copy()
-        future_close = df["close"].shift(-timeHorizon)
-        pct_change = (future_close - df["close"]) / df["close"]
-        df["label"] = pd.cut(pct_change, bins=bins, labels=bin_labels)
-        return df.dropna()
+        change = kernels.future_change(df["close"].to_numpy(), timeHorizon)
+        if np.ndim(bins) == 0:
+            # A bin count derives its edges from the data range, which pd.cut already does in one pass
+            label = pd.cut(change, bins=bins, labels=bin_labels)
+            return self._labeled(df, ~pd.isna(label), label=label)
+        codes = kernels.bin_codes(change, bins)
+        label = pd.Categorical.from_codes(codes, categories=bin_labels, ordered=True)
+        return self._labeled(df, codes >= 0, label=label)
 
-    def _triple_barrier_labeling(self, df, upper_barrier, lower_barrier, maxTime):
+    def _triple_barrier_labeling(self, df, upper_barrier, lower_barrier, maxTime, atr_period=None):
         """
         Apply the Triple-Barrier Labeling strategy.
+
+        Barriers sit at ``close * (1 + upper_barrier)`` and ``close * (1 - lower_barrier)``, or at ``upper_barrier``
+        and ``lower_barrier`` ATRs from the close when ``atr_period`` is set. The first barrier touched by the
+        highs and lows of the next ``maxTime`` bars sets the label; untouched rows are HOLD.
         """
-        df = df.copy()
-        df["future_close"] = df["close"].shift(-maxTime)
-        df["label"] = self.HOLD_SIGNAL
-        df.loc[(df["future_close"] >= df["close"] * (1 + upper_barrier)), "label"] = self.BUY_SIGNAL
-        df.loc[(df["future_close"] <= df["close"] * (1 - lower_barrier)), "label"] = self.SELL_SIGNAL
-        return df.dropna()
+        close = df["close"].to_numpy(dtype=np.float64)
+        high = df["high"].to_numpy(dtype=np.float64) if "high" in df else close
+        low = df["low"].to_numpy(dtype=np.float64) if "low" in df else close
+
+        if atr_period:
+            width = indicator_kernels.atr(high, low, close, atr_period)
+            upper, lower = close + upper_barrier * width, close - lower_barrier * width
+        else:
+            upper, lower = close * (1 + upper_barrier), close * (1 - lower_barrier)
+
+        label, touch_bars, realized_return = kernels.triple_barrier(
+            close, high, low, upper, lower, maxTime,
+            labels=(self.SELL_SIGNAL, self.HOLD_SIGNAL, self.BUY_SIGNAL), dtype=self.label_dtype
+        )
+        columns = {"label": label, "touch_bars": touch_bars, "realized_return": realized_return}
+        if "close_time" in df:
+            touch_row = np.minimum(np.arange(len(df)) + touch_bars, len(df) - 1)
+            columns["touch_time"] = df["close_time"].to_numpy()[touch_row]
+        return self._labeled(df, ~np.isnan(realized_return), **columns)
 
     def _regression_on_future_returns(self, df, lookahead, target_type):
         """
         Apply the Regression on Future Returns strategy.
         """
-        df = df.copy()
-        future_close = df["close"].shift(-lookahead)
-        if target_type == "percentage":
-            df["predicted_return"] = (future_close - df["close"]) / df["close"]
-        else:
-            df["predicted_return"] = future_close - df["close"]
-
-        df["label"] = df["predicted_return"].apply(lambda x: self.BUY_SIGNAL if x > 0.01 else (self.SELL_SIGNAL if x < -0.01 else self.HOLD_SIGNAL))
-        return df.dropna()
+        predicted_return = kernels.future_change(df["close"].to_numpy(), lookahead, relative=target_type == "percentage")
+        label = self._signals(predicted_return, 0.01)
+        return self._labeled(df, ~np.isnan(predicted_return), predicted_return=predicted_return, label=label)
 
     def _event_based_labeling(self, df, eventDefinition, lookahead):
         """
         Apply the Event-Based Labeling strategy.
+
+        Each event is an expression string labeled BUY, or ``{"expression": ..., "label": "BUY" | "SELL" | "HOLD"}``;
+        see ``event_expressions.parse_expression`` for the syntax. Later events override earlier ones on the
+        rows where both fire. Rows without an event are HOLD.
         """
-        df = df.copy()
-        df["label"] = self.HOLD_SIGNAL
+        label = np.full(len(df), self.HOLD_SIGNAL, dtype=self.label_dtype)
+        for evaluate, signal in self._compiled_events(self._event_key(eventDefinition)):
+            label[evaluate(df)] = signal
+        return df.assign(label=label)
+
+    def _event_key(self, eventDefinition):
+        """
+        Normalize ``eventDefinition`` into a hashable tuple of (expression, signal) pairs.
+        """
+        signals = {"BUY": self.BUY_SIGNAL, "SELL": self.SELL_SIGNAL, "HOLD": self.HOLD_SIGNAL}
+        events = []
         for event in eventDefinition:
-            if "RSI crosses below 30" in event:
-                df.loc[(df["RSI"] < 30), "label"] = self.BUY_SIGNAL
-        return df
+            if isinstance(event, str):
+                events.append((event, self.BUY_SIGNAL))
+                continue
+            signal = event.get("label", "BUY")
+            if isinstance(signal, str):
+                if signal.upper() not in signals:
+                    raise ValueError(f"Unsupported event label: {signal}")
+                signal = signals[signal.upper()]
+            events.append((event["expression"], int(signal)))
+        return tuple(events)
 
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _compiled_events(events):
+        """
+        Compile a normalized event definition once per label config.
+        """
+        return [(compile_expression(expression), signal) for expression, signal in events]
@@ -0,0 +1,262 @@
+import numpy as np
+
+from .indicator_kernels import as_float_array
+
+BUY_SIGNAL = 1
+SELL_SIGNAL = -1
+HOLD_SIGNAL = 0
+
+
+def future_values(values, horizon, out=None):
+    """
+    Values ``horizon`` rows ahead (pandas ``Series.shift(-horizon)``).
+
+    Args:
+        values (array-like): Input series.
+        horizon (int): Look-ahead in rows.
+        out (np.ndarray): Optional preallocated output buffer.
+
+    Returns:
+        np.ndarray: The shifted series, NaN for the last ``horizon`` rows.
+    """
+    values = as_float_array(values)
+    n = len(values)
+    if out is None:
+        out = np.empty(n, dtype=np.float64)
+    horizon = min(horizon, n)
+    out[n - horizon:] = np.nan
+    out[:n - horizon] = values[horizon:]
+    return out
+
+
+def future_change(close, horizon, relative=True, out=None):
+    """
+    Change of the close ``horizon`` rows ahead, ``close[t + horizon] - close[t]`` (divided by ``close[t]``
+    when ``relative``).
+
+    Args:
+        close (array-like): Close prices.
+        horizon (int): Look-ahead in rows.
+        relative (bool): Return the fractional change instead of the absolute one.
+        out (np.ndarray): Optional preallocated output buffer.
+
+    Returns:
+        np.ndarray: The forward change, NaN for the last ``horizon`` rows.
+    """
+    close = as_float_array(close)
+    n = len(close)
+    if out is None:
+        out = np.empty(n, dtype=np.float64)
+    horizon = min(horizon, n)
+    out[n - horizon:] = np.nan
+    np.subtract(close[horizon:], close[:n - horizon], out=out[:n - horizon])
+    if relative:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.divide(out[:n - horizon], close[:n - horizon], out=out[:n - horizon])
+    return out
+
+
+def threshold_labels(values, upper, lower, inclusive=False, labels=(SELL_SIGNAL, HOLD_SIGNAL, BUY_SIGNAL), dtype=np.int8):
+    """
+    Three-way labels: ``labels[2]`` above ``upper``, ``labels[0]`` below ``lower``, ``labels[1]`` otherwise.
+
+    Args:
+        values (array-like): Values to label, typically a forward change.
+        upper (float): Upper threshold.
+        lower (float): Lower threshold.
+        inclusive (bool): Also assign the outer labels on the thresholds themselves (``>=`` / ``<=``).
+        labels (tuple): Labels for (below, between, above).
+        dtype (np.dtype): Label dtype.
+
+    Returns:
+        np.ndarray: The labels. NaN values get the middle label.
+    """
+    values = as_float_array(values)
+    out = np.full(len(values), labels[1], dtype=dtype)
+    if inclusive:
+        out[values >= upper] = labels[2]
+        out[values <= lower] = labels[0]
+    else:
+        out[values > upper] = labels[2]
+        out[values < lower] = labels[0]
+    return out
+
+
+def bin_codes(values, bins, dtype=np.int8):
+    """
+    Right-closed bin index of every value (the codes of ``pd.cut(values, bins)``).
+
+    Args:
+        values (array-like): Values to bin.
+        bins (list): Monotonically increasing bin edges.
+        dtype (np.dtype): Signed integer dtype of the codes.
+
+    Returns:
+        np.ndarray: Bin codes, -1 for NaN values and values outside the edges.
+    """
+    values = as_float_array(values)
+    edges = np.asarray(bins, dtype=np.float64)
+    codes = np.searchsorted(edges, values, side="left") - 1
+    # The first interval is open on the left
+    outside = np.isnan(values) | (values <= edges[0]) | (values > edges[-1])
+    codes[outside] = -1
+    return codes.astype(dtype, copy=False)
+
+
+def _range_table(values, levels, ufunc):
+    """
+    Sparse table whose level ``j`` holds ``ufunc.reduce(values[i:i + 2 ** j])`` at ``i`` (clipped at the end).
+    """
+    n = len(values)
+    table = [values]
+    for level in range(1, levels):
+        previous = table[-1]
+        step = 1 << (level - 1)
+        current = previous.copy()
+        if step < n:
+            ufunc(previous[:n - step], previous[step:], out=current[:n - step])
+        table.append(current)
+    return table
+
+
+def first_crossing(values, thresholds, horizon, above=True):
+    """
+    Bars until ``values`` first reaches each row's threshold within the next ``horizon`` rows.
+
+    The search is binary lifting over a sparse table of window maxima (minima when ``above`` is False): every
+    row skips the longest power-of-two block that stays short of its threshold, one level at a time, so the
+    cost is O(n log horizon) whatever the touch times are.
+
+    Args:
+        values (array-like): Path to scan, e.g. highs for an upper barrier.
+        thresholds (array-like): Barrier level of each row; NaN never crosses.
+        horizon (int): Number of rows ahead to scan.
+        above (bool): Cross upwards (``values >= threshold``) instead of downwards (``values <= threshold``).
+
+    Returns:
+        np.ndarray: int64 offsets in ``1..horizon`` of the first crossing, 0 where there is none.
+    """
+    values = as_float_array(values)
+    thresholds = as_float_array(thresholds)
+    n = len(values)
+    offsets = np.zeros(n, dtype=np.int64)
+    if n < 2 or horizon < 1:
+        return offsets
+
+    levels = int(horizon).bit_length()
+    table = _range_table(values, levels, np.maximum if above else np.minimum)
+    short_of = np.less if above else np.greater
+
+    rows = np.arange(n - 1)
+    position = rows + 1
+    remaining = np.minimum(horizon, n - 1 - rows)
+    threshold = thresholds[:n - 1]
+    for level in range(levels - 1, -1, -1):
+        block = 1 << level
+        # Skip the block when it fits in the window and never reaches the barrier
+        skip = (remaining >= block) & short_of(table[level][np.minimum(position, n - 1)], threshold)
+        position[skip] += block
+        remaining[skip] -= block
+
+    inside = remaining > 0
+    crossed = np.zeros(n - 1, dtype=bool)
+    crossed[inside] = ~short_of(values[position[inside]], threshold[inside]) & ~np.isnan(threshold[inside])
+    offsets[:n - 1][crossed] = position[crossed] - rows[crossed]
+    return offsets
+
+
+def triple_barrier(close, high, low, upper, lower, horizon, labels=(SELL_SIGNAL, HOLD_SIGNAL, BUY_SIGNAL), dtype=np.int8):
+    """
+    Path-dependent triple-barrier labels from the intrabar highs and lows of the next ``horizon`` bars.
+
+    The upper barrier is hit when a high reaches ``upper``, the lower one when a low reaches ``lower``. If
+    both are first hit on the same bar the lower barrier wins, since the intrabar order is unknown. Rows that
+    touch neither barrier reach the vertical barrier and get the middle label.
+
+    Args:
+        close (array-like): Entry prices.
+        high (array-like): Bar highs.
+        low (array-like): Bar lows.
+        upper (array-like): Upper barrier price per row.
+        lower (array-like): Lower barrier price per row.
+        horizon (int): Vertical barrier in bars.
+        labels (tuple): Labels for (lower hit, vertical barrier, upper hit).
+        dtype (np.dtype): Label dtype.
+
+    Returns:
+        tuple: (labels, bars until the touch, realized return at the touched barrier), NaN returns for rows
+        whose window runs past the end of the data or whose barriers are missing.
+    """
+    close = as_float_array(close)
+    n = len(close)
+    up = first_crossing(high, upper, horizon, above=True)
+    down = first_crossing(low, lower, horizon, above=False)
+
+    hit_up = (up > 0) & ((down == 0) | (up < down))
+    hit_down = (down > 0) & ~hit_up
+
+    label = np.full(n, labels[1], dtype=dtype)
+    label[hit_up] = labels[2]
+    label[hit_down] = labels[0]
+
+    touch_bars = np.full(n, horizon, dtype=np.int64)
+    touch_bars[hit_up] = up[hit_up]
+    touch_bars[hit_down] = down[hit_down]
+
+    upper = as_float_array(upper)
+    lower = as_float_array(lower)
+    realized_return = future_change(close, horizon)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        realized_return[hit_up] = upper[hit_up] / close[hit_up] - 1.0
+        realized_return[hit_down] = lower[hit_down] / close[hit_down] - 1.0
+    # Without a full window an untouched barrier may still be hit later, so the outcome is unknown
+    realized_return[max(n - horizon, 0):] = np.nan
+    realized_return[np.isnan(upper) | np.isnan(lower)] = np.nan
+    return label, touch_bars, realized_return
+
+
+def future_change_matrix(close, horizons, relative=True):
+    """
+    Forward changes for several horizons as one (n, len(horizons)) column-major matrix.
+
+    Args:
+        close (array-like): Close prices.
+        horizons (list): Look-aheads in rows.
+        relative (bool): Fractional instead of absolute changes.
+
+    Returns:
+        np.ndarray: Column ``j`` is ``future_change(close, horizons[j], relative)``.
+    """
+    close = as_float_array(close)
+    out = np.empty((len(close), len(horizons)), dtype=np.float64, order="F")
+    for j, horizon in enumerate(horizons):
+        future_change(close, horizon, relative=relative, out=out[:, j])
+    return out
+
+
+def threshold_label_counts(changes, thresholds):
+    """
+    SELL/HOLD/BUY counts of ``threshold_labels(change, t, -t)`` for every column of ``changes`` and every ``t``.
+
+    Each column is sorted once and every threshold is answered with a binary search, so a grid of H horizons
+    and T thresholds costs O(H n log n + H T log n) instead of H * T labeling passes.
+
+    Args:
+        changes (np.ndarray): (n, H) forward changes; NaN rows are ignored per column.
+        thresholds (list): Non-negative thresholds.
+
+    Returns:
+        np.ndarray: int64 array of shape (H, T, 3) with the SELL, HOLD and BUY counts.
+    """
+    changes = np.asarray(changes, dtype=np.float64)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    counts = np.empty((changes.shape[1], len(thresholds), 3), dtype=np.int64)
+    for j in range(changes.shape[1]):
+        column = changes[:, j]
+        ordered = np.sort(column[~np.isnan(column)])
+        sell = np.searchsorted(ordered, -thresholds, side="left")
+        buy = len(ordered) - np.searchsorted(ordered, thresholds, side="right")
+        counts[j, :, 0] = sell
+        counts[j, :, 1] = len(ordered) - sell - buy
+        counts[j, :, 2] = buy
+    return counts
@@ -1,24 +1,127 @@
 import logging
 import os
+import time
 import joblib
 import pandas as pd
+import xgboost as xgb
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.svm import SVC
 from xgboost import XGBClassifier
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, roc_auc_score
 from sklearn.utils.multiclass import unique_labels
 
-from sklearn.metrics import ConfusionMatrixDisplay
-import matplotlib.pyplot as plt
+from .compute_profiles import resolve_compute_profile
+from .model_registry import load_artifact
+from .time_series_cv import holdout_split
+
+# Trees grown per warm-started fit when a forest trains on a time budget
+FOREST_BATCH_TREES = 10
+
+
+class _TimeBudget(xgb.callback.TrainingCallback):
+    """
+    Stops boosting after the round that passes the wall-clock deadline.
+    """
+
+    def __init__(self, deadline):
+        super().__init__()
+        self.deadline = deadline
+        self.stopped = False
+
+    def after_iteration(self, model, epoch, evals_log):
+        self.stopped = time.perf_counter() >= self.deadline
+        return self.stopped
+
+
+def adopt_booster(model, booster, n_classes=None):
+    """
+    Make an XGBClassifier predict with a booster trained or sliced outside its ``fit``.
+
+    ``XGBClassifier.load_model`` would be the public route, but with XGBoost 2.1 and scikit-learn 1.6 it fails
+    in ``is_classifier``. The wrapper predicts from ``_Booster`` and ``n_classes_`` alone, which
+    ``test_model_engine`` pins for the installed XGBoost version.
+
+    Args:
+        model (XGBClassifier): The wrapper.
+        booster (xgb.Booster): The trained booster.
+        n_classes (int): Classes of the booster; defaults to the wrapper's own.
+
+    Returns:
+        XGBClassifier: The wrapper.
+    """
+    model._Booster = booster
+    if n_classes is not None:
+        model.n_classes_ = n_classes
+    return model
+
+
+def _rows(data, rows):
+    return data.iloc[rows] if hasattr(data, "iloc") else data[rows]
 
 
 class ModelEngine:
-    def __init__(self, model_config):
+    def __init__(self, model_config, compute_profile=None):
         self.method = model_config["method"]
         self.params = self._parse_params(model_config["params"])
+        # Resource parameters of the profile override the configured ones when the estimator is created
+        self.compute_profile = resolve_compute_profile(compute_profile)
         self.model = None
 
+    @classmethod
+    def from_params(cls, method, params, compute_profile=None):
+        """
+        Create a ModelEngine from already typed parameters instead of a config params list of strings.
+
+        Args:
+            method (str): The model method, e.g. "xgboost".
+            params (dict): Estimator parameters.
+            compute_profile (ComputeProfile or str): Resource profile of the estimator (see ``ComputeProfile``).
+
+        Returns:
+            ModelEngine: The engine; call ``create_model`` to build the estimator.
+        """
+        engine = cls({"method": method, "params": []}, compute_profile)
+        engine.params = dict(params)
+        return engine
+
+    @classmethod
+    def from_model(cls, model, compute_profile=None):
+        """
+        Wrap an unfitted estimator created elsewhere (e.g. a clone) so it trains through ``train_model``.
+
+        Args:
+            model: Unfitted scikit-learn compatible estimator. Estimators of no ModelEngine method are fitted
+                without early stopping or a time budget.
+            compute_profile (ComputeProfile or str): Resource profile of the estimator (see ``ComputeProfile``).
+
+        Returns:
+            ModelEngine: The engine holding ``model``.
+        """
+        methods = {
+            RandomForestClassifier: "randomForest",
+            LogisticRegression: "logisticRegression",
+            SVC: "svc",
+            XGBClassifier: "xgboost",
+            SGDClassifier: "sgdClassifier",
+        }
+        engine = cls.from_params(methods.get(type(model)), model.get_params(), compute_profile)
+        engine.model = model
+        return engine
+
+    @staticmethod
+    def format_params(params):
+        """
+        Convert typed parameters into the config params list of strings read by ``_parse_params``.
+
+        Args:
+            params (dict): Estimator parameters.
+
+        Returns:
+            list: One ``{name: str(value)}`` dict per parameter.
+        """
+        return [{key: str(value)} for key, value in params.items()]
+
     def _parse_params(self, params_list):
         parsed_params = {}
         for param in params_list:
@@ -45,43 +148,140 @@ class ModelEngine:
                 "logisticRegression": self._create_logistic_regression,
                 "svc": self._create_svc,
                 "xgboost": self._create_xgboost,
+                "sgdClassifier": self._create_sgd_classifier,
             }
 
             if self.method not in model_creation_methods:
                 raise ValueError(f"Unsupported model method: {self.method}")
 
+            params = dict(self.params)
+            if self.compute_profile is not None:
+                params.update(self.compute_profile.estimator_params(self.method))
+
             # Call the appropriate model creation method
-            self.model = model_creation_methods[self.method]()
-            logging.info(f"Model {self.method} created with parameters: {self.params}")
+            self.model = model_creation_methods[self.method](params)
+            logging.info(f"Model {self.method} created with parameters: {params}")
             assert self.model is not None, "Model creation failed."
             return self.model
         except Exception as e:
             logging.error("Error creating model", exc_info=True)
             raise e
 
-    def _create_random_forest(self):
-        return RandomForestClassifier(**self.params)
+    def _create_random_forest(self, params):
+        return RandomForestClassifier(**params)
+
+    def _create_logistic_regression(self, params):
+        return LogisticRegression(**params)
+
+    def _create_svc(self, params):
+        return SVC(**params)
 
-    def _create_logistic_regression(self):
-        return LogisticRegression(**self.params)
+    def _create_xgboost(self, params):
+        return XGBClassifier(**params)
 
-    def _create_svc(self):
-        return SVC(**self.params)
+    def _create_sgd_classifier(self, params):
+        return SGDClassifier(**params)
 
-    def _create_xgboost(self):
-        return XGBClassifier(**self.params)
+    def train_model(self, X_train, y_train, early_stopping=None, time_budget=None, sample_weight=None):
+        """
+        Train the model, optionally with early stopping and a wall-clock budget for growing trees.
+
+        Args:
+            X_train (pd.DataFrame or np.ndarray): Training features in time order.
+            y_train (pd.Series or np.ndarray): Training labels.
+            early_stopping (dict): XGBoost only. ``rounds`` without improvement of the validation loss before
+                boosting stops, on the last ``validation_size`` of the training rows after a ``gap`` of purged
+                rows. The model keeps the rounds up to its best iteration, fitted on the rows before the gap.
+            time_budget (float): Seconds tree growth may take. Boosting stops after the round that runs out of
+                time and random forests after the batch of ``FOREST_BATCH_TREES`` trees that does; both keep at
+                least one round or batch. Other models ignore it.
+            sample_weight (np.ndarray): Weight per training row, e.g. to undo downsampling (see ``MajoritySampler``).
 
-    def train_model(self, X_train, y_train):
+        Returns:
+            dict: ``requested_rounds`` and ``used_rounds`` (boosting rounds or trees; None for other models),
+            ``stopped_by`` ("early_stopping", "time_budget" or None), ``best_score`` and ``fit_seconds``.
+        """
         try:
             if self.model is None:
                 raise ValueError("Model has not been created. Call `create_model` first.")
-            
-            self.model.fit(X_train, y_train)
-            logging.info(f"Model {self.method} trained successfully.")
+
+            start = time.perf_counter()
+            deadline = None if time_budget is None else start + max(float(time_budget), 0.0)
+            trainers = {
+                "xgboost": self._train_booster,
+                "randomForest": self._train_forest,
+            }
+            if self.method in trainers:
+                summary = trainers[self.method](X_train, y_train, early_stopping, deadline, sample_weight)
+            else:
+                self.model.fit(X_train, y_train, **({} if sample_weight is None else {"sample_weight": sample_weight}))
+                summary = {"requested_rounds": None, "used_rounds": None, "stopped_by": None, "best_score": None}
+            summary["fit_seconds"] = time.perf_counter() - start
+            logging.info(f"Model {self.method} trained successfully: {summary}")
+            return summary
         except Exception as e:
             logging.error("Error training the model", exc_info=True)
             raise e
 
+    def _train_booster(self, X_train, y_train, early_stopping, deadline, sample_weight):
+        requested = self.model.n_estimators or 100
+        budget = None if deadline is None else _TimeBudget(deadline)
+        fit_params = {}
+        if early_stopping:
+            train_rows, validation_rows = holdout_split(
+                len(X_train), early_stopping.get("validation_size", 0.1), gap=early_stopping.get("gap", 0)
+            )
+            fit_params["eval_set"] = [(_rows(X_train, validation_rows), _rows(y_train, validation_rows))]
+            fit_params["verbose"] = False
+            if sample_weight is not None:
+                fit_params["sample_weight_eval_set"] = [sample_weight[validation_rows]]
+                sample_weight = sample_weight[train_rows]
+            X_train, y_train = _rows(X_train, train_rows), _rows(y_train, train_rows)
+            self.model.set_params(early_stopping_rounds=early_stopping.get("rounds", 20))
+        self.model.set_params(callbacks=[budget] if budget is not None else None)
+        try:
+            self.model.fit(X_train, y_train, sample_weight=sample_weight, **fit_params)
+        finally:
+            # Neither setting belongs to the saved model: a later fit (incremental training) has no validation set
+            self.model.set_params(early_stopping_rounds=None, callbacks=None)
+
+        booster = self.model.get_booster()
+        trained = booster.num_boosted_rounds()
+        used, best_score = trained, None
+        if early_stopping:
+            used = self.model.best_iteration + 1
+            best_score = float(self.model.best_score)
+            # Drop the rounds after the best one, so the model and any update of it start from the best round
+            adopt_booster(self.model, booster[:used])
+            self.model.set_params(n_estimators=used)
+        if budget is not None and budget.stopped:
+            stopped_by = "time_budget"
+        elif trained < requested:
+            stopped_by = "early_stopping"
+        else:
+            stopped_by = None
+        return {"requested_rounds": requested, "used_rounds": used, "stopped_by": stopped_by, "best_score": best_score}
+
+    def _train_forest(self, X_train, y_train, early_stopping, deadline, sample_weight):
+        requested = self.model.n_estimators
+        if deadline is None:
+            self.model.fit(X_train, y_train, sample_weight=sample_weight)
+            return {"requested_rounds": requested, "used_rounds": requested, "stopped_by": None, "best_score": None}
+
+        # Grow the forest in warm-started batches until it is complete or the budget runs out
+        warm_start = self.model.warm_start
+        self.model.set_params(warm_start=True)
+        grown = 0
+        while grown < requested:
+            grown = min(requested, grown + FOREST_BATCH_TREES)
+            self.model.set_params(n_estimators=grown)
+            self.model.fit(X_train, y_train, sample_weight=sample_weight)
+            if time.perf_counter() >= deadline:
+                break
+        self.model.set_params(warm_start=warm_start)
+        stopped_by = "time_budget" if grown < requested else None
+        return {"requested_rounds": requested, "used_rounds": grown, "stopped_by": stopped_by, "best_score": None}
+
     def test_model(self, X_test, y_test):
         """
         Test the model on the testing dataset, log performance metrics, and return the results in an object.
@@ -90,13 +290,21 @@ class ModelEngine:
             if self.model is None:
                 raise ValueError("Model has not been trained. Call `train_model` first.")
 
-            y_pred = self.model.predict(X_test)
+            return self.evaluate_predictions(y_test, self.model.predict(X_test))
+        except Exception as e:
+            logging.error("Error testing the model", exc_info=True)
+            raise e
 
+    def evaluate_predictions(self, y_test, y_pred):
+        """
+        Metrics of predictions made elsewhere, e.g. chunk by chunk out of core, in the shape of ``test_model``.
+        """
+        try:
             # Handle label mapping for XGBoost if necessary
             if self.method == "xgboost":
                 reverse_label_mapping = {0: -1, 1: 0, 2: 1}
                 y_pred = pd.Series(y_pred).map(reverse_label_mapping).to_numpy()
-                y_test = y_test.map(reverse_label_mapping)
+                y_test = pd.Series(y_test).map(reverse_label_mapping)
 
             # Calculate accuracy and classification report
             accuracy = accuracy_score(y_test, y_pred)
@@ -111,8 +319,7 @@ class ModelEngine:
             logging.info("Confusion Matrix:")
             logging.info(conf_matrix)
 
-            labels = unique_labels(y_test, y_pred)
-            print("Labels:", labels)
+            logging.info(f"Labels: {all_labels}")
             # Optional: Calculate ROC-AUC for binary classification
             roc_auc = None
             if len(all_labels) == 2:
@@ -130,7 +337,7 @@ class ModelEngine:
             }
 
         except Exception as e:
-            logging.error("Error testing the model", exc_info=True)
+            logging.error("Error evaluating the predictions", exc_info=True)
             raise e
 
     def save_model(self, file_path):
@@ -145,9 +352,10 @@ class ModelEngine:
             logging.error("Error saving the model", exc_info=True)
             raise e
 
-    def load_model(self, file_path):
+    def load_model(self, file_path, mmap_mode=None, cache=False):
         try:
-            self.model = joblib.load(file_path)
+            # Memory-mapped, cached loads share the artifact pages between processes (see model_registry)
+            self.model = load_artifact(file_path, mmap_mode=mmap_mode, cache=cache)
             logging.info(f"Model loaded from: {file_path}")
             return self.model
         except Exception as e:
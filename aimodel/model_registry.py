@@ -0,0 +1,283 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from functools import lru_cache
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from .compiled_trees import compile_model, supports_compilation
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+ARTIFACT_FILE = "model.joblib"
+COMPILED_FILE = "compiled.joblib"
+METADATA_FILE = "metadata.json"
+
+
+def data_hash(X, y=None):
+    """
+    Fingerprint of a training set, stored with a model version to tell which data it was fitted on.
+
+    Args:
+        X (pd.DataFrame or np.ndarray): Features.
+        y (pd.Series or np.ndarray): Labels (optional).
+
+    Returns:
+        str: SHA-1 hex digest of the column names and values.
+    """
+    digest = hashlib.sha1()
+    for data in (X, y):
+        if data is None:
+            continue
+        if isinstance(data, (pd.DataFrame, pd.Series)):
+            digest.update(repr(list(data.columns) if isinstance(data, pd.DataFrame) else data.name).encode())
+            digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+        else:
+            digest.update(np.ascontiguousarray(data).tobytes())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=16)
+def _load_cached(path, mtime_ns, mmap_mode):
+    # The modification time is part of the key, so a rewritten artifact is never served stale
+    return joblib.load(path, mmap_mode=mmap_mode)
+
+
+def load_artifact(path, mmap_mode="r", cache=True):
+    """
+    Load a model artifact, memory-mapping its arrays and reusing it across calls in this process.
+
+    With ``mmap_mode="r"`` NumPy arrays in the artifact stay in the file and are paged in on demand from the OS
+    page cache, which every process reading the same artifact shares. Estimators that copy their arrays on
+    unpickling (scikit-learn trees copy their nodes into their own buffers) still skip the intermediate
+    in-memory copy while loading, which lowers the peak memory of loading a large forest.
+
+    Args:
+        path (str): Path of the joblib artifact.
+        mmap_mode (str): ``joblib.load`` memory-map mode, or None to read the arrays into memory.
+        cache (bool): Return the process-wide cached instance. Pass False to get a private copy that can be
+            modified, e.g. for retraining.
+
+    Returns:
+        The model. Cached instances are shared and must not be modified.
+    """
+    try:
+        if not cache:
+            return joblib.load(path, mmap_mode=mmap_mode)
+        return _load_cached(os.path.realpath(path), os.stat(path).st_mtime_ns, mmap_mode)
+    except Exception as e:
+        logging.error(f"Error loading model artifact {path}", exc_info=True)
+        raise e
+
+
+def load_predictor(path, mmap_mode="r", cache=True):
+    """
+    Load the fastest predictor of a model artifact: the compiled ensemble saved next to it if there is one,
+    otherwise the model itself. Both have ``predict`` and ``predict_proba``.
+
+    Args:
+        path (str): Path of the joblib model artifact.
+        mmap_mode (str): See ``load_artifact``.
+        cache (bool): See ``load_artifact``.
+
+    Returns:
+        CompiledEnsemble or the model.
+    """
+    compiled_path = os.path.join(os.path.dirname(path), COMPILED_FILE)
+    return load_artifact(compiled_path if os.path.exists(compiled_path) else path, mmap_mode=mmap_mode, cache=cache)
+
+
+def artifact_metadata(path):
+    """
+    Metadata of the registry version holding a model artifact, or None for an artifact outside a registry.
+    """
+    metadata_path = os.path.join(os.path.dirname(path), METADATA_FILE)
+    if not os.path.exists(metadata_path):
+        return None
+    with open(metadata_path) as handle:
+        return json.load(handle)
+
+
+class ModelRegistry:
+    """
+    Versioned model artifacts on disk.
+
+    Every version of a model lives in ``<root>/<name>/v<version>/`` with the uncompressed joblib artifact
+    (uncompressed so it can be memory-mapped) and a ``metadata.json`` holding the feature columns, label
+    mapping, training data hash, metrics and parameters. Tree ensembles also get a ``compiled.joblib`` with
+    their flattened node arrays (see ``compiled_trees``), which stay memory-mapped when loaded. A version is
+    written to a temporary directory and renamed into place, so readers never see a partial one.
+    """
+
+    def __init__(self, root="models"):
+        """
+        Initialize the ModelRegistry.
+
+        Args:
+            root (str): Directory holding the registered models.
+        """
+        self.root = root
+
+    def _model_dir(self, name):
+        return os.path.join(self.root, str(name))
+
+    def version_dir(self, name, version):
+        """
+        Directory of a model version.
+        """
+        return os.path.join(self._model_dir(name), f"v{version}")
+
+    def versions(self, name):
+        """
+        Complete versions of a model, oldest first.
+
+        Args:
+            name (str): Model name.
+
+        Returns:
+            list: Version numbers.
+        """
+        model_dir = self._model_dir(name)
+        if not os.path.isdir(model_dir):
+            return []
+        versions = []
+        for entry in os.listdir(model_dir):
+            if entry.startswith("v") and entry[1:].isdigit() and os.path.exists(os.path.join(model_dir, entry, METADATA_FILE)):
+                versions.append(int(entry[1:]))
+        return sorted(versions)
+
+    def latest_version(self, name):
+        """
+        Latest complete version of a model, or None if it has none.
+        """
+        versions = self.versions(name)
+        return versions[-1] if versions else None
+
+    def _resolve(self, name, version):
+        version = self.latest_version(name) if version is None else version
+        if version is None or not os.path.exists(os.path.join(self.version_dir(name, version), METADATA_FILE)):
+            raise FileNotFoundError(f"Model {name} has no version {version if version is not None else 'registered'}.")
+        return version
+
+    def artifact_path(self, name, version=None):
+        """
+        Path of the artifact of a model version (the latest by default).
+        """
+        return os.path.join(self.version_dir(name, self._resolve(name, version)), ARTIFACT_FILE)
+
+    def metadata(self, name, version=None):
+        """
+        Metadata of a model version (the latest by default).
+
+        Raises:
+            FileNotFoundError: If the version does not exist.
+        """
+        version = self._resolve(name, version)
+        with open(os.path.join(self.version_dir(name, version), METADATA_FILE)) as handle:
+            return json.load(handle)
+
+    def register(self, name, model, feature_columns, label_mapping=None, data_hash=None, metrics=None, params=None, **extra):
+        """
+        Store a model as the next version.
+
+        Args:
+            name (str): Model name.
+            model: Fitted model.
+            feature_columns (list): Input columns, in the order the model expects them.
+            label_mapping (dict): Mapping from the original labels to the encoded ones the model predicts.
+            data_hash (str): Fingerprint of the training data, see ``data_hash``.
+            metrics (dict): Evaluation metrics.
+            params (dict): Model parameters.
+            **extra: Further JSON-serializable metadata.
+
+        Returns:
+            dict: The metadata of the new version, including ``version`` and ``path``.
+        """
+        try:
+            os.makedirs(self._model_dir(name), exist_ok=True)
+            staging = tempfile.mkdtemp(prefix=".staging-", dir=self._model_dir(name))
+            try:
+                joblib.dump(model, os.path.join(staging, ARTIFACT_FILE))
+                compiled = False
+                if supports_compilation(model):
+                    try:
+                        joblib.dump(compile_model(model), os.path.join(staging, COMPILED_FILE))
+                        compiled = True
+                    except ValueError as e:
+                        logging.warning(f"Model {name} is registered without a compiled predictor: {e}")
+                while True:
+                    version = (self.latest_version(name) or 0) + 1
+                    metadata = {
+                        "name": str(name),
+                        "version": version,
+                        "path": self.version_dir(name, version),
+                        "model_class": type(model).__name__,
+                        "feature_columns": list(feature_columns),
+                        "label_mapping": {str(key): value for key, value in (label_mapping or {}).items()},
+                        "data_hash": data_hash,
+                        "metrics": metrics or {},
+                        "params": params or {},
+                        "compiled": compiled,
+                        "created_at": datetime.utcnow().isoformat(),
+                        **extra,
+                    }
+                    with open(os.path.join(staging, METADATA_FILE), "w") as handle:
+                        json.dump(metadata, handle, indent=2, default=str)
+                    try:
+                        # Renaming fails if a concurrent writer claimed this version first
+                        os.rename(staging, self.version_dir(name, version))
+                        break
+                    except OSError:
+                        if not os.path.isdir(self.version_dir(name, version)):
+                            raise
+            finally:
+                if os.path.isdir(staging):
+                    shutil.rmtree(staging, ignore_errors=True)
+            logging.info(f"Model {name} registered as version {version} at {metadata['path']}.")
+            return metadata
+        except Exception as e:
+            logging.error(f"Error registering model {name}", exc_info=True)
+            raise e
+
+    def load(self, name, version=None, mmap_mode="r", cache=True):
+        """
+        Load a model version (the latest by default) with its metadata.
+
+        Args:
+            name (str): Model name.
+            version (int): Version number.
+            mmap_mode (str): See ``load_artifact``.
+            cache (bool): See ``load_artifact``.
+
+        Returns:
+            tuple: (model, metadata).
+        """
+        version = self._resolve(name, version)
+        model = load_artifact(os.path.join(self.version_dir(name, version), ARTIFACT_FILE), mmap_mode=mmap_mode, cache=cache)
+        return model, self.metadata(name, version)
+
+    def load_compiled(self, name, version=None, mmap_mode="r", cache=True):
+        """
+        Load the compiled ensemble of a model version (the latest by default) with its metadata.
+
+        Its node arrays stay memory-mapped, so every process predicting with the same version shares one copy
+        through the page cache.
+
+        Returns:
+            tuple: (CompiledEnsemble, metadata).
+
+        Raises:
+            FileNotFoundError: If the version does not exist or has no compiled ensemble.
+        """
+        version = self._resolve(name, version)
+        path = os.path.join(self.version_dir(name, version), COMPILED_FILE)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model {name} version {version} has no compiled predictor.")
+        return load_artifact(path, mmap_mode=mmap_mode, cache=cache), self.metadata(name, version)
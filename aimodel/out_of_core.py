@@ -0,0 +1,260 @@
+import hashlib
+import logging
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.base import clone
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .labeling_engine import LabelingEngine
+from .model_engine import adopt_booster
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Directory of the per-model feature stores when the model config does not give a store path
+FEATURE_STORE_DIR = "feature_store"
+# Memory a build may use for the chunk in flight when the model config does not set one
+DEFAULT_MEMORY_BUDGET_MB = 512
+# Bytes per stored value while a chunk is in flight: the labeled float64 frame and its copies, the float32
+# feature chunk and what the estimator derives from it
+BYTES_PER_VALUE = 48
+# Fewest rows per chunk, however small the budget
+MIN_CHUNK_ROWS = 1_000
+
+
+def chunk_rows_for_budget(n_columns, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+    """
+    Rows per chunk that keep one chunk of ``n_columns`` stored columns within the memory budget.
+
+    Args:
+        n_columns (int): Columns of the columnar store.
+        memory_budget_mb (float): Megabytes a chunk may take.
+
+    Returns:
+        int: Rows per chunk, at least ``MIN_CHUNK_ROWS``.
+    """
+    return max(MIN_CHUNK_ROWS, int(memory_budget_mb * 1024 * 1024 // (max(n_columns, 1) * BYTES_PER_VALUE)))
+
+
+class StoreChunks:
+    """
+    Labeled float32 training chunks streamed from a columnar store.
+
+    Every chunk reads its rows plus the labeling warm-up before them and the labeling horizon after them, so the
+    labels near a chunk boundary see the same past and future bars as over the whole store (see
+    ``LabelingEngine.warmup_rows``). Only the chunk in flight is ever in memory; iterating again re-reads the
+    store, which is how several passes (boosting over external memory, epochs of ``partial_fit``) stay bounded.
+    The classes met so far are collected in ``classes`` and the rows of the last full pass, which leaves out
+    rows without a label, in ``labeled_rows``.
+    """
+
+    def __init__(self, store, feature_columns, label_config, chunk_rows, rows=slice(None), label_mapping=None):
+        """
+        Initialize the StoreChunks.
+
+        Args:
+            store (ColumnarStore): Store holding the feature rows in time order.
+            feature_columns (list): Model input columns.
+            label_config (dict): Labeling configuration, as for ``LabelingEngine``.
+            chunk_rows (int): Store rows per chunk.
+            rows (slice): Store rows to stream, e.g. the training range of ``holdout_split``.
+            label_mapping (dict): Mapping applied to the labels (XGBoost needs 0..n-1 classes).
+
+        Raises:
+            ValueError: For labels that depend on the whole dataset.
+        """
+        params = label_config.get("params", {})
+        if label_config.get("method") == "Multi-Class Trend Labeling" and np.ndim(params.get("bins")) == 0:
+            raise ValueError("A bin count derives its edges from the whole dataset; give explicit bin edges to train out of core.")
+        self.store = store
+        self.columns = list(feature_columns)
+        self.labeling_engine = LabelingEngine(label_config)
+        self.horizon = self.labeling_engine.label_horizon()
+        self.warmup = self.labeling_engine.warmup_rows()
+        self.chunk_rows = chunk_rows
+        self.start, self.stop, _ = rows.indices(store.rows)
+        self.label_mapping = label_mapping
+        self.classes = set()
+        self.labeled_rows = None
+
+    def __len__(self):
+        return max(self.stop - self.start, 0)
+
+    def __iter__(self):
+        labeled_rows = 0
+        for chunk_start in range(self.start, self.stop, self.chunk_rows):
+            chunk_stop = min(chunk_start + self.chunk_rows, self.stop)
+            # Rows around the chunk (and outside the streamed range) are only read to label the chunk's own rows
+            frame = self.store.read(None, max(chunk_start - self.warmup, 0), chunk_stop + self.horizon)
+            labeled = self.labeling_engine.apply_labeling_strategy(frame)
+            labeled = labeled[(labeled.index >= chunk_start) & (labeled.index < chunk_stop)]
+            if labeled.empty:
+                continue
+            labeled_rows += len(labeled)
+            labels = labeled["label"]
+            if self.label_mapping is not None:
+                labels = labels.map(self.label_mapping)
+            labels = labels.to_numpy()
+            self.classes.update(np.unique(labels).tolist())
+            X = pd.DataFrame(labeled[self.columns].to_numpy(dtype=np.float32), columns=self.columns, copy=False)
+            yield X, labels
+        self.labeled_rows = labeled_rows
+
+    def data_hash(self):
+        """
+        Fingerprint of the streamed rows in one more pass, the out-of-core counterpart of ``data_hash``.
+
+        Returns:
+            str: SHA-1 hex digest of the column names, values and labels.
+        """
+        # Values and labels go to separate digests so the fingerprint does not depend on the chunk size
+        values, labels = hashlib.sha1(), hashlib.sha1()
+        for X, y in self:
+            values.update(np.ascontiguousarray(X.to_numpy()).tobytes())
+            labels.update(np.ascontiguousarray(y).tobytes())
+        digest = hashlib.sha1(repr(self.columns).encode())
+        digest.update(values.digest() + labels.digest())
+        return digest.hexdigest()
+
+
+class _ChunkIter(xgb.DataIter):
+    """
+    Feeds StoreChunks to XGBoost one chunk at a time; the DMatrix pages them to ``cache_prefix`` on disk.
+    """
+
+    def __init__(self, chunks, cache_prefix):
+        self.chunks = chunks
+        self._iterator = None
+        super().__init__(cache_prefix=cache_prefix, release_data=True)
+
+    def next(self, input_data):
+        if self._iterator is None:
+            self._iterator = iter(self.chunks)
+        chunk = next(self._iterator, None)
+        if chunk is None:
+            return 0
+        X, y = chunk
+        input_data(data=X, label=y)
+        return 1
+
+    def reset(self):
+        self._iterator = None
+
+
+def _train_booster(estimator, chunks, cache_dir, epochs):
+    """
+    Boost on an external-memory DMatrix and wrap the booster into a copy of the XGBClassifier.
+    """
+    model = clone(estimator).set_params(tree_method="hist")
+    with tempfile.TemporaryDirectory(dir=cache_dir) as cache:
+        dtrain = xgb.DMatrix(_ChunkIter(chunks, os.path.join(cache, "dtrain")))
+        # The classes are known once the DMatrix has read every chunk
+        n_classes = len(chunks.classes)
+        if n_classes > 2 and not model.objective.startswith("multi:"):
+            model.set_params(objective="multi:softprob")
+        xgb_params = {key: value for key, value in model.get_xgb_params().items() if value is not None}
+        if n_classes > 2:
+            xgb_params["num_class"] = n_classes
+        booster = xgb.train(xgb_params, dtrain, num_boost_round=model.n_estimators or 100)
+        del dtrain
+    # The scikit-learn wrapper predicts with the booster as if it had fitted it
+    return adopt_booster(model, booster, n_classes)
+
+
+def _train_partial_fit(estimator, chunks, cache_dir, epochs):
+    """
+    Standardize with statistics from a first pass, then ``partial_fit`` the estimator for ``epochs`` passes.
+    """
+    scaler = StandardScaler()
+    for X, _ in chunks:
+        scaler.partial_fit(X)
+    classes = np.array(sorted(chunks.classes))
+    model = clone(estimator)
+    for _ in range(epochs):
+        for X, y in chunks:
+            model.partial_fit(scaler.transform(X), y, classes=classes)
+    return Pipeline([("scale", scaler), ("model", model)])
+
+
+def out_of_core_mode(estimator):
+    """
+    How an estimator trains out of core: "external_memory" (XGBoost) or "partial_fit".
+
+    Raises:
+        ValueError: For estimators that need their whole training set in memory.
+    """
+    if isinstance(estimator, xgb.XGBModel):
+        return "external_memory"
+    if hasattr(estimator, "partial_fit"):
+        return "partial_fit"
+    raise ValueError(f"{type(estimator).__name__} cannot be trained out of core; use xgboost or an estimator with partial_fit.")
+
+
+def train_out_of_core(estimator, chunks, epochs=1, cache_dir=None):
+    """
+    Fit an estimator on StoreChunks without ever loading the whole training range.
+
+    XGBoost models boost on an external-memory DMatrix paged to a temporary cache; estimators with
+    ``partial_fit`` (SGD) take ``epochs`` passes over the chunks after a standardizing pass, and come back as a
+    scaler-and-model pipeline. Other estimators need their whole training set in memory and are rejected.
+    Besides the chunk in flight, XGBoost keeps a gradient pair and a prediction per row and class, a few tens
+    of bytes per row against the hundreds a row of features takes in memory.
+
+    Args:
+        estimator: Unfitted XGBClassifier or scikit-learn estimator with ``partial_fit``.
+        chunks (StoreChunks): The training chunks.
+        epochs (int): Passes of ``partial_fit``; ignored by XGBoost.
+        cache_dir (str): Directory of the external-memory cache, the system temporary directory by default.
+
+    Returns:
+        tuple: The fitted model and a summary dict with ``rows`` (labeled rows trained on), ``chunks``,
+        ``chunk_rows``, ``mode``, ``epochs`` and ``fit_seconds``.
+    """
+    try:
+        start = time.perf_counter()
+        trainers = {
+            "external_memory": _train_booster,
+            "partial_fit": _train_partial_fit,
+        }
+        mode = out_of_core_mode(estimator)
+        model = trainers[mode](estimator, chunks, cache_dir, epochs)
+        summary = {
+            "mode": mode,
+            "rows": chunks.labeled_rows,
+            "chunks": -(-len(chunks) // chunks.chunk_rows),
+            "chunk_rows": chunks.chunk_rows,
+            "epochs": epochs if mode == "partial_fit" else None,
+            "fit_seconds": time.perf_counter() - start,
+        }
+        logging.info(f"Model trained out of core: {summary}")
+        return model, summary
+    except Exception as e:
+        logging.error("Error training the model out of core", exc_info=True)
+        raise e
+
+
+def predict_out_of_core(model, chunks):
+    """
+    Predict StoreChunks one chunk at a time.
+
+    Args:
+        model: Fitted model.
+        chunks (StoreChunks): The chunks to predict.
+
+    Returns:
+        tuple: (labels, predictions) as arrays over all chunks.
+    """
+    labels, predictions = [], []
+    for X, y in chunks:
+        labels.append(y)
+        predictions.append(np.asarray(model.predict(X)))
+    if not labels:
+        return np.empty(0), np.empty(0)
+    return np.concatenate(labels), np.concatenate(predictions)
@@ -0,0 +1,241 @@
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone
+
+from . import indicator_kernels as kernels
+from .model_engine import ModelEngine
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Regime codes are the positions in this tuple
+REGIMES = ("bear", "sideways", "bull")
+BEAR, SIDEWAYS, BULL = range(len(REGIMES))
+# Column holding the regime code of each bar in training frames and router inputs
+REGIME_COLUMN = "regime"
+
+
+class RegimeClassifier:
+    """
+    Trend regime of every bar from the distance of the close to its moving average.
+
+    A bar is bullish when the close is more than ``band`` above the ``window``-bar simple moving average, bearish
+    when it is more than ``band`` below it and sideways otherwise, including the warm-up bars without an average.
+    With ``confirm_bars`` above one a new regime only takes over once it has lasted that many bars, the grace
+    period that keeps the router from flapping between models around the band edges. Each bar only depends on
+    the bars before it, so the whole history is classified at once with array operations.
+    """
+
+    def __init__(self, window=200, band=0.01, confirm_bars=1):
+        """
+        Initialize the RegimeClassifier.
+
+        Args:
+            window (int): Bars of the moving average.
+            band (float): Relative distance from the average beyond which the market trends.
+            confirm_bars (int): Bars a new regime must last before it is switched to.
+        """
+        if window < 1 or confirm_bars < 1:
+            raise ValueError("window and confirm_bars must be at least 1.")
+        self.window = window
+        self.band = band
+        self.confirm_bars = confirm_bars
+
+    @classmethod
+    def from_config(cls, regime_config):
+        """
+        Create a RegimeClassifier from the ``regimes`` section of a model config (``window``, ``band`` and
+        ``confirm_bars``, all optional).
+        """
+        return cls(**{key: regime_config[key] for key in ("window", "band", "confirm_bars") if key in regime_config})
+
+    def warmup_rows(self):
+        """
+        Rows of history needed before the regime of a bar matches a run over the full history.
+        """
+        return self.window + self.confirm_bars - 1
+
+    def classify(self, close):
+        """
+        Regime code of every bar.
+
+        Args:
+            close (array-like): Close prices in time order.
+
+        Returns:
+            np.ndarray: int8 codes indexing ``REGIMES``.
+        """
+        close = kernels.as_float_array(close)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            deviation = close / kernels.rolling_mean(close, self.window) - 1.0
+        raw = np.full(len(close), SIDEWAYS, dtype=np.int8)
+        raw[deviation > self.band] = BULL
+        raw[deviation < -self.band] = BEAR
+        if self.confirm_bars == 1 or len(raw) == 0:
+            return raw
+
+        # Position of every bar within its run of equal raw regimes
+        positions = np.arange(len(raw))
+        run_start = np.where(np.concatenate(([True], raw[1:] != raw[:-1])), positions, 0)
+        np.maximum.accumulate(run_start, out=run_start)
+        # Every bar takes the raw regime of the last bar whose run had lasted confirm_bars by then
+        confirmed = np.where(positions - run_start >= self.confirm_bars - 1, positions, -1)
+        np.maximum.accumulate(confirmed, out=confirmed)
+        return np.where(confirmed >= 0, raw[np.maximum(confirmed, 0)], SIDEWAYS).astype(np.int8)
+
+
+def _fit_regime(estimator, matrix, rows, deadline=None):
+    """
+    Fit a clone of the estimator on the rows of one regime, run in a worker process.
+
+    ``deadline`` is a ``time.time()`` timestamp, comparable across processes, after which tree growth stops.
+    """
+    start = time.perf_counter()
+    engine = ModelEngine.from_model(clone(estimator))
+    time_budget = None if deadline is None else deadline - time.time()
+    training = engine.train_model(
+        pd.DataFrame(matrix.values[rows], columns=matrix.columns), matrix.labels[rows], time_budget=time_budget,
+        sample_weight=matrix.weights(rows)
+    )
+    return engine.model, time.perf_counter() - start, training
+
+
+class RegimeRouter:
+    """
+    One model per market regime behind a single ``predict``.
+
+    The inputs carry the regime code of every bar in ``regime_column`` (see ``RegimeClassifier``). A batch is
+    sorted by the model its bars route to, each model predicts its contiguous block in one call, and a single
+    gather puts the predictions back in bar order, so the cost does not grow with per-row dispatch. Regimes
+    without a model of their own use the fallback model trained on all regimes.
+    """
+
+    def __init__(self, models, fallback, feature_columns, regime_column=REGIME_COLUMN, summary=None):
+        """
+        Initialize the RegimeRouter.
+
+        Args:
+            models (dict): Fitted model per regime code; missing regimes use ``fallback``.
+            fallback: Fitted model for the other regimes.
+            feature_columns (list): Input columns of the models, in order.
+            regime_column (str): Input column holding the regime codes.
+            summary (dict): Training summary per regime, kept for the build logs.
+        """
+        self.fallback = fallback
+        self.feature_columns = list(feature_columns)
+        self.regime_column = regime_column
+        self.summary = summary or {}
+        # Distinct models, and the position of each regime's model among them
+        self.models = [fallback]
+        routes = []
+        for code in range(len(REGIMES)):
+            model = models.get(code)
+            if model is None:
+                routes.append(0)
+            else:
+                routes.append(len(self.models))
+                self.models.append(model)
+        self.routes = np.array(routes, dtype=np.intp)
+        self.classes_ = fallback.classes_
+
+    @classmethod
+    def train(cls, estimator, matrix, regimes, fallback, min_rows=1000, n_jobs=-1, time_budget=None):
+        """
+        Fit one clone of the estimator per regime, in parallel worker processes.
+
+        A regime gets its own model only with at least ``min_rows`` training rows holding every class of the
+        training set, so all models predict the same classes; the others route to ``fallback``.
+
+        Args:
+            estimator: Unfitted scikit-learn compatible estimator.
+            matrix (FeatureMatrix): Training features, labels and sample weights.
+            regimes (np.ndarray): Regime code of every training row.
+            fallback: The estimator fitted on all rows.
+            min_rows (int): Fewest rows of a regime model.
+            n_jobs (int): Cores of the regime fits, split between the models fitted at once; -1 uses all cores.
+            time_budget (float): Seconds the regime models may take to grow their trees, all of them together (see
+                ``ModelEngine.train_model``).
+
+        Returns:
+            RegimeRouter: The router.
+        """
+        try:
+            regimes = np.asarray(regimes)
+            classes = np.unique(matrix.labels)
+            summary, jobs = {}, []
+            for code, name in enumerate(REGIMES):
+                rows = np.flatnonzero(regimes == code)
+                summary[name] = {"rows": len(rows), "model": "fallback"}
+                if len(rows) < min_rows:
+                    summary[name]["reason"] = f"fewer than {min_rows} rows"
+                elif not np.array_equal(np.unique(matrix.labels[rows]), classes):
+                    summary[name]["reason"] = "not every class is present"
+                else:
+                    jobs.append((code, rows))
+
+            models = {}
+            if jobs:
+                deadline = None if time_budget is None else time.time() + max(float(time_budget), 0.0)
+                # The cores are split between the regime models fitted at once
+                concurrent = min(len(jobs), effective_n_jobs(n_jobs))
+                if concurrent > 1 and "n_jobs" in estimator.get_params():
+                    estimator = clone(estimator).set_params(n_jobs=max(1, effective_n_jobs(n_jobs) // concurrent))
+                # joblib memory-maps the training matrix into the workers instead of pickling it per regime
+                fitted = Parallel(n_jobs=concurrent, backend="loky")(
+                    delayed(_fit_regime)(estimator, matrix, rows, deadline) for _, rows in jobs
+                )
+                for (code, _), (model, fit_seconds, training) in zip(jobs, fitted):
+                    models[code] = model
+                    summary[REGIMES[code]].update(
+                        model="regime", fit_seconds=fit_seconds, used_rounds=training["used_rounds"], stopped_by=training["stopped_by"]
+                    )
+            logging.info(f"Regime models trained: {summary}")
+            return cls(models, fallback, matrix.columns, summary=summary)
+        except Exception as e:
+            logging.error("Error training the regime models", exc_info=True)
+            raise e
+
+    def _route(self, X, method):
+        if not isinstance(X, pd.DataFrame) or self.regime_column not in X.columns:
+            raise ValueError(f"Inputs of a regime router need the {self.regime_column} column.")
+        features = X[self.feature_columns]
+        model_of_row = self.routes[X[self.regime_column].to_numpy(dtype=np.intp)]
+        order = np.argsort(model_of_row, kind="stable")
+        bounds = np.searchsorted(model_of_row[order], np.arange(len(self.models) + 1))
+        blocks = [
+            getattr(model, method)(features.iloc[order[bounds[i]:bounds[i + 1]]])
+            for i, model in enumerate(self.models) if bounds[i + 1] > bounds[i]
+        ]
+        routed = np.concatenate(blocks)
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        return routed[inverse]
+
+    def predict(self, X):
+        """
+        Predicted class of every bar by the model of its regime.
+
+        Args:
+            X (pd.DataFrame): The feature columns and the regime column.
+
+        Returns:
+            np.ndarray: Class label per row.
+        """
+        return self._route(X, "predict")
+
+    def predict_proba(self, X):
+        """
+        Class probabilities of every bar by the model of its regime.
+
+        Args:
+            X (pd.DataFrame): The feature columns and the regime column.
+
+        Returns:
+            np.ndarray: (rows, classes) probabilities.
+        """
+        return self._route(X, "predict_proba")
@@ -0,0 +1,283 @@
+import numpy as np
+
+from .indicator_kernels import as_float_array, moving_average
+
+
+def _output(n, out):
+    if out is None:
+        return np.empty(n, dtype=np.float64)
+    if out.shape[0] != n:
+        raise ValueError(f"Output buffer has {out.shape[0]} rows, expected {n}.")
+    return out
+
+
+def _window_reduce(values, window, ufunc, out):
+    """
+    Van Herk / Gil-Werman window reduction: block prefix and suffix scans, then one elementwise combine.
+
+    For max/min this is the vectorized counterpart of a monotonic deque, and for sums the partial sums never
+    grow beyond one window so there is no cumulative-sum drift. Each element is touched a constant number of
+    times whatever the window length, and windows containing NaN yield NaN.
+    """
+    n = len(values)
+    out[:] = np.nan
+    if n < window:
+        return out
+
+    blocks = -(-n // window)
+    padded = np.full(blocks * window, np.nan)
+    padded[:n] = values
+    padded = padded.reshape(blocks, window)
+
+    prefix = ufunc.accumulate(padded, axis=1).ravel()
+    suffix = ufunc.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+    # Window [t - window + 1, t] = suffix of its first block + prefix of its last block
+    ufunc(suffix[:n - window + 1], prefix[window - 1:n], out=out[window - 1:])
+    # Windows aligned exactly on a block are covered by the suffix alone
+    aligned = np.arange(0, n - window + 1, window)
+    out[aligned + window - 1] = suffix[aligned]
+    return out
+
+
+def _window_sums(values, window, powers):
+    """
+    Rolling sums of ``values ** p`` for each power (NaN for incomplete or NaN-containing windows).
+    """
+    sums = []
+    term = np.ones(len(values))
+    for power in range(1, max(powers) + 1):
+        term *= values
+        if power in powers:
+            sums.append(_window_reduce(term, window, np.add, np.empty(len(values))))
+    return sums
+
+
+def _standardize(values):
+    """
+    Centre and scale by the global mean and std so the running power sums stay well conditioned.
+
+    Moments are still taken from raw power sums, so a window whose variance is tiny next to the spread of
+    the whole series (e.g. a 2-bar std of raw prices) carries a relative error of roughly eps * (range / std) ** 2.
+    """
+    finite = values[~np.isnan(values)]
+    if len(finite) == 0:
+        return values.copy(), 0.0, 1.0
+    center = finite.mean()
+    scale = finite.std() or 1.0
+    return (values - center) / scale, center, scale
+
+
+def _central_moments(values, window, order):
+    """
+    Rolling mean and central moments (2..order) of ``values`` over ``window`` rows.
+    """
+    standardized, center, scale = _standardize(values)
+    sums = _window_sums(standardized, window, range(1, order + 1))
+    raw = [s / window for s in sums]
+
+    mean = raw[0]
+    m2 = raw[1] - mean ** 2
+    moments = [mean * scale + center, np.maximum(m2, 0.0) * scale ** 2]
+    if order >= 3:
+        m3 = raw[2] - 3 * mean * raw[1] + 2 * mean ** 3
+        moments.append(m3 * scale ** 3)
+    if order >= 4:
+        m4 = raw[3] - 4 * mean * raw[2] + 6 * mean ** 2 * raw[1] - 3 * mean ** 4
+        moments.append(m4 * scale ** 4)
+    return moments
+
+
+def rolling_std(values, window, ddof=1, out=None):
+    """
+    Rolling standard deviation in O(n) from blocked running power sums (``Series.rolling(window).std()``).
+    """
+    values = as_float_array(values)
+    out = _output(len(values), out)
+    _, m2 = _central_moments(values, window, 2)
+    np.sqrt(m2 * window / (window - ddof), out=out)
+    return out
+
+
+def rolling_zscore(values, window, out=None):
+    """
+    Distance of each value from its rolling mean in rolling standard deviations.
+
+    Args:
+        values (array-like): Input series.
+        window (int): Window length.
+        out (np.ndarray): Optional preallocated output buffer.
+
+    Returns:
+        np.ndarray: The rolling z-score, NaN for incomplete windows or flat windows.
+    """
+    values = as_float_array(values)
+    out = _output(len(values), out)
+    mean, m2 = _central_moments(values, window, 2)
+    std = np.sqrt(m2 * window / (window - 1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(values - mean, std, out=out)
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def rolling_skew(values, window, out=None):
+    """
+    Bias-corrected rolling skewness in O(n) (``Series.rolling(window).skew()``).
+    """
+    values = as_float_array(values)
+    out = _output(len(values), out)
+    _, m2, m3 = _central_moments(values, window, 3)
+    n = float(window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(m3, m2 ** 1.5, out=out)
+    out *= np.sqrt(n * (n - 1)) / (n - 2)
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def rolling_kurt(values, window, out=None):
+    """
+    Bias-corrected rolling excess kurtosis in O(n) (``Series.rolling(window).kurt()``).
+    """
+    values = as_float_array(values)
+    out = _output(len(values), out)
+    _, m2, _, m4 = _central_moments(values, window, 4)
+    n = float(window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(m4, m2 ** 2, out=out)
+    out *= (n + 1) * n * (n - 1) / ((n - 2) * (n - 3)) / n
+    out -= 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def bollinger_bands(close, timeperiod=20, nbdevup=2.0, nbdevdn=2.0, matype=0, out=None):
+    """
+    Bollinger Bands around a moving average, using the population rolling standard deviation
+    (TA-Lib ``BBANDS``).
+
+    Args:
+        close (array-like): Close prices.
+        timeperiod (int): Window of the middle band and of the standard deviation.
+        nbdevup (float): Standard deviations above the middle band.
+        nbdevdn (float): Standard deviations below the middle band.
+        matype (int): Moving average type of the middle band (see ``moving_average``).
+        out (np.ndarray): Optional preallocated (n, 3) buffer receiving the upper, middle and lower bands.
+
+    Returns:
+        np.ndarray: An (n, 3) array with the upper, middle and lower bands.
+    """
+    close = as_float_array(close)
+    n = len(close)
+    if out is None:
+        out = np.empty((n, 3), dtype=np.float64, order="F")
+
+    middle = moving_average(close, timeperiod, matype, out=out[:, 1])
+    std = rolling_std(close, timeperiod, ddof=0, out=out[:, 2])
+    np.multiply(std, nbdevup, out=out[:, 0])
+    out[:, 0] += middle
+    std *= -nbdevdn
+    std += middle
+    return out
+
+
+def stoch(high, low, close, fastk_period=5, slowk_period=3, slowk_matype=0, slowd_period=3, slowd_matype=0, out=None):
+    """
+    Slow stochastic oscillator (TA-Lib ``STOCH``).
+
+    The raw %K is smoothed into slow %K and again into slow %D; both outputs are NaN until slow %D exists.
+
+    Args:
+        high (array-like): High prices.
+        low (array-like): Low prices.
+        close (array-like): Close prices.
+        fastk_period (int): Look-back of the highest high and lowest low.
+        slowk_period (int): Smoothing period of slow %K.
+        slowk_matype (int): Moving average type of slow %K (see ``moving_average``).
+        slowd_period (int): Smoothing period of slow %D.
+        slowd_matype (int): Moving average type of slow %D.
+        out (np.ndarray): Optional preallocated (n, 2) buffer receiving slow %K and slow %D.
+
+    Returns:
+        np.ndarray: An (n, 2) array with slow %K and slow %D.
+    """
+    close = as_float_array(close)
+    n = len(close)
+    if out is None:
+        out = np.empty((n, 2), dtype=np.float64, order="F")
+
+    lowest = rolling_min(low, fastk_period)
+    highest = rolling_max(high, fastk_period, out=out[:, 1])
+    highest -= lowest
+    fast_k = close - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fast_k /= highest
+    fast_k *= 100.0
+    fast_k[highest == 0.0] = 0.0
+
+    slow_k = moving_average(fast_k, slowk_period, slowk_matype, out=out[:, 0])
+    moving_average(slow_k, slowd_period, slowd_matype, out=out[:, 1])
+    out[np.isnan(out[:, 1]), 0] = np.nan
+    return out
+
+
+def rolling_max(values, window, out=None):
+    """
+    Rolling maximum in O(n), independent of the window length (``Series.rolling(window).max()``).
+    """
+    values = as_float_array(values)
+    return _window_reduce(values, window, np.maximum, _output(len(values), out))
+
+
+def rolling_min(values, window, out=None):
+    """
+    Rolling minimum in O(n), independent of the window length (``Series.rolling(window).min()``).
+    """
+    values = as_float_array(values)
+    return _window_reduce(values, window, np.minimum, _output(len(values), out))
+
+
+def log_returns(values):
+    """
+    One-step log returns, NaN in the first position.
+    """
+    values = as_float_array(values)
+    returns = np.empty(len(values))
+    if len(values):
+        returns[0] = np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.log(values[1:] / values[:-1], out=returns[1:])
+    return returns
+
+
+def realized_volatility(close, window, out=None):
+    """
+    Realized volatility: square root of the rolling sum of squared log returns.
+    """
+    returns = log_returns(close)
+    out = _output(len(returns), out)
+    (squared,) = _window_sums(returns, window, [2])
+    np.sqrt(squared, out=out)
+    return out
+
+
+def volume_weighted_return(close, volume, window, out=None):
+    """
+    Rolling volume-weighted mean of one-step simple returns, ``sum(volume * r) / sum(volume)``.
+    """
+    close = as_float_array(close)
+    volume = as_float_array(volume)
+    out = _output(len(close), out)
+    returns = np.empty(len(close))
+    if len(close):
+        returns[0] = np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.divide(close[1:], close[:-1], out=returns[1:])
+        returns[1:] -= 1.0
+
+    (weighted,) = _window_sums(returns * volume, window, [1])
+    (total,) = _window_sums(np.where(np.isnan(returns), np.nan, volume), window, [1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(weighted, total, out=out)
+    out[~np.isfinite(out)] = np.nan
+    return out
@@ -0,0 +1,129 @@
+import logging
+
+import numpy as np
+
+from .labeling_engine import LabelingEngine
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class MajoritySampler:
+    """
+    Class-aware downsampling of the majority label (HOLD) of a training set.
+
+    Rows of the other classes are all kept. The majority class is cut to ``max_ratio`` times the size of the
+    largest other class: "stratified" keeps every majority row with the same probability, "time_decay" gives
+    older rows a keep probability that halves every ``half_life`` rows back from the newest one, so the sample
+    leans on recent bars while keeping the same expected size. Rows are drawn independently and stay in time
+    order. With ``reweight`` every kept majority row gets the inverse of its keep probability as sample
+    weight, so the weighted training set has the class balance (and, for "time_decay", the age profile) of
+    the full one.
+    """
+
+    METHODS = ("stratified", "time_decay")
+
+    def __init__(self, method="stratified", max_ratio=1.0, half_life=None, majority=LabelingEngine.HOLD_SIGNAL,
+                 reweight=True, random_state=42):
+        """
+        Initialize the MajoritySampler.
+
+        Args:
+            method (str): "stratified" or "time_decay".
+            max_ratio (float): Majority rows kept per row of the largest other class.
+            half_life (int): Rows over which the keep probability of "time_decay" halves; a tenth of the
+                training rows by default.
+            majority (int): Label of the class to downsample.
+            reweight (bool): Return inverse-probability sample weights for the kept rows.
+            random_state (int): Seed of the draws.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unsupported sampling method: {method}")
+        if max_ratio <= 0:
+            raise ValueError("max_ratio must be positive.")
+        self.method = method
+        self.max_ratio = max_ratio
+        self.half_life = half_life
+        self.majority = majority
+        self.reweight = reweight
+        self.random_state = random_state
+
+    @classmethod
+    def from_config(cls, sampling_config):
+        """
+        Create a MajoritySampler from the ``sampling`` section of a model config.
+
+        Args:
+            sampling_config (dict): Optional ``method``, ``max_ratio``, ``half_life``, ``reweight`` and
+                ``random_state``.
+
+        Returns:
+            MajoritySampler: The sampler.
+        """
+        keys = ("method", "max_ratio", "half_life", "reweight", "random_state")
+        return cls(**{key: sampling_config[key] for key in keys if key in sampling_config})
+
+    def _keep_probabilities(self, n_rows, positions, target):
+        if self.method == "stratified":
+            return np.full(len(positions), target / len(positions))
+
+        half_life = self.half_life or max(n_rows // 10, 1)
+        exponents = (positions - positions[-1]) / half_life
+        # Scale the decay so the expected sample size is the target, capping the keep probabilities at one. The
+        # scale is bisected in log2 so it stays finite when the oldest rows decay below the smallest float: it
+        # lies between the scale of keeping ``target`` rows at the newest row's rate and that of keeping all rows.
+        low, high = np.log2(target / len(positions)), -exponents[0]
+        for _ in range(100):
+            log_scale = (low + high) / 2
+            if np.exp2(np.minimum(exponents + log_scale, 0.0)).sum() < target:
+                low = log_scale
+            else:
+                high = log_scale
+        return np.exp2(np.minimum(exponents + high, 0.0))
+
+    def sample(self, labels):
+        """
+        Draw the training rows to keep.
+
+        Args:
+            labels (array-like): Labels of the training rows in time order, before any encoding.
+
+        Returns:
+            dict: ``rows`` (sorted positions of the kept rows), ``sample_weight`` (per kept row, None without
+            ``reweight``) and a ``summary`` with the row counts and label distributions before and after.
+        """
+        try:
+            labels = np.asarray(labels)
+            majority_rows = np.flatnonzero(labels == self.majority)
+            other_counts = np.unique(labels[labels != self.majority], return_counts=True)[1]
+            target = min(len(majority_rows), self.max_ratio * (other_counts.max() if len(other_counts) else 0))
+
+            weights = np.ones(len(labels))
+            keep = np.ones(len(labels), dtype=bool)
+            if len(majority_rows) and target < len(majority_rows):
+                probabilities = self._keep_probabilities(len(labels), majority_rows, max(target, 1))
+                drawn = np.random.default_rng(self.random_state).random(len(majority_rows)) < probabilities
+                keep[majority_rows[~drawn]] = False
+                # Rows too old to be drawn at all (probabilities that underflow to zero) get no weight
+                weights[majority_rows[drawn]] = 1.0 / probabilities[drawn]
+            rows = np.flatnonzero(keep)
+
+            summary = {
+                "method": self.method,
+                "rows_before": len(labels),
+                "rows_after": len(rows),
+                "reduction": 1.0 - len(rows) / len(labels) if len(labels) else 0.0,
+                "label_distribution_before": _distribution(labels),
+                "label_distribution_after": _distribution(labels[rows]),
+            }
+            logging.info(f"Training set sampled: {summary}")
+            return {"rows": rows, "sample_weight": weights[rows] if self.reweight else None, "summary": summary}
+        except Exception as e:
+            logging.error("Error sampling the training set", exc_info=True)
+            raise e
+
+
+def _distribution(labels):
+    values, counts = np.unique(labels, return_counts=True)
+    return {value.item(): int(count) for value, count in zip(values, counts)}
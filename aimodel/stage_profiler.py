@@ -0,0 +1,191 @@
+import cProfile
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def current_rss_bytes():
+    """
+    Resident set size of this process in bytes, or None where ``/proc`` is unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return None
+
+
+def peak_rss_bytes():
+    """
+    High-water mark of the resident set of this process in bytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _PeakSampler:
+    """
+    Samples the resident set from a background thread, which also catches the allocations of native code
+    (TA-Lib, XGBoost) that ``tracemalloc`` does not see.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.start_rss = current_rss_bytes()
+        self.peak = self.start_rss
+        self._done = threading.Event()
+        self._thread = None
+        if self.start_rss is not None:
+            self._thread = threading.Thread(target=self._run, name="stage-rss-sampler", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._done.wait(self.interval):
+            self.peak = max(self.peak, current_rss_bytes())
+
+    def stop(self):
+        """
+        Stop sampling and return the growth of the resident set above its starting size, in bytes.
+        """
+        if self._thread is None:
+            return None
+        self._done.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_bytes())
+        return self.peak - self.start_rss
+
+
+class Stage:
+    """
+    One profiled stage; ``shape`` records the size of the data it produced.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = None
+        self.columns = None
+
+    def shape(self, data):
+        """
+        Record the rows and columns of a frame, array or FeatureMatrix, and return it unchanged.
+        """
+        self.rows = len(data)
+        columns = getattr(data, "columns", None)
+        if columns is not None:
+            self.columns = len(columns)
+        elif len(getattr(data, "shape", ())) > 1:
+            self.columns = data.shape[1]
+        return data
+
+
+class StageProfiler:
+    """
+    Wall time, CPU time, peak memory and data shape of every stage of a build.
+
+    Each ``stage`` block reports its start to the progress callback and appends a record to ``stages``. CPU
+    time covers all threads of this process but not joblib worker processes, so parallel stages show more
+    wall than CPU time. The memory figure is how far the resident set rose above its size at the start of
+    the stage, sampled every ``sample_interval`` seconds.
+
+    With ``profile_path`` the whole build also runs under cProfile and the stats are dumped to that file for
+    ``pstats`` or snakeviz.
+    """
+
+    def __init__(self, progress_callback=None, profile_path=None, sample_interval=0.005):
+        """
+        Initialize the StageProfiler.
+
+        Args:
+            progress_callback (callable): Called as ``progress_callback(stage, progress)`` when a stage starts.
+            profile_path (str): File the cProfile stats are dumped to; None disables cProfile.
+            sample_interval (float): Seconds between resident set samples.
+        """
+        self.progress_callback = progress_callback
+        self.profile_path = profile_path
+        self.sample_interval = sample_interval
+        self.stages = []
+        self._profile = None
+        self._start_wall = None
+        self._start_cpu = None
+
+    def start(self):
+        """
+        Start timing the build and, when a profile path is set, cProfile.
+        """
+        self._start_wall, self._start_cpu = time.perf_counter(), time.process_time()
+        if self.profile_path:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def stop(self):
+        """
+        Stop cProfile and dump its stats.
+        """
+        if self._profile is not None:
+            self._profile.disable()
+            os.makedirs(os.path.dirname(os.path.abspath(self.profile_path)), exist_ok=True)
+            self._profile.dump_stats(self.profile_path)
+            logging.info(f"cProfile stats of the build written to {self.profile_path}.")
+            self._profile = None
+
+    @contextmanager
+    def stage(self, name, progress=None):
+        """
+        Profile the block as the stage ``name``.
+
+        Args:
+            name (str): Stage name.
+            progress (float): Completed fraction of the build, passed to the progress callback.
+
+        Yields:
+            Stage: Call ``stage.shape(data)`` to record the size of the stage's output.
+        """
+        if self.progress_callback is not None and progress is not None:
+            self.progress_callback(name, progress)
+        stage = Stage(name)
+        sampler = _PeakSampler(self.sample_interval)
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        failed = True
+        try:
+            yield stage
+            failed = False
+        finally:
+            record = {
+                "stage": name,
+                "wall_seconds": time.perf_counter() - start_wall,
+                "cpu_seconds": time.process_time() - start_cpu,
+                "peak_memory_delta_bytes": sampler.stop(),
+                "rows": stage.rows,
+                "columns": stage.columns,
+            }
+            if failed:
+                record["failed"] = True
+            self.stages.append(record)
+            logging.info(f"Stage {name}: {record['wall_seconds']:.3f}s wall, {record['cpu_seconds']:.3f}s CPU, "
+                         f"peak +{(record['peak_memory_delta_bytes'] or 0) / 2**20:.1f} MiB")
+
+    def summary(self):
+        """
+        Structured profile for the build logs.
+
+        Returns:
+            dict: ``stages`` (one record per stage, in order), total ``wall_seconds`` and ``cpu_seconds`` since
+            ``start``, the process ``peak_rss_bytes`` and the ``pstats_path`` if cProfile ran.
+        """
+        return {
+            "stages": list(self.stages),
+            "wall_seconds": time.perf_counter() - self._start_wall if self._start_wall is not None else None,
+            "cpu_seconds": time.process_time() - self._start_cpu if self._start_cpu is not None else None,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "pstats_path": self.profile_path,
+        }
@@ -1,6 +1,6 @@
 import pandas as pd
 import logging
-import talib
+from .feature_engine import FeatureEngine
 
 
 # Configure logging
@@ -27,71 +27,7 @@ class TechnicalIndicatorGenerator:
             pd.DataFrame: Dataset with additional columns for technical indicators.
         """
         try:
-            for feature in self.features_config:
-                name = feature["name"]
-                params = feature.get("params", {})
-
-                if name == "RSI":
-                    df["RSI"] = talib.RSI(df["close"], timeperiod=params["timeperiod"])
-
-                elif name == "MACD":
-                    macd, signal, _ = talib.MACD(
-                        df["close"],
-                        fastperiod=params["fastperiod"],
-                        slowperiod=params["slowperiod"],
-                        signalperiod=params["signalperiod"]
-                    )
-                    df["MACD"] = macd
-                    df["Signal_Line"] = signal
-
-                elif name == "Simple Moving Average (SMA)":
-                    df[f"SMA_{params['window']}"] = talib.SMA(df["close"], timeperiod=params["window"])
-
-                elif name == "Exponential Moving Average (EMA)":
-                    df[f"EMA_{params['span']}"] = talib.EMA(df["close"], timeperiod=params["span"])
-
-                elif name == "Average True Range (ATR)":
-                    df["ATR"] = talib.ATR(df["high"], df["low"], df["close"], timeperiod=params["timeperiod"])
-
-                elif name == "Stochastic Oscillator":
-                    slowk, slowd = talib.STOCH(
-                        df["high"],
-                        df["low"],
-                        df["close"],
-                        fastk_period=params["fastk_period"],
-                        slowk_period=params["slowk_period"],
-                        slowk_matype=params["slowk_matype"],
-                        slowd_period=params["slowd_period"],
-                        slowd_matype=params["slowd_matype"]
-                    )
-                    df["Stochastic_K"] = slowk
-                    df["Stochastic_D"] = slowd
-
-                elif name == "Bollinger Band":
-                    upper, middle, lower = talib.BBANDS(
-                        df["close"],
-                        timeperiod=params["timeperiod"],
-                        nbdevup=params["nbdevup"],
-                        nbdevdn=params["nbdevdn"],
-                        matype=params["matype"]
-                    )
-                    df["Upper_Band"] = upper
-                    df["Middle_Band"] = middle
-                    df["Lower_Band"] = lower
-
-                elif name == "Percentage Price Oscillator (PPO)":
-                    df["PPO"] = talib.PPO(
-                        df["close"],
-                        fastperiod=params["fastperiod"],
-                        slowperiod=params["slowperiod"],
-                        matype=params["matype"]
-                    )
-
-                elif name == "Lag Features":
-                    for lag in range(1, params["lag_period"] + 1):
-                        df[f"close_lag_{lag}"] = df["close"].shift(lag)
-
-            return df.dropna()
+            return FeatureEngine(self.features_config).compute(df)
         except Exception as e:
             logging.error("Error generating indicators", exc_info=True)
             return None
@@ -0,0 +1,211 @@
+import logging
+import time
+
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+
+from .feature_matrix import FeatureMatrix
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def holdout_split(n_samples, test_size=0.2, gap=0):
+    """
+    Chronological train/test split: the test set is the last ``test_size`` of the rows and the ``gap`` rows
+    before it are dropped, so no training label looks into the test period.
+
+    Args:
+        n_samples (int): Number of rows.
+        test_size (float or int): Fraction of the rows, or number of rows, in the test set.
+        gap (int): Rows dropped between the training and test sets.
+
+    Returns:
+        tuple: (train slice, test slice) to use with ``iloc``.
+
+    Raises:
+        ValueError: If no training rows are left.
+    """
+    test_rows = int(round(n_samples * test_size)) if isinstance(test_size, float) else int(test_size)
+    test_start = n_samples - test_rows
+    train_stop = test_start - gap
+    if train_stop <= 0 or test_rows <= 0:
+        raise ValueError(f"Cannot split {n_samples} rows into {test_rows} test rows after a gap of {gap}.")
+    return slice(0, train_stop), slice(test_start, n_samples)
+
+
+def _rows(data, rows):
+    # Slicing a frame or an array by position returns a view, not a copy
+    return data.iloc[rows] if hasattr(data, "iloc") else data[rows]
+
+
+def evaluate_fold(estimator, X, y, fold, train, test):
+    """
+    Fit a clone of the estimator on the training rows of a fold and score it on the test rows.
+
+    Given a ``FeatureMatrix``, the fold is fitted through ``FeatureMatrix.fit`` (XGBoost reuses the
+    cached QuantileDMatrix of the window) and the labels come from the matrix. A weighted matrix is fitted and
+    scored with its sample weights, so the metrics of a downsampled training set reflect the full one.
+
+    Args:
+        estimator: Unfitted scikit-learn compatible estimator.
+        X (FeatureMatrix, pd.DataFrame or np.ndarray): Feature matrix.
+        y (pd.Series or np.ndarray): Labels; ignored for a ``FeatureMatrix``.
+        fold (int): Fold number, copied into the result.
+        train (slice): Training rows.
+        test (slice): Test rows.
+
+    Returns:
+        dict: The fold's windows, metrics and fit/predict timings.
+    """
+    start = time.perf_counter()
+    if isinstance(X, FeatureMatrix):
+        model = X.fit(clone(estimator), train)
+    else:
+        model = clone(estimator)
+        model.fit(_rows(X, train), _rows(y, train))
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = X.predict(model, test) if isinstance(X, FeatureMatrix) else model.predict(_rows(X, test))
+    predict_seconds = time.perf_counter() - start
+    y_test = X.labels[test] if isinstance(X, FeatureMatrix) else np.asarray(_rows(y, test))
+    weights = X.weights(test) if isinstance(X, FeatureMatrix) else None
+
+    return {
+        "fold": fold,
+        "train_start": train.start,
+        "train_stop": train.stop,
+        "test_start": test.start,
+        "test_stop": test.stop,
+        "accuracy": float(accuracy_score(y_test, y_pred, sample_weight=weights)),
+        "f1_macro": float(f1_score(y_test, y_pred, average="macro", zero_division=0, sample_weight=weights)),
+        "precision_macro": float(precision_score(y_test, y_pred, average="macro", zero_division=0, sample_weight=weights)),
+        "recall_macro": float(recall_score(y_test, y_pred, average="macro", zero_division=0, sample_weight=weights)),
+        "fit_seconds": fit_seconds,
+        "predict_seconds": predict_seconds,
+    }
+
+
+class WalkForwardCV:
+    """
+    Walk-forward cross-validation for time series.
+
+    The test windows are consecutive blocks at the end of the data; every fold trains only on rows before its
+    test window. Between the two, ``purge`` rows are removed because their labels look ahead into the test
+    window (set it to the labeling horizon), and ``embargo`` further rows are skipped to let serial correlation
+    decay.
+    """
+
+    def __init__(self, n_splits=5, test_size=None, train_size=None, purge=0, embargo=0):
+        """
+        Initialize the WalkForwardCV.
+
+        Args:
+            n_splits (int): Number of folds.
+            test_size (int): Rows per test window. Defaults to an equal share of the data per fold.
+            train_size (int): Rows per training window (rolling window). None trains on all earlier rows
+                (expanding window).
+            purge (int): Rows removed before each test window because their labels overlap it.
+            embargo (int): Extra rows skipped between each training and test window.
+        """
+        if n_splits < 1:
+            raise ValueError("n_splits must be at least 1.")
+        self.n_splits = n_splits
+        self.test_size = test_size
+        self.train_size = train_size
+        self.purge = purge
+        self.embargo = embargo
+
+    @classmethod
+    def from_config(cls, validation_config, purge=0):
+        """
+        Create a WalkForwardCV from the ``validation`` section of a model config.
+
+        Args:
+            validation_config (dict): Optional ``n_splits``, ``test_size``, ``train_size`` and ``embargo``.
+            purge (int): Labeling horizon, used unless the config sets ``purge`` itself.
+
+        Returns:
+            WalkForwardCV: The splitter.
+        """
+        return cls(
+            n_splits=validation_config.get("n_splits", 5),
+            test_size=validation_config.get("test_size"),
+            train_size=validation_config.get("train_size"),
+            purge=validation_config.get("purge", purge),
+            embargo=validation_config.get("embargo", 0),
+        )
+
+    def split(self, n_samples):
+        """
+        Compute the folds.
+
+        Args:
+            n_samples (int): Number of rows.
+
+        Returns:
+            list: (train slice, test slice) pairs, oldest fold first.
+
+        Raises:
+            ValueError: If the first fold would have no training rows.
+        """
+        gap = self.purge + self.embargo
+        test_size = self.test_size or (n_samples - gap) // (self.n_splits + 1)
+        folds = []
+        for fold in range(self.n_splits):
+            test_start = n_samples - (self.n_splits - fold) * test_size
+            train_stop = test_start - gap
+            train_start = 0 if self.train_size is None else max(0, train_stop - self.train_size)
+            if test_size <= 0 or train_stop <= train_start:
+                raise ValueError(
+                    f"{n_samples} rows are too few for {self.n_splits} folds of {test_size} test rows with a gap of {gap}."
+                )
+            folds.append((slice(train_start, train_stop), slice(test_start, test_start + test_size)))
+        return folds
+
+    def evaluate(self, estimator, X, y, n_jobs=-1):
+        """
+        Fit and score a fresh clone of the estimator on every fold, running the folds in parallel.
+
+        The folds run in worker processes that share one memory-mapped copy of ``X`` and slice their windows
+        out of it. The ``n_jobs`` cores are split between the folds by setting the estimator's ``n_jobs`` when it
+        has one.
+
+        Args:
+            estimator: Unfitted scikit-learn compatible estimator.
+            X (FeatureMatrix, pd.DataFrame or np.ndarray): Feature matrix in time order.
+            y (pd.Series or np.ndarray): Labels; ignored for a ``FeatureMatrix``.
+            n_jobs (int): Number of folds to run at once; -1 uses all cores.
+
+        Returns:
+            dict: ``folds`` (metrics and timings per fold), ``mean`` and ``std`` of each metric across folds,
+            and ``wall_seconds``.
+        """
+        try:
+            folds = self.split(len(X))
+            concurrent = min(effective_n_jobs(n_jobs), len(folds))
+            if concurrent > 1 and "n_jobs" in estimator.get_params():
+                estimator = clone(estimator).set_params(n_jobs=max(1, effective_n_jobs(n_jobs) // concurrent))
+
+            start = time.perf_counter()
+            results = Parallel(n_jobs=concurrent, backend="loky", max_nbytes="1M", mmap_mode="r")(
+                delayed(evaluate_fold)(estimator, X, y, fold, train, test) for fold, (train, test) in enumerate(folds)
+            )
+            wall_seconds = time.perf_counter() - start
+
+            metrics = ["accuracy", "f1_macro", "precision_macro", "recall_macro"]
+            summary = {
+                "folds": results,
+                "mean": {metric: float(np.mean([fold[metric] for fold in results])) for metric in metrics},
+                "std": {metric: float(np.std([fold[metric] for fold in results])) for metric in metrics},
+                "wall_seconds": wall_seconds,
+            }
+            logging.info(f"Walk-forward CV over {len(folds)} folds in {wall_seconds:.2f}s: {summary['mean']}")
+            return summary
+        except Exception as e:
+            logging.error("Error running walk-forward cross-validation", exc_info=True)
+            raise e
@@ -0,0 +1,89 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .indicator_kernels import as_float_array
+
+
+def window_matrix(values, window):
+    """
+    Trailing windows of a series as an (n, window) strided view.
+
+    Row ``t`` holds ``values[t - window + 1] ... values[t]``; rows reaching before the start of the series
+    are NaN-padded. Only the padded copy of the source is allocated, every window is a view into it.
+
+    Args:
+        values (array-like): Input series.
+        window (int): Number of observations per window.
+
+    Returns:
+        np.ndarray: Read-only (n, window) view, oldest observation first.
+    """
+    values = as_float_array(values)
+    padded = np.empty(len(values) + window - 1, dtype=np.float64)
+    padded[:window - 1] = np.nan
+    padded[window - 1:] = values
+    return sliding_window_view(padded, window)
+
+
+def lag_matrix(values, lags):
+    """
+    Lagged copies of a series as an (n, lags) strided view, column ``j`` holding lag ``j + 1``.
+
+    Args:
+        values (array-like): Input series.
+        lags (int): Deepest lag.
+
+    Returns:
+        np.ndarray: Read-only view equivalent to ``[shift(1), ..., shift(lags)]``.
+    """
+    return window_matrix(values, lags + 1)[:, ::-1][:, 1:]
+
+
+def rolling_returns(values, periods, lags=None, out=None):
+    """
+    Simple returns over several horizons, ``values[t] / values[t - p] - 1`` for each ``p``.
+
+    Args:
+        values (array-like): Input series.
+        periods (list): Return horizons in rows.
+        lags (np.ndarray): Optional lag view from ``lag_matrix`` to reuse, deep enough for ``max(periods)``.
+        out (np.ndarray): Optional preallocated (n, len(periods)) output buffer.
+
+    Returns:
+        np.ndarray: (n, len(periods)) array of returns.
+    """
+    values = as_float_array(values)
+    if lags is None:
+        lags = lag_matrix(values, max(periods))
+    if out is None:
+        out = np.empty((len(values), len(periods)), dtype=np.float64, order="F")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for j, period in enumerate(periods):
+            np.divide(values, lags[:, period - 1], out=out[:, j])
+            out[:, j] -= 1.0
+    return out
+
+
+def rolling_differences(values, periods, lags=None, out=None):
+    """
+    Differences over several horizons, ``values[t] - values[t - p]`` for each ``p``.
+
+    Args:
+        values (array-like): Input series.
+        periods (list): Difference horizons in rows.
+        lags (np.ndarray): Optional lag view from ``lag_matrix`` to reuse, deep enough for ``max(periods)``.
+        out (np.ndarray): Optional preallocated (n, len(periods)) output buffer.
+
+    Returns:
+        np.ndarray: (n, len(periods)) array of differences.
+    """
+    values = as_float_array(values)
+    if lags is None:
+        lags = lag_matrix(values, max(periods))
+    if out is None:
+        out = np.empty((len(values), len(periods)), dtype=np.float64, order="F")
+
+    for j, period in enumerate(periods):
+        np.subtract(values, lags[:, period - 1], out=out[:, j])
+    return out
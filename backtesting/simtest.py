@@ -1,6 +1,8 @@
 import backtrader as bt
+import numpy as np
 import pandas as pd
-import joblib
+from aimodel.compiled_trees import CompiledEnsemble
+from aimodel.model_registry import ModelRegistry
 from datetime import datetime
 import os
 import csv
@@ -29,12 +31,19 @@ class CustomPandasData(bt.feeds.PandasData):
 # Backtrader Strategy
 class MLStrategy(bt.Strategy):
     params = (
-        ('model_path', os.path.join(MODEL_DIR, f"{MODEL_TYPE}_model.joblib")),
+        ('model_name', MODEL_TYPE),
+        ('model_version', None),  # None loads the latest version
     )
 
     def __init__(self):
-        # Load the pre-trained model
-        self.model = joblib.load(self.params.model_path)
+        # Load the pre-trained model from the registry
+        registry = ModelRegistry(MODEL_DIR)
+        self.model, _ = registry.load(self.params.model_name, self.params.model_version)
+        # Compiled tree ensembles predict one bar without the estimator's per-call validation overhead
+        try:
+            self.predictor, _ = registry.load_compiled(self.params.model_name, self.params.model_version)
+        except FileNotFoundError:
+            self.predictor = self.model
 
         # Signal counters
         self.signal_counts = {
@@ -139,13 +148,16 @@ class MLStrategy(bt.Strategy):
             print("Skipping due to missing data")
             return
 
-        # Convert to DataFrame for prediction
+        # Convert to model inputs: a plain row for the compiled predictor, a DataFrame for the estimator
         feature_columns = ["open", "high", "low", "close", "volume", "RSI_14", "MACD", "Signal_Line", 
                         "close_lag_1", "close_lag_2", "volume_lag_1", "volume_lag_2"]
-        features = pd.DataFrame([row])[feature_columns]
+        if isinstance(self.predictor, CompiledEnsemble):
+            features = np.array([row[column] for column in feature_columns], dtype=np.float32)
+        else:
+            features = pd.DataFrame([row])[feature_columns]
 
         # Predict trading signal
-        signal = self.model.predict(features)[0]
+        signal = self.predictor.predict(features)[0]
         print(f"Predicted Signal: {signal}")
         self.signal_counts[signal] += 1
 
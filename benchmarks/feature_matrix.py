@@ -0,0 +1,97 @@
+"""
+Peak RSS and fit time of walk-forward XGBoost trials on the float64 training frame against the float32
+FeatureMatrix with cached QuantileDMatrix windows.
+
+The candidates differ only in their learning rate, so every trial grows the same small trees, as in the first
+rungs of a search, and the difference between the variants is the data path. Deep boosters spend most of
+their fit growing trees and gain proportionally less.
+
+Each variant runs in a fresh interpreter so the ``ru_maxrss`` high-water mark belongs to it alone.
+
+    python -m benchmarks.feature_matrix [--rows 300000] [--candidates 4]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from aimodel.data_preparation_pipeline import DataPreparationPipeline, map_labels
+from aimodel.feature_engine import FeatureEngine, TRAINING_FEATURES_CONFIG
+from aimodel.feature_matrix import FeatureMatrix
+from aimodel.labeling_engine import LabelingEngine
+from aimodel.model_engine import ModelEngine
+from aimodel.time_series_cv import WalkForwardCV, evaluate_fold
+from benchmarks.feature_memory import _current_rss_bytes, _peak_rss_bytes, synthetic_ohlcv
+
+LEARNING_RATES = [0.05, 0.1, 0.2, 0.3, 0.02, 0.15, 0.25, 0.01]
+LABEL_CONFIG = {"method": "Next-Step Classification", "params": {"horizon": 5, "threshold": 0.0005, "threshold_type": "percent"}}
+
+
+def _run_variant(variant, rows, candidates):
+    labeled = LabelingEngine(LABEL_CONFIG).apply_labeling_strategy(
+        FeatureEngine(TRAINING_FEATURES_CONFIG).compute(synthetic_ohlcv(rows))
+    ).reset_index(drop=True)
+    # The bar time was a float64 model input before the FeatureMatrix
+    labeled["time"] = labeled["close_time"].astype("int64") // 10**6
+    feature_columns = DataPreparationPipeline._feature_columns(labeled)
+    y = map_labels(labeled["label"].astype(int))
+    estimators = [ModelEngine.from_params("xgboost", {"n_estimators": 20, "max_depth": 4, "learning_rate": learning_rate, "n_jobs": 1}).create_model()
+                  for learning_rate in LEARNING_RATES[:candidates]]
+    folds = WalkForwardCV(n_splits=5, purge=LabelingEngine(LABEL_CONFIG).label_horizon()).split(len(labeled))
+
+    before = _current_rss_bytes()
+    start = time.perf_counter()
+    if variant == "frame":
+        X = labeled[feature_columns + ["time"]]
+        results = [evaluate_fold(estimator, X, y, fold, train, test)
+                   for estimator in estimators for fold, (train, test) in enumerate(folds)]
+    else:
+        matrix = FeatureMatrix.from_frame(labeled, feature_columns, y)
+        results = [evaluate_fold(estimator, matrix, None, fold, train, test)
+                   for estimator in estimators for fold, (train, test) in enumerate(folds)]
+    wall_seconds = time.perf_counter() - start
+    after = _peak_rss_bytes()
+    return {
+        "variant": variant,
+        "fits": len(results),
+        "wall_seconds": wall_seconds,
+        "fit_seconds": sum(result["fit_seconds"] for result in results),
+        "accuracy": float(np.mean([result["accuracy"] for result in results])),
+        "peak_rss": after,
+        "peak_delta": after - before,
+    }
+
+
+def measure(variant, rows, candidates):
+    """
+    Measure one variant (``"frame"`` or ``"matrix"``) in a subprocess.
+
+    Returns:
+        dict: Number of fits, wall and summed fit seconds, mean fold accuracy, peak RSS and its growth above
+        the resident set before the trials, in bytes.
+    """
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.feature_matrix", "--variant", variant, "--rows", str(rows), "--candidates", str(candidates)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--variant", choices=["frame", "matrix"])
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--candidates", type=int, default=4, choices=range(1, len(LEARNING_RATES) + 1))
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(_run_variant(args.variant, args.rows, args.candidates)))
+    else:
+        print(f"{'variant':<8} {'fits':>5} {'wall s':>8} {'fit s':>8} {'accuracy':>9} {'peak RSS MiB':>13} {'delta MiB':>10}")
+        for variant in ("frame", "matrix"):
+            stats = measure(variant, args.rows, args.candidates)
+            print(f"{variant:<8} {stats['fits']:>5} {stats['wall_seconds']:>8.2f} {stats['fit_seconds']:>8.2f} {stats['accuracy']:>9.4f} "
+                  f"{stats['peak_rss'] / 2**20:>13.1f} {stats['peak_delta'] / 2**20:>10.1f}")
@@ -0,0 +1,117 @@
+"""
+Peak RSS of the training feature pipeline on a year of synthetic 1m bars.
+
+Each variant runs in a fresh interpreter so the ``ru_maxrss`` high-water mark belongs to it alone.
+
+    python -m benchmarks.feature_memory
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+YEAR_OF_1M_BARS = 365 * 24 * 60
+
+
+def synthetic_ohlcv(rows, seed=42):
+    """
+    Build a random-walk OHLCV frame in the shape produced by ``process_dataframe``.
+    """
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 1e-3, rows)))
+    spread = np.abs(rng.normal(0, 5e-4, rows)) * close
+    open_time = 1_600_000_000_000 + np.arange(rows, dtype=np.int64) * 60_000
+    return pd.DataFrame({
+        "open_time": pd.to_datetime(open_time, unit="ms"),
+        "open": np.roll(close, 1),
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.gamma(2.0, 10.0, rows),
+        "close_time": pd.to_datetime(open_time + 59_999, unit="ms"),
+    })
+
+
+def legacy_add_technical_indicators(df):
+    """
+    The pre-FeatureEngine training pipeline (chained copies and per-column shifts), kept as the baseline.
+    """
+    df = df.copy()
+
+    delta = df['close'].diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    avg_gain = gain.rolling(window=14, min_periods=14).mean()
+    avg_loss = loss.rolling(window=14, min_periods=14).mean()
+    df['RSI_14'] = 100 - (100 / (1 + avg_gain / avg_loss))
+
+    ema_12 = df['close'].ewm(span=12, adjust=False).mean()
+    ema_26 = df['close'].ewm(span=26, adjust=False).mean()
+    df['MACD'] = ema_12 - ema_26
+    df['Signal_Line'] = df['MACD'].ewm(span=9, adjust=False).mean()
+
+    for column in ['close', 'volume']:
+        for lag in range(1, 3):
+            df[f"{column}_lag_{lag}"] = df[column].shift(lag)
+
+    return df.dropna()
+
+
+def _peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _current_rss_bytes():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return _peak_rss_bytes()
+
+
+def _run_variant(variant, rows):
+    from training.data_processing import add_technical_indicators
+
+    df = synthetic_ohlcv(rows)
+    before = _current_rss_bytes()
+    if variant == "legacy":
+        result = legacy_add_technical_indicators(df)
+    else:
+        result = add_technical_indicators(df)
+    after = _peak_rss_bytes()
+    return {"variant": variant, "rows": len(result), "baseline_rss": before, "peak_rss": after, "peak_delta": after - before}
+
+
+def measure(variant, rows=YEAR_OF_1M_BARS):
+    """
+    Measure one variant (``"legacy"`` or ``"engine"``) in a subprocess.
+
+    Returns:
+        dict: Row count, resident set before the feature step, peak RSS and the growth above the starting resident set, in bytes.
+    """
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.feature_memory", "--variant", variant, "--rows", str(rows)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--variant", choices=["legacy", "engine"])
+    parser.add_argument("--rows", type=int, default=YEAR_OF_1M_BARS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(_run_variant(args.variant, args.rows)))
+    else:
+        print(f"{'variant':<8} {'rows':>9} {'peak RSS MiB':>13} {'delta MiB':>10}")
+        for variant in ("legacy", "engine"):
+            stats = measure(variant, args.rows)
+            print(f"{variant:<8} {stats['rows']:>9} {stats['peak_rss'] / 2**20:>13.1f} {stats['peak_delta'] / 2**20:>10.1f}")
@@ -0,0 +1,82 @@
+"""
+Incremental retraining against a full rebuild, one simulated day of new 1m bars at a time: retrain time and
+accuracy on the following day.
+
+    python -m benchmarks.incremental_training [--rows 200000] [--days 5]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from aimodel.data_preparation_pipeline import DataPreparationPipeline, map_labels
+from aimodel.feature_engine import FeatureEngine, TRAINING_FEATURES_CONFIG
+from aimodel.incremental_training import continue_training
+from aimodel.labeling_engine import LabelingEngine
+from aimodel.model_engine import ModelEngine
+from benchmarks.feature_memory import synthetic_ohlcv
+
+DAY_OF_1M_BARS = 24 * 60
+LABEL_CONFIG = {"method": "Next-Step Classification", "params": {"horizon": 5, "threshold": 0.0005, "threshold_type": "percent"}}
+MODELS = [
+    ("xgboost", {"n_estimators": 200, "max_depth": 6}, 20),
+    ("randomForest", {"n_estimators": 100, "min_samples_leaf": 20, "n_jobs": -1}, 10),
+    ("sgdClassifier", {"loss": "log_loss", "random_state": 42}, None),
+]
+
+
+def labeled_frame(rows):
+    """
+    Synthetic bars with the training features and next-step labels, mapped to 0..2.
+    """
+    df = FeatureEngine(TRAINING_FEATURES_CONFIG).compute(synthetic_ohlcv(rows))
+    labeled = LabelingEngine(LABEL_CONFIG).apply_labeling_strategy(df).reset_index(drop=True)
+    return labeled[DataPreparationPipeline._feature_columns(labeled)], map_labels(labeled["label"].astype(int))
+
+
+def run(rows, days):
+    """
+    Train every model on ``rows`` bars, then add ``days`` days of bars one day at a time, updating one copy
+    incrementally and rebuilding another from scratch; both are scored on the day after each update.
+
+    Returns:
+        list: Rows of (model, mean incremental seconds, mean full rebuild seconds, mean incremental accuracy,
+        mean full rebuild accuracy).
+    """
+    X, y = labeled_frame(rows + (days + 1) * DAY_OF_1M_BARS)
+    horizon = LabelingEngine(LABEL_CONFIG).label_horizon()
+    results = []
+    for method, params, n_estimators in MODELS:
+        incremental = ModelEngine.from_params(method, params).create_model().fit(X.iloc[:rows], y.iloc[:rows])
+        timings = {"incremental": [], "full": []}
+        accuracy = {"incremental": [], "full": []}
+        for day in range(days):
+            start, stop = rows + day * DAY_OF_1M_BARS, rows + (day + 1) * DAY_OF_1M_BARS
+            X_next, y_next = X.iloc[stop + horizon:stop + horizon + DAY_OF_1M_BARS], y.iloc[stop + horizon:stop + horizon + DAY_OF_1M_BARS]
+
+            began = time.perf_counter()
+            incremental = continue_training(incremental, X.iloc[start:stop], y.iloc[start:stop], n_estimators=n_estimators)
+            timings["incremental"].append(time.perf_counter() - began)
+
+            began = time.perf_counter()
+            full = ModelEngine.from_params(method, params).create_model().fit(X.iloc[:stop], y.iloc[:stop])
+            timings["full"].append(time.perf_counter() - began)
+
+            accuracy["incremental"].append(float((incremental.predict(X_next) == y_next).mean()))
+            accuracy["full"].append(float((full.predict(X_next) == y_next).mean()))
+        results.append((method, np.mean(timings["incremental"]), np.mean(timings["full"]),
+                        np.mean(accuracy["incremental"]), np.mean(accuracy["full"])))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.rows} initial rows, {args.days} days of {DAY_OF_1M_BARS} new rows")
+    print(f"{'model':<15} {'incr s':>8} {'full s':>8} {'speedup':>8} {'incr acc':>9} {'full acc':>9} {'drift':>7}")
+    for method, incremental_time, full_time, incremental_accuracy, full_accuracy in run(args.rows, args.days):
+        print(f"{method:<15} {incremental_time:>8.2f} {full_time:>8.2f} {full_time / incremental_time:>7.0f}x "
+              f"{incremental_accuracy:>9.4f} {full_accuracy:>9.4f} {incremental_accuracy - full_accuracy:>+7.4f}")
@@ -0,0 +1,80 @@
+"""
+NumPy indicator kernels against TA-Lib: time per call and largest deviation for every indicator.
+
+    python -m benchmarks.indicator_kernels [--rows 1000000] [--repeat 5]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from aimodel import indicator_kernels as kernels
+from aimodel import rolling_kernels
+from benchmarks.feature_memory import synthetic_ohlcv
+
+try:
+    import talib
+except ImportError:
+    talib = None
+
+
+def cases(df):
+    """
+    (indicator, NumPy kernel, TA-Lib callable) triples; each callable returns a tuple of output arrays.
+    """
+    high, low, close = (df[column].to_numpy() for column in ("high", "low", "close"))
+    return [
+        ("RSI", lambda: (kernels.rsi(close, 14, smoothing="wilder"),), lambda: (talib.RSI(close, 14),)),
+        ("SMA", lambda: (kernels.rolling_mean(close, 20),), lambda: (talib.SMA(close, 20),)),
+        ("EMA", lambda: (kernels.ema(close, 20, seed="sma"),), lambda: (talib.EMA(close, 20),)),
+        ("MACD", lambda: tuple(kernels.macd(close, 12, 26, 9, seed="sma").T), lambda: talib.MACD(close, 12, 26, 9)[:2]),
+        ("ATR", lambda: (kernels.atr(high, low, close, 14),), lambda: (talib.ATR(high, low, close, 14),)),
+        ("STOCH", lambda: tuple(rolling_kernels.stoch(high, low, close, 14, 3, 0, 3, 0).T),
+         lambda: talib.STOCH(high, low, close, 14, 3, 0, 3, 0)),
+        ("BBANDS", lambda: tuple(rolling_kernels.bollinger_bands(close, 20, 2, 2, 0).T),
+         lambda: talib.BBANDS(close, 20, 2, 2, 0)),
+        ("PPO", lambda: (kernels.ppo(close, 12, 26, 1),), lambda: (talib.PPO(close, 12, 26, 1),)),
+    ]
+
+
+def _best_time(function, repeat):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(rows, repeat=5):
+    """
+    Time every kernel and, when TA-Lib is installed, its TA-Lib counterpart.
+
+    Returns:
+        list: Rows of (indicator, kernel seconds, TA-Lib seconds or None, max abs deviation or None).
+    """
+    results = []
+    for name, kernel, reference in cases(synthetic_ohlcv(rows)):
+        kernel_time, actual = _best_time(kernel, repeat)
+        if talib is None:
+            results.append((name, kernel_time, None, None))
+            continue
+        talib_time, expected = _best_time(reference, repeat)
+        deviation = max(np.nanmax(np.abs(a - e)) for a, e in zip(actual, expected))
+        results.append((name, kernel_time, talib_time, deviation))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"{'indicator':<10} {'numpy ms':>9} {'talib ms':>9} {'ratio':>7} {'max abs diff':>13}")
+    for name, kernel_time, talib_time, deviation in run(args.rows, args.repeat):
+        if talib_time is None:
+            print(f"{name:<10} {kernel_time * 1e3:>9.2f} {'-':>9} {'-':>7} {'-':>13}")
+        else:
+            print(f"{name:<10} {kernel_time * 1e3:>9.2f} {talib_time * 1e3:>9.2f} {kernel_time / talib_time:>6.2f}x {deviation:>13.2e}")
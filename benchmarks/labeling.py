@@ -0,0 +1,164 @@
+"""
+Vectorized labeling kernels against the previous row-wise ``.apply`` implementations (and against a
+per-row loop for the path-dependent triple barrier).
+
+    python -m benchmarks.labeling [--rows 1000000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from aimodel.labeling_engine import LabelingEngine
+from benchmarks.feature_memory import synthetic_ohlcv
+from training.labeling import add_future_close_and_multiclass_label
+
+BUY_SIGNAL, SELL_SIGNAL, HOLD_SIGNAL = 1, -1, 0
+
+
+def legacy_next_step_classification(df, horizon, threshold, threshold_type):
+    """
+    ``LabelingEngine._next_step_classification`` before vectorization.
+    """
+    df = df.copy()
+    future_close = df["close"].shift(-horizon)
+
+    if threshold_type == "percent":
+        pct_change = (future_close - df["close"]) / df["close"]
+        df["label"] = pct_change.apply(lambda x: BUY_SIGNAL if x > threshold else (SELL_SIGNAL if x < -threshold else HOLD_SIGNAL))
+    else:
+        df["label"] = (future_close - df["close"]).apply(lambda x: BUY_SIGNAL if x > threshold else (SELL_SIGNAL if x < -threshold else HOLD_SIGNAL))
+
+    return df.dropna()
+
+
+def legacy_multi_class_trend_labeling(df, timeHorizon, bins, bin_labels):
+    """
+    ``LabelingEngine._multi_class_trend_labeling`` before vectorization.
+    """
+    df = df.copy()
+    future_close = df["close"].shift(-timeHorizon)
+    pct_change = (future_close - df["close"]) / df["close"]
+    df["label"] = pd.cut(pct_change, bins=bins, labels=bin_labels)
+    return df.dropna()
+
+
+def naive_triple_barrier_labeling(df, upper_barrier, lower_barrier, maxTime):
+    """
+    Path-dependent triple barrier scanning each row's window in a Python loop, the O(n * maxTime) reference
+    for ``LabelingEngine._triple_barrier_labeling``.
+    """
+    close, high, low = (df[column].to_numpy() for column in ("close", "high", "low"))
+    rows = max(len(df) - maxTime, 0)
+    label = np.full(rows, HOLD_SIGNAL, dtype=np.int8)
+    touch_bars = np.full(rows, maxTime, dtype=np.int64)
+    realized_return = np.empty(rows)
+    for t in range(rows):
+        upper, lower = close[t] * (1 + upper_barrier), close[t] * (1 - lower_barrier)
+        up = np.flatnonzero(high[t + 1:t + maxTime + 1] >= upper)
+        down = np.flatnonzero(low[t + 1:t + maxTime + 1] <= lower)
+        if len(down) and (not len(up) or down[0] <= up[0]):
+            label[t], touch_bars[t], realized_return[t] = SELL_SIGNAL, down[0] + 1, lower / close[t] - 1
+        elif len(up):
+            label[t], touch_bars[t], realized_return[t] = BUY_SIGNAL, up[0] + 1, upper / close[t] - 1
+        else:
+            realized_return[t] = (close[t + maxTime] - close[t]) / close[t]
+
+    touch_time = df["close_time"].to_numpy()[np.arange(rows) + touch_bars]
+    df = df.iloc[:rows].copy()
+    df["label"] = label
+    df["touch_bars"] = touch_bars
+    df["realized_return"] = realized_return
+    df["touch_time"] = touch_time
+    return df
+
+
+def legacy_regression_on_future_returns(df, lookahead, target_type):
+    """
+    ``LabelingEngine._regression_on_future_returns`` before vectorization.
+    """
+    df = df.copy()
+    future_close = df["close"].shift(-lookahead)
+    if target_type == "percentage":
+        df["predicted_return"] = (future_close - df["close"]) / df["close"]
+    else:
+        df["predicted_return"] = future_close - df["close"]
+
+    df["label"] = df["predicted_return"].apply(lambda x: BUY_SIGNAL if x > 0.01 else (SELL_SIGNAL if x < -0.01 else HOLD_SIGNAL))
+    return df.dropna()
+
+
+def legacy_add_future_close_and_multiclass_label(df, positive_threshold=0.09, negative_threshold=-0.09):
+    """
+    ``training.labeling.add_future_close_and_multiclass_label`` before vectorization, without the prints.
+    """
+    df = df.copy()
+    df['future_close'] = df['close'].shift(-1)
+    df['pct_change'] = (df['future_close'] - df['close']) / df['close'] * 100
+    df['label'] = df['pct_change'].apply(
+        lambda x: 2 if x > positive_threshold else (0 if x < negative_threshold else 1)
+    )
+    df = df.dropna()
+    return df.drop(columns=['pct_change'])
+
+
+LABEL_CONFIGS = [
+    ("next_step", {"method": "Next-Step Classification", "params": {"horizon": 5, "threshold": 0.001, "threshold_type": "percent"}},
+     legacy_next_step_classification),
+    ("multi_class_trend", {"method": "Multi-Class Trend Labeling", "params": {"timeHorizon": 10, "bins": [-1, -0.002, 0.002, 1], "bin_labels": [-1, 0, 1]}},
+     legacy_multi_class_trend_labeling),
+    ("triple_barrier", {"method": "Triple-Barrier Labeling", "params": {"upper_barrier": 0.002, "lower_barrier": 0.002, "maxTime": 10}},
+     naive_triple_barrier_labeling),
+    ("regression", {"method": "Regression on Future Returns", "params": {"lookahead": 20, "target_type": "percentage"}},
+     legacy_regression_on_future_returns),
+]
+
+
+def cases(df):
+    """
+    (name, vectorized callable, legacy callable) triples over the same frame.
+    """
+    results = []
+    for name, label_config, legacy in LABEL_CONFIGS:
+        engine = LabelingEngine(label_config)
+        results.append((name, lambda engine=engine: engine.apply_labeling_strategy(df),
+                        lambda legacy=legacy, params=label_config["params"]: legacy(df, **params)))
+    results.append(("training_multiclass", lambda: add_future_close_and_multiclass_label(df, label_dtype=np.int8),
+                    lambda: legacy_add_future_close_and_multiclass_label(df)))
+    return results
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def run(rows):
+    """
+    Time every labeling method against its legacy implementation.
+
+    Returns:
+        list: Rows of (method, vectorized seconds, legacy seconds, label column MiB, legacy label column MiB).
+    """
+    results = []
+    for name, vectorized, legacy in cases(synthetic_ohlcv(rows)):
+        vectorized_time, labeled = _timed(vectorized)
+        legacy_time, legacy_labeled = _timed(legacy)
+        results.append((
+            name, vectorized_time, legacy_time,
+            labeled["label"].memory_usage(index=False) / 2 ** 20, legacy_labeled["label"].memory_usage(index=False) / 2 ** 20,
+        ))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows")
+    print(f"{'method':<20} {'kernel ms':>10} {'legacy ms':>10} {'speedup':>8} {'label MiB':>10} {'legacy MiB':>11}")
+    for name, vectorized_time, legacy_time, label_mib, legacy_mib in run(args.rows):
+        print(f"{name:<20} {vectorized_time * 1e3:>10.1f} {legacy_time * 1e3:>10.1f} {legacy_time / vectorized_time:>7.0f}x {label_mib:>10.2f} {legacy_mib:>11.2f}")
@@ -0,0 +1,139 @@
+"""
+Peak RSS and fit time of training on a columnar feature store out of core against loading it into memory, on
+growing histories of synthetic 1m bars (5M rows, about ten years, by default).
+
+The store is built once per length; each variant then runs in a fresh interpreter so the ``ru_maxrss``
+high-water mark belongs to it alone. Out-of-core RSS should stay flat as the history grows, in-memory RSS grows
+with it.
+
+    python -m benchmarks.out_of_core [--rows 1000000 5000000] [--memory-budget-mb 256]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from aimodel.columnar_store import ColumnarStore
+from aimodel.feature_engine import FeatureEngine, TRAINING_FEATURES_CONFIG
+from benchmarks.feature_memory import _current_rss_bytes, _peak_rss_bytes, synthetic_ohlcv
+
+LABEL_CONFIG = {"method": "Next-Step Classification", "params": {"horizon": 5, "threshold": 0.0005, "threshold_type": "percent"}}
+XGBOOST_PARAMS = {"n_estimators": 20, "max_depth": 6, "tree_method": "hist"}
+VARIANTS = ["in_memory", "external_memory", "partial_fit"]
+# Bars generated and featurized per step while the store is built
+BUILD_CHUNK_ROWS = 500_000
+
+
+def build_store(path, rows):
+    """
+    Stream ``rows`` synthetic bars with the training features into a columnar store, one chunk at a time.
+    """
+    store = ColumnarStore(path)
+    store.clear()
+    engine = FeatureEngine(TRAINING_FEATURES_CONFIG)
+
+    def chunks():
+        price = 1.0
+        for i, start in enumerate(range(0, rows, BUILD_CHUNK_ROWS)):
+            df = synthetic_ohlcv(min(BUILD_CHUNK_ROWS, rows - start), seed=i)
+            # Continue the random walk and the clock of the previous chunk
+            df[["open", "high", "low", "close"]] *= price
+            price = df["close"].iloc[-1] / 30000
+            df[["open_time", "close_time"]] += np.timedelta64(start, "m")
+            yield df
+
+    for features in engine.compute_chunks(chunks()):
+        store.append(features)
+    return store
+
+
+def _run_variant(variant, store_path, memory_budget_mb):
+    from sklearn.linear_model import SGDClassifier
+    from xgboost import XGBClassifier
+
+    from aimodel.data_preparation_pipeline import DataPreparationPipeline
+    from aimodel.feature_matrix import FeatureMatrix
+    from aimodel.labeling_engine import LabelingEngine
+    from aimodel.out_of_core import StoreChunks, chunk_rows_for_budget, train_out_of_core
+
+    store = ColumnarStore(store_path)
+    feature_columns = DataPreparationPipeline._feature_columns(store.read(stop=0))
+    mapping = {-1: 0, 0: 1, 1: 2}
+    before = _current_rss_bytes()
+    start = time.perf_counter()
+    if variant == "in_memory":
+        labeled = LabelingEngine(LABEL_CONFIG).apply_labeling_strategy(store.read())
+        matrix = FeatureMatrix.from_frame(labeled, feature_columns, labeled["label"].map(mapping))
+        del labeled
+        XGBClassifier(**XGBOOST_PARAMS).fit(matrix.frame(), matrix.labels)
+        rows = len(matrix)
+    else:
+        chunk_rows = chunk_rows_for_budget(len(store.columns), memory_budget_mb)
+        if variant == "external_memory":
+            chunks = StoreChunks(store, feature_columns, LABEL_CONFIG, chunk_rows, label_mapping=mapping)
+            estimator = XGBClassifier(**XGBOOST_PARAMS)
+        else:
+            chunks = StoreChunks(store, feature_columns, LABEL_CONFIG, chunk_rows)
+            estimator = SGDClassifier(loss="log_loss", random_state=42)
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(store_path)) as cache_dir:
+            train_out_of_core(estimator, chunks, cache_dir=cache_dir)
+        rows = chunks.labeled_rows
+    fit_seconds = time.perf_counter() - start
+    after = _peak_rss_bytes()
+    return {"variant": variant, "rows": rows, "fit_seconds": fit_seconds, "baseline_rss": before, "peak_rss": after, "peak_delta": after - before}
+
+
+def measure(variant, store_path, memory_budget_mb=256):
+    """
+    Measure one variant (see ``VARIANTS``) on an existing store in a subprocess.
+
+    Returns:
+        dict: Training rows, fit seconds, resident set before training, peak RSS and the growth above the
+        starting resident set, in bytes.
+    """
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.out_of_core", "--variant", variant, "--store", store_path,
+         "--memory-budget-mb", str(memory_budget_mb)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(rows_list, memory_budget_mb=256, variants=VARIANTS):
+    """
+    Build a store of every length in ``rows_list`` and measure every variant on it.
+
+    Returns:
+        list: One result dict per (length, variant).
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in rows_list:
+            store_path = os.path.join(tmp, f"store_{rows}")
+            build_store(store_path, rows)
+            for variant in variants:
+                results.append(measure(variant, store_path, memory_budget_mb))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--variant", choices=VARIANTS)
+    parser.add_argument("--store")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--memory-budget-mb", type=float, default=256)
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=VARIANTS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(_run_variant(args.variant, args.store, args.memory_budget_mb)))
+    else:
+        print(f"{'variant':<16} {'rows':>9} {'fit s':>8} {'peak RSS MiB':>13} {'delta MiB':>10}")
+        for stats in run(args.rows, args.memory_budget_mb, args.variants):
+            print(f"{stats['variant']:<16} {stats['rows']:>9} {stats['fit_seconds']:>8.1f} "
+                  f"{stats['peak_rss'] / 2**20:>13.1f} {stats['peak_delta'] / 2**20:>10.1f}")
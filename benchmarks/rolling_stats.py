@@ -0,0 +1,89 @@
+"""
+O(n) rolling statistics kernels against naive ``Series.rolling(window).apply``.
+
+    python -m benchmarks.rolling_stats [--rows 20000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from aimodel import rolling_kernels
+from benchmarks.feature_memory import synthetic_ohlcv
+
+WINDOWS = (20, 200, 2000)
+
+
+def _zscore(x):
+    return (x[-1] - x.mean()) / x.std(ddof=1)
+
+
+def _skew(x):
+    n = len(x)
+    d = x - x.mean()
+    return np.sqrt(n * (n - 1)) / (n - 2) * (d ** 3).mean() / (d ** 2).mean() ** 1.5
+
+
+def _kurt(x):
+    n = len(x)
+    d = x - x.mean()
+    ratio = (d ** 4).mean() / (d ** 2).mean() ** 2
+    return (n + 1) * (n - 1) / ((n - 2) * (n - 3)) * ratio - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+
+
+def cases(df):
+    """
+    (name, O(n) kernel, naive rolling().apply callable) triples sharing the same input series.
+    """
+    close = df["close"].to_numpy()
+    volume = df["volume"].to_numpy()
+    returns = rolling_kernels.log_returns(close)
+    return_series = pd.Series(returns)
+    close_series = pd.Series(close)
+    weighted = pd.Series(np.r_[np.nan, close[1:] / close[:-1] - 1] * volume)
+    return [
+        ("zscore", lambda w: rolling_kernels.rolling_zscore(close, w),
+         lambda w: close_series.rolling(w).apply(_zscore, raw=True)),
+        ("realized_vol", lambda w: rolling_kernels.realized_volatility(close, w),
+         lambda w: return_series.rolling(w).apply(lambda x: np.sqrt((x ** 2).sum()), raw=True)),
+        ("skew", lambda w: rolling_kernels.rolling_skew(returns, w),
+         lambda w: return_series.rolling(w).apply(_skew, raw=True)),
+        ("kurtosis", lambda w: rolling_kernels.rolling_kurt(returns, w),
+         lambda w: return_series.rolling(w).apply(_kurt, raw=True)),
+        ("max_distance", lambda w: close / rolling_kernels.rolling_max(close, w) - 1,
+         lambda w: close_series.rolling(w).apply(lambda x: x[-1] / x.max() - 1, raw=True)),
+        ("vw_return", lambda w: rolling_kernels.volume_weighted_return(close, volume, w),
+         lambda w: weighted.rolling(w).apply(np.sum, raw=True) / pd.Series(volume).rolling(w).apply(np.sum, raw=True)),
+    ]
+
+
+def _timed(function, window):
+    start = time.perf_counter()
+    function(window)
+    return time.perf_counter() - start
+
+
+def run(rows):
+    """
+    Time every kernel and its naive equivalent at each window.
+
+    Returns:
+        list: Rows of (statistic, window, kernel seconds, naive seconds).
+    """
+    results = []
+    for name, kernel, naive in cases(synthetic_ohlcv(rows)):
+        for window in WINDOWS:
+            results.append((name, window, _timed(kernel, window), _timed(naive, window)))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows")
+    print(f"{'statistic':<14} {'window':>6} {'kernel ms':>10} {'naive ms':>10} {'speedup':>8}")
+    for name, window, kernel_time, naive_time in run(args.rows):
+        print(f"{name:<14} {window:>6} {kernel_time * 1e3:>10.2f} {naive_time * 1e3:>10.1f} {naive_time / kernel_time:>7.0f}x")
@@ -0,0 +1,63 @@
+"""
+Wall time of training the ``training.main_predict`` models one after another, each with its default thread
+count, against the concurrent core-budget scheduler.
+
+    python -m benchmarks.training_scheduler [--rows 20000] [--cores N]
+"""
+import argparse
+import os
+import time
+
+from benchmarks.feature_memory import synthetic_ohlcv
+from training.data_processing import add_technical_indicators
+from training.labeling import add_future_close_and_multiclass_label
+from training.model_training import create_model
+from training.training_scheduler import train_models
+
+FEATURE_COLUMNS = ["open", "high", "low", "close", "volume", "RSI_14", "MACD", "Signal_Line",
+                   "close_lag_1", "close_lag_2", "volume_lag_1", "volume_lag_2"]
+MODEL_TYPES = ["random_forest", "logistic_regression", "svm", "xgboost"]
+
+
+def training_frame(rows):
+    """
+    Labeled synthetic frame with the ``main_predict`` feature columns.
+    """
+    df = add_future_close_and_multiclass_label(add_technical_indicators(synthetic_ohlcv(rows)))
+    return df[FEATURE_COLUMNS], df["label"]
+
+
+def run(rows, n_cores=None):
+    """
+    Time the serial loop and the scheduler on the same data.
+
+    Returns:
+        dict: ``serial`` and ``scheduled`` wall seconds, the per-model serial fit times and the scheduler report.
+    """
+    X, y = training_frame(rows)
+
+    serial_fit_seconds = {}
+    start = time.perf_counter()
+    for model_type in MODEL_TYPES:
+        fit_start = time.perf_counter()
+        create_model(model_type).fit(X, y)
+        serial_fit_seconds[model_type] = time.perf_counter() - fit_start
+    serial = time.perf_counter() - start
+
+    report = train_models(X, y, MODEL_TYPES, n_cores=n_cores)
+    return {"serial": serial, "scheduled": report["wall_seconds"], "serial_fit_seconds": serial_fit_seconds, "report": report}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--cores", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    result = run(args.rows, args.cores)
+    report = result["report"]
+    print(f"{args.rows} rows, {args.cores} cores, {report['concurrent']} concurrent fits")
+    print(f"{'model':<20} {'n_jobs':>6} {'serial s':>9} {'scheduled s':>12}")
+    for model_type in MODEL_TYPES:
+        print(f"{model_type:<20} {report['n_jobs'][model_type]:>6} {result['serial_fit_seconds'][model_type]:>9.2f} {report['fit_seconds'][model_type]:>12.2f}")
+    print(f"{'wall':<20} {'':>6} {result['serial']:>9.2f} {result['scheduled']:>12.2f}  ({result['serial'] / result['scheduled']:.2f}x)")
@@ -14,6 +14,16 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SCHEDULER_API_ENABLED = True
+    # Worker processes running /model/build jobs
+    BUILD_JOB_WORKERS = 2
+    # Directory of the cProfile stats written by builds queued with ?profile=true
+    BUILD_PROFILE_DIR = "profiles"
+    # Compute profile of queued builds without ?compute_profile= ("interactive", "batch" or "background")
+    BUILD_COMPUTE_PROFILE = "batch"
+    # Cadence of the scheduler job that retrains models with "incremental": {"enabled": true} on new bars
+    INCREMENTAL_RETRAIN_HOURS = 24
+    # Compute profile of the scheduled incremental retrains
+    INCREMENTAL_RETRAIN_COMPUTE_PROFILE = "background"
     class Binance:
         # Binance API
         BINANCE_PUBLIC_OHLCV = "https://api.binance.com/api/v3/klines"
\ No newline at end of file
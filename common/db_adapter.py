@@ -1,4 +1,4 @@
-from common.models.models import db, OhlcvData, OhlcvDataCollection, ModelConfig
+from common.models.models import db, OhlcvData, OhlcvDataCollection, ModelConfig, ModelBuildJob
 import pandas as pd
 from sqlalchemy import func, and_
 
@@ -329,4 +329,83 @@ def update_model_fields(config_id, model_config=None):
         return model_config_obj
     except Exception as e:
         db.session.rollback()
-        raise e
\ No newline at end of file
+        raise e
+
+def create_model_build_job(job_id, model_config_id):
+    """
+    Record a newly submitted model build job.
+
+    Args:
+        job_id (str): The job ID.
+        model_config_id (int): The ID of the model config to build.
+
+    Returns:
+        ModelBuildJob: The queued job.
+    """
+    try:
+        job = ModelBuildJob(id=job_id, model_config_id=model_config_id, status="queued", progress=0.0, cancel_requested=False)
+        db.session.add(job)
+        db.session.commit()
+        return job
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error creating model build job: {e}")
+        raise e
+
+def get_model_build_job(job_id):
+    """
+    Retrieve a model build job by ID.
+
+    Args:
+        job_id (str): The job ID.
+
+    Returns:
+        ModelBuildJob: The job, or None if not found.
+    """
+    try:
+        return db.session.get(ModelBuildJob, job_id)
+    except Exception as e:
+        print(f"Error fetching model build job: {e}")
+        raise e
+
+def list_model_build_jobs(model_config_id=None):
+    """
+    Retrieve model build jobs, newest first.
+
+    Args:
+        model_config_id (int): Only return the jobs of this model config (optional).
+
+    Returns:
+        list: A list of ModelBuildJob objects.
+    """
+    try:
+        query = ModelBuildJob.query
+        if model_config_id is not None:
+            query = query.filter(ModelBuildJob.model_config_id == model_config_id)
+        return query.order_by(ModelBuildJob.created_at.desc()).all()
+    except Exception as e:
+        print(f"Error fetching model build jobs: {e}")
+        raise e
+
+def update_model_build_job(job_id, **fields):
+    """
+    Update fields of a model build job.
+
+    Args:
+        job_id (str): The job ID.
+        **fields: Column values to set.
+
+    Returns:
+        ModelBuildJob: The updated job, or None if not found.
+    """
+    try:
+        job = db.session.get(ModelBuildJob, job_id)
+        if not job:
+            return None
+        for key, value in fields.items():
+            setattr(job, key, value)
+        db.session.commit()
+        return job
+    except Exception as e:
+        db.session.rollback()
+        raise e
@@ -53,4 +53,40 @@ class ModelConfig(db.Model):
     status = db.Column(db.String(50), nullable=True)        
 
     def __repr__(self):
-        return f"<ModelConfig {self.model_name}>"
\ No newline at end of file
+        return f"<ModelConfig {self.model_name}>"
+
+
+class ModelBuildJob(db.Model):
+    __tablename__ = "model_build_job"
+
+    id = db.Column(db.String(32), primary_key=True)
+    model_config_id = db.Column(db.Integer, db.ForeignKey("model_config.id"), nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False, default="queued")
+    stage = db.Column(db.String(100), nullable=True)
+    progress = db.Column(db.Float, nullable=False, default=0.0)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    build_logs = db.Column(db.JSON, nullable=True)
+    metrics = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.String(2000), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "model_config_id": self.model_config_id,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "cancel_requested": self.cancel_requested,
+            "build_logs": self.build_logs,
+            "metrics": self.metrics,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def __repr__(self):
+        return f"<ModelBuildJob {self.id} ({self.status})>"
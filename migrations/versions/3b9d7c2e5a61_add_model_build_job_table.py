@@ -0,0 +1,44 @@
+"""Add model_build_job table
+
+Revision ID: 3b9d7c2e5a61
+Revises: f0950cbf934c
+Create Date: 2025-02-03 10:12:44.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b9d7c2e5a61'
+down_revision = 'f0950cbf934c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('model_build_job',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('model_config_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('stage', sa.String(length=100), nullable=True),
+    sa.Column('progress', sa.Float(), nullable=False),
+    sa.Column('cancel_requested', sa.Boolean(), nullable=False),
+    sa.Column('build_logs', sa.JSON(), nullable=True),
+    sa.Column('metrics', sa.JSON(), nullable=True),
+    sa.Column('error', sa.String(length=2000), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['model_config_id'], ['model_config.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('model_build_job', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_model_build_job_model_config_id'), ['model_config_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('model_build_job', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_model_build_job_model_config_id'))
+
+    op.drop_table('model_build_job')
@@ -5,6 +5,7 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, accuracy_score
 from joblib import dump, load  # For saving and loading models
 from common import Config, db, get_all_ohlcv_data
+from training.data_processing import process_dataframe, add_technical_indicators
 from flask import Flask
 
 # Initialize Flask app
@@ -19,84 +20,8 @@ MODEL_DIR = "models/"
 os.makedirs(MODEL_DIR, exist_ok=True)
 MODEL_PATH = os.path.join(MODEL_DIR, "trading_model.joblib")
 
-# Step 1: Clean or Prepare Data
-def process_dataframe(df):
-    """
-    Process a DataFrame with the following steps:
-      - Convert open_time and close_time to datetime.
-      - Convert numerical columns (open, high, low, close, volume) to float.
-      - Handle missing values by dropping rows with NaNs.
-      - Sort the DataFrame by open_time in ascending order.
-
-    Args:
-        df (pd.DataFrame): Input DataFrame with columns [open_time, open, high, low, close, volume, close_time].
-
-    Returns:
-        pd.DataFrame: Processed DataFrame.
-    """
-    try:
-        required_columns = ["open_time", "open", "high", "low", "close", "volume", "close_time"]
-        if not all(col in df.columns for col in required_columns):
-            raise ValueError(f"Input DataFrame must contain the columns: {', '.join(required_columns)}")
-
-        df = df.copy()
-        df["open_time"] = pd.to_datetime(df["open_time"], unit='ms')
-        df["close_time"] = pd.to_datetime(df["close_time"], unit='ms')
-
-        numerical_columns = ["open", "high", "low", "close", "volume"]
-        for col in numerical_columns:
-            df[col] = df[col].astype(float)
-
-        df = df.dropna()
-        df = df.sort_values(by="open_time", ascending=True)
-
-        return df
-
-    except Exception as e:
-        print(f"Error processing DataFrame: {e}")
-        return None
-
-# Step 2: Add Technical Indicators
-def add_technical_indicators(df):
-    """
-    Adds technical indicators: RSI(14), MACD, and lag features.
-
-    Args:
-        df (pd.DataFrame): Input DataFrame with columns ['open', 'high', 'low', 'close', 'volume'].
-
-    Returns:
-        pd.DataFrame: DataFrame with added technical indicators.
-    """
-    try:
-        df = df.copy()
-
-        delta = df['close'].diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-
-        avg_gain = gain.rolling(window=14, min_periods=14).mean()
-        avg_loss = loss.rolling(window=14, min_periods=14).mean()
-
-        rs = avg_gain / avg_loss
-        df['RSI_14'] = 100 - (100 / (1 + rs))
-
-        short_ema = df['close'].ewm(span=12, adjust=False).mean()
-        long_ema = df['close'].ewm(span=26, adjust=False).mean()
-        df['MACD'] = short_ema - long_ema
-        df['Signal_Line'] = df['MACD'].ewm(span=9, adjust=False).mean()
-
-        df['close_lag_1'] = df['close'].shift(1)
-        df['close_lag_2'] = df['close'].shift(2)
-        df['volume_lag_1'] = df['volume'].shift(1)
-        df['volume_lag_2'] = df['volume'].shift(2)
-
-        df = df.dropna()
-
-        return df
-
-    except Exception as e:
-        print(f"Error adding technical indicators: {e}")
-        return None
+# Step 1 and 2: Cleaning and technical indicators come from the shared training module,
+# which delegates the indicators to aimodel.feature_engine
 
 # Step 3: Add Labels
 def add_future_close_and_multiclass_label(df):
@@ -1,5 +1,8 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from aimodel.data_preparation_pipeline import DataPreparationPipeline
+from aimodel.build_job_queue import get_build_job_queue
+from aimodel.model_registry import ModelRegistry
+from common.db_adapter import get_model_config_by_id, get_model_build_job, list_model_build_jobs
 import logging
 
 # Configure logging
@@ -79,26 +82,125 @@ def test_labeling(model_id):
 
 
 
+@model_bp.route('/model/label_sweep/<int:model_id>', methods=['POST'])
+def label_sweep(model_id):
+    """
+    Return label distributions and class-balance stats for a grid of horizons and thresholds.
+
+    Request body:
+        {"horizons": [1, 5, 10], "thresholds": [0.001, 0.002], "threshold_type": "percent"}
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        horizons = data.get("horizons")
+        thresholds = data.get("thresholds")
+        if not isinstance(horizons, list) or not isinstance(thresholds, list):
+            return jsonify({"status": "error", "message": "'horizons' and 'thresholds' must be lists."}), 400
+
+        builder = DataPreparationPipeline(model_config_id=model_id)
+        builder.fetch_model_config()
+        results = builder.sweep_labels(horizons, thresholds, data.get("threshold_type", "percent"))
+
+        return jsonify({
+            "status": "success",
+            "total_variants": len(results),
+            "results": results
+        }), 200
+    except ValueError as e:
+        logging.error("Invalid label sweep request.", exc_info=True)
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        logging.error("Error in label_sweep API.", exc_info=True)
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
 @model_bp.route('/model/build/<int:model_id>', methods=['POST'])
 def build_model(model_id):
     """
-    API endpoint to build a model.
+    API endpoint to queue a model build. With ``?profile=true`` the build also runs under cProfile and dumps
+    its stats to ``BUILD_PROFILE_DIR``. ``?compute_profile=interactive|batch|background`` selects the resources
+    of the build, ``BUILD_COMPUTE_PROFILE`` by default.
 
     Args:
         model_id (int): The ID of the model configuration.
 
     Returns:
-        JSON response with status and message.
+        JSON response with the job ID to poll at /model/build_jobs/<job_id>.
     """
     try:
-        # Initialize the pipeline and build the model
-        pipeline = DataPreparationPipeline(model_config_id=model_id)
-        pipeline.build_model()
+        if not get_model_config_by_id(model_id):
+            return jsonify({"status": "error", "message": f"Model config with ID {model_id} not found."}), 404
+
+        queue = get_build_job_queue(current_app.config.get("BUILD_JOB_WORKERS", 2))
+        profile = request.args.get("profile", default="false").lower() in ("1", "true", "yes")
+        profile_dir = current_app.config.get("BUILD_PROFILE_DIR", "profiles") if profile else None
+        compute_profile = request.args.get("compute_profile", default=current_app.config.get("BUILD_COMPUTE_PROFILE", "batch"))
+        job_id = queue.submit(model_id, profile_dir=profile_dir, compute_profile=compute_profile)
 
-        # Return success response
-        return jsonify({"status": "success", "message": "Model built and saved successfully."}), 200
+        return jsonify({"status": "queued", "job_id": job_id, "message": "Model build queued."}), 202
+    except ValueError as e:
+        logging.error("Invalid model build request.", exc_info=True)
+        return jsonify({"status": "error", "message": str(e)}), 400
     except Exception as e:
         # Log the error and return failure response
-        logging.error("Error building model via API.", exc_info=True)
+        logging.error("Error queuing model build via API.", exc_info=True)
         return jsonify({"status": "error", "message": str(e)}), 500
 
+
+@model_bp.route('/model/build_jobs/<job_id>', methods=['GET'])
+def get_build_job(job_id):
+    """
+    Return the status, current stage, progress and, once finished, the build logs and metrics of a build job.
+    """
+    try:
+        job = get_model_build_job(job_id)
+        if not job:
+            return jsonify({"status": "error", "message": f"Build job {job_id} not found."}), 404
+        return jsonify(job.to_dict()), 200
+    except Exception as e:
+        logging.error("Error in get_build_job API.", exc_info=True)
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@model_bp.route('/model/build_jobs', methods=['GET'])
+def list_build_jobs():
+    """
+    List build jobs, newest first, optionally filtered with ?model_id=<id>.
+    """
+    try:
+        jobs = list_model_build_jobs(request.args.get("model_id", type=int))
+        return jsonify([job.to_dict() for job in jobs]), 200
+    except Exception as e:
+        logging.error("Error in list_build_jobs API.", exc_info=True)
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@model_bp.route('/model/build_jobs/<job_id>/cancel', methods=['POST'])
+def cancel_build_job(job_id):
+    """
+    Cancel a build job. Queued jobs stop immediately, running jobs at their next stage.
+    """
+    try:
+        queue = get_build_job_queue(current_app.config.get("BUILD_JOB_WORKERS", 2))
+        job = queue.cancel(job_id)
+        if not job:
+            return jsonify({"status": "error", "message": f"Build job {job_id} not found."}), 404
+        return jsonify(job.to_dict()), 200
+    except Exception as e:
+        logging.error("Error in cancel_build_job API.", exc_info=True)
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@model_bp.route('/model/versions/<int:model_id>', methods=['GET'])
+def list_model_versions(model_id):
+    """
+    List the registered versions of a model with their metadata, newest first.
+    """
+    try:
+        pipeline = DataPreparationPipeline(model_config_id=model_id)
+        registry = ModelRegistry()
+        versions = [registry.metadata(pipeline.registry_name(), version) for version in registry.versions(pipeline.registry_name())]
+        return jsonify(versions[::-1]), 200
+    except Exception as e:
+        logging.error("Error in list_model_versions API.", exc_info=True)
+        return jsonify({"status": "error", "message": str(e)}), 500
@@ -1,5 +1,5 @@
 from flask_apscheduler import APScheduler
-from scheduler.scheduler_service_tasks import run_scheduled_task
+from scheduler.scheduler_service_tasks import run_scheduled_task, run_incremental_retrain
 
 scheduler = APScheduler()
 
@@ -15,4 +15,12 @@ def setup_scheduler(app):
         trigger="interval",
         seconds=10,  # Fetch data every 10 seconds
     )
+    scheduler.add_job(
+        id="Incremental model retrainer",
+        func=run_incremental_retrain,
+        args=[app],
+        trigger="interval",
+        hours=app.config.get("INCREMENTAL_RETRAIN_HOURS", 24),
+        max_instances=1,  # Retrains of models with a job still pending are skipped by the task itself
+    )
     scheduler.start()
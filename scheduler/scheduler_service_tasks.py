@@ -1,5 +1,7 @@
 from api.binance_service import fetch_ohlcv_data
 from common import Config, db, get_all_ohlcv_data, save_ohlcv_data, Constants
+from common.db_adapter import list_model_configs
+from aimodel.build_job_queue import get_build_job_queue
 
 def run_scheduled_task(app):
     """
@@ -20,3 +22,27 @@ def run_scheduled_task(app):
                 save_ohlcv_data(symbol, entry)  # Save data to the database
         else:
             print("Failed to fetch OHLCV data.")
+
+def run_incremental_retrain(app):
+    """
+    Queues an incremental retrain of every model whose config enables it, which updates the model with the
+    bars ingested since its last training instead of rebuilding it over the full range. The retrains run in
+    the build job workers under the ``INCREMENTAL_RETRAIN_COMPUTE_PROFILE`` compute profile, never in the
+    server process, and a model with a build or retrain still queued or running is skipped.
+    """
+    with app.app_context():
+        queue = get_build_job_queue(app.config.get("BUILD_JOB_WORKERS", 2))
+        compute_profile = app.config.get("INCREMENTAL_RETRAIN_COMPUTE_PROFILE", "background")
+        for model_config in list_model_configs():
+            incremental = (model_config.model_config or {}).get("incremental") or {}
+            if not incremental.get("enabled"):
+                continue
+            try:
+                if queue.has_pending_job(model_config.id):
+                    print(f"Skipped retrain of model {model_config.id}: a job is still pending")
+                    continue
+                job_id = queue.submit(model_config.id, compute_profile=compute_profile, incremental=True)
+                print(f"Queued retrain of model {model_config.id} as job {job_id}")
+            except Exception as e:
+                # One failing model must not stop the others
+                print(f"Failed to queue retrain of model {model_config.id}: {e}")
@@ -0,0 +1,67 @@
+#python -m unittest discover -s tests/aimodel -p "test_build_job_queue.py"
+
+import unittest
+from flask import Flask
+from common.models.models import db, ModelConfig
+from common.db_adapter import create_model_build_job, get_model_build_job, list_model_build_jobs, update_model_build_job
+from aimodel.build_job_queue import BuildCancelled, BuildJobQueue, CANCELLED, QUEUED, RUNNING, report_progress
+
+class TestBuildJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+        db.init_app(self.app)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        config = ModelConfig(model_name="test", coin_symbol="BTCUSDT", training_dataset_name="test")
+        db.session.add(config)
+        db.session.commit()
+        self.model_config_id = config.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+
+    def test_job_lifecycle_is_persisted(self):
+        create_model_build_job("job1", self.model_config_id)
+        self.assertEqual(get_model_build_job("job1").status, QUEUED)
+
+        update_model_build_job("job1", status=RUNNING, stage="train_model", progress=0.5)
+        job = get_model_build_job("job1").to_dict()
+        self.assertEqual((job["status"], job["stage"], job["progress"]), (RUNNING, "train_model", 0.5))
+        self.assertEqual([job.id for job in list_model_build_jobs(self.model_config_id)], ["job1"])
+        self.assertEqual(list_model_build_jobs(self.model_config_id + 1), [])
+        self.assertIsNone(update_model_build_job("missing", status=RUNNING))
+
+    def test_cancel_running_job_is_cooperative(self):
+        queue = BuildJobQueue(max_workers=1)
+        try:
+            create_model_build_job("job2", self.model_config_id)
+            update_model_build_job("job2", status=RUNNING)
+            # No local future to cancel: the worker sees the flag at its next stage
+            job = queue.cancel("job2")
+            self.assertTrue(job.cancel_requested)
+            self.assertEqual(job.status, RUNNING)
+
+            self.assertTrue(queue.has_pending_job(self.model_config_id))
+            update_model_build_job("job2", status=CANCELLED)
+            self.assertEqual(queue.cancel("job2").status, CANCELLED)
+            self.assertIsNone(queue.cancel("missing"))
+            self.assertFalse(queue.has_pending_job(self.model_config_id))
+        finally:
+            queue.shutdown()
+
+    def test_progress_reports_stop_cancelled_or_missing_jobs(self):
+        create_model_build_job("job3", self.model_config_id)
+        report_progress("job3", "load_data", 0.1)
+        self.assertEqual(get_model_build_job("job3").stage, "load_data")
+        update_model_build_job("job3", cancel_requested=True)
+        with self.assertRaises(BuildCancelled):
+            report_progress("job3", "train_model", 0.5)
+        with self.assertRaisesRegex(BuildCancelled, "no longer exists"):
+            report_progress("missing", "train_model", 0.5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#python -m unittest discover -s tests/aimodel -p "test_chunked_features.py"
+
+import tempfile
+import unittest
+import numpy as np
+from aimodel.columnar_store import ColumnarStore
+from aimodel.feature_engine import FeatureEngine
+from benchmarks.feature_memory import synthetic_ohlcv
+
+CONFIG = [
+    {"name": "RSI", "params": {"timeperiod": 14, "smoothing": "sma", "column": "RSI_14"}},
+    {"name": "MACD", "params": {"fastperiod": 12, "slowperiod": 26, "signalperiod": 9, "seed": "first"}},
+    {"name": "Lag Features", "params": {"lag_period": 3, "columns": ["close", "volume"]}},
+    {"name": "Rolling Returns", "params": {"periods": [1, 5, 20]}},
+    {"name": "Rolling Z-Score", "params": {"window": 50}},
+    {"name": "Realized Volatility", "params": {"window": 30}},
+    {"name": "Rolling Min/Max Distance", "params": {"window": 100}},
+    {"name": "RSI", "timeframe": "15m", "params": {"timeperiod": 14, "smoothing": "sma", "column": "RSI_14"}},
+]
+
+
+class TestChunkedFeatures(unittest.TestCase):
+    def setUp(self):
+        self.df = synthetic_ohlcv(6000)
+        self.engine = FeatureEngine(CONFIG)
+        self.expected = self.engine.compute(self.df).reset_index(drop=True)
+
+    def compute_to_store(self, chunk_rows):
+        store = ColumnarStore(tempfile.mkdtemp())
+        self.addCleanup(store.clear)
+        chunks = (self.df.iloc[start:start + chunk_rows] for start in range(0, len(self.df), chunk_rows))
+        for features in self.engine.compute_chunks(chunks, base_interval_ms=60_000):
+            store.append(features)
+        return store
+
+    def test_chunked_store_matches_in_memory(self):
+        for chunk_rows in (700, 1500, 6000):
+            store = self.compute_to_store(chunk_rows)
+            actual = store.read()
+            self.assertEqual(store.columns, list(self.expected.columns))
+            self.assertEqual(len(actual), len(self.expected))
+            np.testing.assert_array_equal(actual["close_time"], self.expected["close_time"])
+            # Running sums restart at each chunk and recursive filters drop their converged tail, so values agree
+            # to rounding rather than bit for bit
+            for column in self.engine.columns:
+                np.testing.assert_allclose(actual[column], self.expected[column], rtol=1e-10, atol=1e-10)
+
+    def test_store_reads_row_ranges(self):
+        store = self.compute_to_store(1000)
+        reopened = ColumnarStore(store.path)
+        self.assertEqual(reopened.rows, len(self.expected))
+        chunks = list(reopened.iter_chunks(2000, columns=["close", "RSI_14"]))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), len(self.expected))
+        np.testing.assert_array_equal(chunks[1]["close"], self.expected["close"].iloc[2000:4000])
+        self.assertTrue(reopened.read(start=reopened.rows).empty)
+
+    def test_warmup_requires_base_interval_for_higher_timeframes(self):
+        with self.assertRaises(ValueError):
+            self.engine.warmup_rows()
+        self.assertGreaterEqual(self.engine.warmup_rows(60_000), 15 * 16)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#python -m unittest discover -s tests/aimodel -p "test_compiled_trees.py"
+
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier
+from aimodel.compiled_trees import CompiledEnsemble, compile_model
+from aimodel.model_registry import ModelRegistry, load_predictor
+
+class TestCompiledTrees(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(size=(2000, 5)), columns=["a", "b", "c", "d", "e"])
+        self.y = np.digitize(self.X["a"] + 0.5 * self.X["b"] + 0.5 * rng.normal(size=2000), [-0.4, 0.4])
+        X_test = rng.normal(size=(500, 5))
+        X_test[rng.random(X_test.shape) < 0.05] = np.nan
+        self.X_test = pd.DataFrame(X_test, columns=self.X.columns)
+
+    def assert_same_predictions(self, model, X, exact=True):
+        compiled = compile_model(model)
+        np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+        if exact:
+            np.testing.assert_array_equal(compiled.predict_proba(X), model.predict_proba(X))
+        else:
+            np.testing.assert_allclose(compiled.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-6)
+        return compiled
+
+    def test_forests_match_exactly(self):
+        for model in (RandomForestClassifier(n_estimators=20, random_state=0),
+                      ExtraTreesClassifier(n_estimators=20, min_samples_leaf=5, random_state=0)):
+            self.assert_same_predictions(model.fit(self.X, self.y), self.X_test)
+
+    def test_boosters_match(self):
+        multiclass = XGBClassifier(n_estimators=30, max_depth=4).fit(self.X, self.y)
+        self.assert_same_predictions(multiclass, self.X_test, exact=False)
+        binary = XGBClassifier(n_estimators=30, max_depth=4).fit(self.X, (self.y == 2).astype(int))
+        self.assert_same_predictions(binary, self.X_test, exact=False)
+
+    def test_single_row_and_column_order(self):
+        model = RandomForestClassifier(n_estimators=10, random_state=0).fit(self.X, self.y)
+        compiled = compile_model(model)
+        row = self.X_test.iloc[3]
+        np.testing.assert_array_equal(compiled.predict_proba(row.to_numpy()), model.predict_proba(self.X_test.iloc[[3]]))
+        shuffled = self.X_test[["e", "c", "a", "d", "b"]]
+        np.testing.assert_array_equal(compiled.predict(shuffled), model.predict(self.X_test))
+        with self.assertRaises(ValueError):
+            compiled.predict(np.zeros((2, 4)))
+
+    def test_unsupported_model(self):
+        with self.assertRaises(ValueError):
+            compile_model(LogisticRegression().fit(self.X, self.y))
+
+    def test_registry_saves_memory_mapped_compiled_predictor(self):
+        with tempfile.TemporaryDirectory() as folder:
+            registry = ModelRegistry(folder)
+            model = XGBClassifier(n_estimators=10, max_depth=3).fit(self.X, self.y)
+            registry.register("xgb", model, self.X.columns)
+            compiled, metadata = registry.load_compiled("xgb")
+            self.assertTrue(metadata["compiled"])
+            self.assertIsInstance(compiled, CompiledEnsemble)
+            self.assertIsInstance(compiled.children, np.memmap)
+            np.testing.assert_array_equal(compiled.predict(self.X_test), model.predict(self.X_test))
+            self.assertIs(load_predictor(registry.artifact_path("xgb")), compiled)
+
+            registry.register("linear", LogisticRegression().fit(self.X, self.y), self.X.columns)
+            self.assertFalse(registry.metadata("linear")["compiled"])
+            self.assertFalse(os.path.exists(os.path.join(registry.version_dir("linear", 1), "compiled.joblib")))
+            with self.assertRaises(FileNotFoundError):
+                registry.load_compiled("linear")
+            self.assertIsInstance(load_predictor(registry.artifact_path("linear")), LogisticRegression)
+
+if __name__ == "__main__":
+    unittest.main()
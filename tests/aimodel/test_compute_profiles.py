@@ -0,0 +1,38 @@
+#python -m unittest discover -s tests/aimodel -p "test_compute_profiles.py"
+
+import unittest
+from threadpoolctl import threadpool_info
+from aimodel.compute_profiles import ComputeProfile, resolve_compute_profile
+from aimodel.hyperparameter_search import HyperparameterSearch
+from aimodel.model_engine import ModelEngine
+
+class TestComputeProfiles(unittest.TestCase):
+    def test_profiles_share_the_cores(self):
+        threads = {name: ComputeProfile.from_name(name, cpu_count=8).threads for name in ("interactive", "batch", "background")}
+        self.assertEqual(threads, {"interactive": 8, "batch": 4, "background": 2})
+        self.assertEqual(ComputeProfile.from_name("background", cpu_count=1).threads, 1)
+        with self.assertRaises(ValueError):
+            ComputeProfile.from_name("turbo")
+        self.assertIsNone(resolve_compute_profile(None))
+        self.assertEqual(resolve_compute_profile("batch").name, "batch")
+
+    def test_profile_overrides_estimator_resources(self):
+        profile = ComputeProfile("test", threads=3, max_bin=64)
+        engine = ModelEngine({"method": "xgboost", "params": [{"n_estimators": "5"}, {"n_jobs": "16"}, {"tree_method": "exact"}]}, profile)
+        params = engine.create_model().get_params()
+        self.assertEqual((params["n_estimators"], params["n_jobs"], params["tree_method"], params["max_bin"]), (5, 3, "hist", 64))
+        # The configured parameters, which the registry records, are left as they were
+        self.assertEqual(engine.params["n_jobs"], 16)
+        forest = ModelEngine.from_params("randomForest", {"n_estimators": 5}, profile).create_model()
+        self.assertEqual(forest.n_jobs, 3)
+        self.assertIsNone(ModelEngine.from_params("randomForest", {"n_estimators": 5}).create_model().n_jobs)
+
+    def test_parallel_stages_and_thread_pools_are_capped(self):
+        profile = ComputeProfile("test", threads=1)
+        self.assertEqual((profile.n_jobs(-1), profile.n_jobs(4)), (1, 1))
+        self.assertEqual(HyperparameterSearch("xgboost", n_jobs=-1, compute_profile=profile).n_jobs, 1)
+        with profile.limits():
+            self.assertTrue(all(pool["num_threads"] == 1 for pool in threadpool_info()))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+#python -m unittest discover -s tests/aimodel -p "test_event_expressions.py"
+
+import unittest
+import numpy as np
+import pandas as pd
+from aimodel.event_expressions import compile_expression, expression_lookback, parse_expression
+from aimodel.labeling_engine import LabelingEngine
+
+class TestEventExpressions(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "RSI": [35.0, 31.0, 29.0, 25.0, 32.0, 28.0, np.nan, 27.0],
+            "MACD": [-1.0, -0.5, 0.2, 0.4, 0.1, -0.2, 0.3, 0.5],
+            "Signal_Line": [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+            "close": [10.0, 11.0, 12.0, 11.0, 13.0, 14.0, 15.0, 14.0],
+        })
+
+    def evaluate(self, text):
+        return list(compile_expression(text)(self.df))
+
+    def test_crosses_are_transitions_not_levels(self):
+        self.assertEqual(self.evaluate("RSI crosses below 30"), [False, False, True, False, False, True, False, False])
+        self.assertEqual(self.evaluate("RSI < 30"), [False, False, True, True, False, True, False, True])
+        self.assertEqual(self.evaluate("MACD crosses above Signal_Line"), [False, False, True, False, False, False, True, False])
+
+    def test_boolean_operators_and_lookbacks(self):
+        self.assertEqual(self.evaluate("close > close[2] and not RSI >= 30"), [False, False, True, False, False, True, False, False])
+        # A missing RSI is unknown, so neither the test nor its negation fires; an 'or' still can
+        self.assertEqual(self.evaluate("not RSI >= 30")[6], False)
+        self.assertEqual(self.evaluate("RSI >= 30 or close > 14")[6], True)
+        self.assertEqual(self.evaluate("(MACD < -0.4 or close[1] == 13) and close != 10"), [False, True, False, False, False, True, False, False])
+
+    def test_lookback(self):
+        self.assertEqual(expression_lookback("RSI < 30"), 0)
+        self.assertEqual(expression_lookback("close > close[2] and not RSI >= 30"), 2)
+        self.assertEqual(expression_lookback("MACD[3] crosses above Signal_Line or close > 1"), 4)
+
+    def test_precedence(self):
+        self.assertEqual(parse_expression("a > 1 or b > 1 and c > 1")[0], "or")
+        self.assertEqual(parse_expression("not a > 1 and b > 1")[1][0], "not")
+
+    def test_syntax_errors(self):
+        for text in ("RSI crosses 30", "RSI <", "(RSI < 3", "RSI[x] > 1", "RSI > 3 $", "and RSI > 3"):
+            with self.assertRaises(ValueError):
+                parse_expression(text)
+        with self.assertRaises(ValueError):
+            compile_expression("ATR > 1")(self.df)
+
+    def test_event_labeling_compiles_once_per_config(self):
+        label_config = {"method": "Event-Based Labeling", "params": {"lookahead": 5, "eventDefinition": [
+            "RSI crosses below 30",
+            {"expression": "MACD crosses below Signal_Line", "label": "SELL"},
+        ]}}
+        LabelingEngine._compiled_events.cache_clear()
+        labeled = LabelingEngine(label_config).apply_labeling_strategy(self.df)
+        self.assertEqual(list(labeled["label"]), [0, 0, 1, 0, 0, -1, 0, 0])
+        LabelingEngine(label_config).apply_labeling_strategy(self.df)
+        info = LabelingEngine._compiled_events.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+if __name__ == "__main__":
+    unittest.main()
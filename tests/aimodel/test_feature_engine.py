@@ -0,0 +1,76 @@
+#python -m unittest discover -s tests/aimodel -p "test_feature_engine.py"
+
+import unittest
+import numpy as np
+import pandas as pd
+from aimodel import feature_engine
+from aimodel.feature_engine import FeatureEngine, TRAINING_FEATURES_CONFIG, clear_timeframe_cache, select_features_config
+from benchmarks.feature_memory import synthetic_ohlcv, legacy_add_technical_indicators
+
+class TestFeatureEngine(unittest.TestCase):
+    def setUp(self):
+        self.df = synthetic_ohlcv(2000)
+
+    def test_matches_legacy_training_features(self):
+        expected = legacy_add_technical_indicators(self.df)
+        result = FeatureEngine(TRAINING_FEATURES_CONFIG).compute(self.df)
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-9)
+
+    def test_input_frame_is_not_modified(self):
+        columns = list(self.df.columns)
+        FeatureEngine(TRAINING_FEATURES_CONFIG).compute(self.df)
+        self.assertEqual(list(self.df.columns), columns)
+
+    def test_dropna_false_keeps_warmup_rows(self):
+        result = FeatureEngine(TRAINING_FEATURES_CONFIG).compute(self.df, dropna=False)
+        self.assertEqual(len(result), len(self.df))
+        self.assertTrue(np.isnan(result["RSI_14"].iloc[0]))
+
+    def test_unsupported_indicator(self):
+        with self.assertRaises(ValueError):
+            FeatureEngine([{"name": "Unknown", "params": {}}])
+
+    def test_select_features_config_computes_only_used_columns(self):
+        config = select_features_config(TRAINING_FEATURES_CONFIG, ["close", "RSI_14", "volume_lag_2"])
+        self.assertEqual([feature["name"] for feature in config], ["RSI", "Lag Features"])
+        self.assertEqual(config[1]["params"], {"lag_period": 2, "columns": ["volume"]})
+        full = FeatureEngine(TRAINING_FEATURES_CONFIG).compute(self.df)
+        reduced = FeatureEngine(config).compute(self.df)
+        pd.testing.assert_frame_equal(reduced[["RSI_14", "volume_lag_2"]], full[["RSI_14", "volume_lag_2"]].loc[reduced.index])
+
+    def test_higher_timeframe_features_use_completed_bars(self):
+        config = [{"name": "RSI", "params": {"timeperiod": 14, "smoothing": "sma"}, "timeframe": "1h"}]
+        result = FeatureEngine(config).compute(self.df, dropna=False)
+
+        hourly = self.df.set_index("open_time").resample("1h").agg({"close": "last"})
+        hourly["RSI"] = FeatureEngine([{"name": "RSI", "params": {"timeperiod": 14, "smoothing": "sma"}}]).compute(hourly, dropna=False)["RSI"]
+        hourly["close_time"] = hourly.index + pd.Timedelta("1h") - pd.Timedelta("1ms")
+        expected = pd.merge_asof(self.df[["close_time"]], hourly[["close_time", "RSI"]], on="close_time", direction="backward")
+
+        np.testing.assert_allclose(result["RSI_1h"].to_numpy(), expected["RSI"].to_numpy())
+
+    def test_higher_timeframe_features_are_causal(self):
+        config = [{"name": "MACD", "params": {"fastperiod": 12, "slowperiod": 26, "signalperiod": 9, "seed": "first"}, "timeframe": "15m"}]
+        full = FeatureEngine(config).compute(self.df, dropna=False)
+        truncated = FeatureEngine(config).compute(self.df.iloc[:1000], dropna=False)
+        np.testing.assert_array_equal(full["MACD_15m"].to_numpy()[:1000], truncated["MACD_15m"].to_numpy())
+
+    def test_higher_timeframe_cache_follows_every_source_column(self):
+        config = [{"name": "Average True Range (ATR)", "params": {"timeperiod": 14}, "timeframe": "1h"}]
+        clear_timeframe_cache()
+        first = FeatureEngine(config).compute(self.df, dropna=False)
+        # A fresh engine on the same bars reuses the resampled features
+        self.assertEqual(len(feature_engine._timeframe_cache), 1)
+        np.testing.assert_array_equal(FeatureEngine(config).compute(self.df, dropna=False)["ATR_1h"], first["ATR_1h"])
+        self.assertEqual(len(feature_engine._timeframe_cache), 1)
+
+        # Only the highs change: the hourly ATR must follow them
+        wider = self.df.assign(high=self.df["high"] * 1.01)
+        cached = FeatureEngine(config).compute(wider, dropna=False)
+        clear_timeframe_cache()
+        expected = FeatureEngine(config).compute(wider, dropna=False)
+        np.testing.assert_array_equal(cached["ATR_1h"], expected["ATR_1h"])
+        self.assertFalse(np.allclose(cached["ATR_1h"], first["ATR_1h"], equal_nan=True))
+
+if __name__ == "__main__":
+    unittest.main()
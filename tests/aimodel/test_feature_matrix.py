@@ -0,0 +1,71 @@
+#python -m unittest discover -s tests/aimodel -p "test_feature_matrix.py"
+
+import pickle
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from xgboost import XGBClassifier
+from aimodel import feature_matrix
+from aimodel.feature_matrix import FeatureMatrix, clear_dmatrix_cache
+from aimodel.time_series_cv import WalkForwardCV, evaluate_fold
+
+class TestFeatureMatrix(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame(rng.normal(size=(2000, 4)), columns=list("abcd"))
+        self.df["time"] = np.arange(2000, dtype=np.int64)
+        self.y = pd.Series(np.digitize(self.df["a"] + 0.3 * rng.normal(size=2000), [-0.5, 0.5]))
+        clear_dmatrix_cache()
+
+    def tearDown(self):
+        clear_dmatrix_cache()
+
+    def test_from_frame_builds_a_contiguous_float32_window(self):
+        matrix = FeatureMatrix.from_frame(self.df, list("abcd"), self.y.iloc[100:1100], rows=slice(100, 1100))
+        self.assertEqual(matrix.values.dtype, np.float32)
+        self.assertTrue(matrix.values.flags["C_CONTIGUOUS"])
+        self.assertEqual(matrix.values.shape, (1000, 4))
+        np.testing.assert_array_equal(matrix.values, self.df[list("abcd")].iloc[100:1100].to_numpy(np.float32))
+        self.assertEqual(list(matrix.frame().columns), list("abcd"))
+        self.assertTrue(np.shares_memory(matrix.frame().to_numpy(), matrix.values))
+
+    def test_windows_reuse_one_cached_quantile_dmatrix(self):
+        matrix = FeatureMatrix(self.df[list("abcd")], self.y)
+        window = matrix.quantile_dmatrix(slice(0, 1000))
+        self.assertIs(matrix.quantile_dmatrix(slice(0, 1000)), window)
+        self.assertIs(matrix.quantile_dmatrix(slice(0, 2000)), matrix.quantile_dmatrix())
+        self.assertEqual(window.num_row(), 1000)
+        # A pickled copy, as sent to a worker process, finds the same cached windows
+        self.assertIs(pickle.loads(pickle.dumps(matrix)).quantile_dmatrix(slice(0, 1000)), window)
+        self.assertEqual(len(feature_matrix._dmatrix_cache), 2)
+
+    def test_folds_score_like_dataframe_fits(self):
+        X = self.df[list("abcd")]
+        matrix = FeatureMatrix(X, self.y)
+        train, test = WalkForwardCV(n_splits=3).split(len(X))[-1]
+        for estimator in (XGBClassifier(n_estimators=20, max_depth=3), RandomForestClassifier(n_estimators=20, random_state=0)):
+            with self.subTest(model=type(estimator).__name__):
+                on_matrix = evaluate_fold(estimator, matrix, None, 0, train, test)
+                on_frame = evaluate_fold(estimator, X, self.y, 0, train, test)
+                self.assertGreater(on_matrix["accuracy"], 0.7)
+                self.assertAlmostEqual(on_matrix["accuracy"], on_frame["accuracy"], delta=0.03)
+
+    def test_sample_weights_reach_every_fit_and_score(self):
+        weights = np.random.default_rng(1).uniform(0.1, 5.0, len(self.df))
+        matrix = FeatureMatrix(self.df[list("abcd")], self.y, sample_weight=weights)
+        np.testing.assert_allclose(matrix.quantile_dmatrix(slice(0, 1000)).get_weight(), weights[:1000], rtol=1e-6)
+        np.testing.assert_array_equal(matrix.select(["b", "a"]).sample_weight, weights)
+        np.testing.assert_array_equal(matrix.take(np.arange(10, 20)).sample_weight, weights[10:20])
+
+        forest = RandomForestClassifier(n_estimators=10, random_state=0)
+        fitted = matrix.fit(forest, slice(0, 1000))
+        expected = RandomForestClassifier(n_estimators=10, random_state=0).fit(matrix.frame(slice(0, 1000)), self.y[:1000], sample_weight=weights[:1000])
+        np.testing.assert_array_equal(fitted.predict_proba(matrix.frame()), expected.predict_proba(matrix.frame()))
+
+        fold = evaluate_fold(forest, matrix, None, 0, slice(0, 1000), slice(1000, 2000))
+        y_pred = expected.predict(matrix.frame(slice(1000, 2000)))
+        self.assertAlmostEqual(fold["accuracy"], np.average(y_pred == self.y[1000:], weights=weights[1000:]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+#python -m unittest discover -s tests/aimodel -p "test_feature_pruning.py"
+
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from xgboost import XGBClassifier
+from aimodel.feature_matrix import FeatureMatrix
+from aimodel.feature_pruning import FeaturePruner, _permutation_importances
+
+class TestFeaturePruner(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 3000
+        signal = rng.normal(size=(n, 2))
+        self.X = pd.DataFrame({
+            "signal_a": signal[:, 0],
+            "signal_b": signal[:, 1],
+            "signal_a_copy": signal[:, 0] + 0.01 * rng.normal(size=n),
+            "noise": rng.normal(size=n),
+            "constant": np.ones(n),
+        })
+        self.y = np.digitize(signal[:, 0] + signal[:, 1] + 0.3 * rng.normal(size=n), [-0.5, 0.5])
+
+    def test_permutation_drops_noise_and_redundant_features(self):
+        pruner = FeaturePruner("permutation", min_importance=0.002, max_correlation=0.9, n_jobs=2)
+        result = pruner.fit(RandomForestClassifier(n_estimators=30, random_state=0), FeatureMatrix(self.X, self.y), purge=5)
+        self.assertEqual(set(result["selected"]), {"signal_b"} | ({"signal_a", "signal_a_copy"} - set(result["dropped"])))
+        self.assertEqual(len(result["selected"]), 2)
+        self.assertEqual(result["dropped"]["constant"], "low importance")
+        self.assertIn("noise", result["dropped"])
+        redundant = "signal_a_copy" if "signal_a" in result["selected"] else "signal_a"
+        self.assertTrue(result["dropped"][redundant].startswith("correlated with"))
+        self.assertEqual(set(result["importances"]), set(self.X.columns))
+
+    def test_permutation_workers_split_the_cores(self):
+        matrix = FeatureMatrix(self.X, self.y)
+        forest = matrix.fit(RandomForestClassifier(n_estimators=10, n_jobs=-1, random_state=0))
+        booster = matrix.fit(XGBClassifier(n_estimators=5, max_depth=2))
+        for model in (forest, booster):
+            _permutation_importances(model, matrix, [0], 1.0, "accuracy", 1, 0, n_threads=2)
+        self.assertEqual(forest.n_jobs, 2)
+        self.assertEqual(booster.save_config().count('"nthread":"2"'), 1)
+
+    def test_gain_importances_and_max_features(self):
+        pruner = FeaturePruner.from_config({"method": "gain", "max_correlation": None, "max_features": 2})
+        result = pruner.fit(XGBClassifier(n_estimators=20, max_depth=3), self.X, self.y)
+        self.assertEqual(len(result["selected"]), 2)
+        self.assertIn("signal_b", result["selected"])
+        self.assertAlmostEqual(sum(result["importances"].values()), 1.0)
+        self.assertEqual(result["importances"]["constant"], 0.0)
+
+    def test_keeps_the_best_feature_and_selects_matrix_columns(self):
+        result = FeaturePruner("gain", min_importance=1.0).fit(RandomForestClassifier(n_estimators=10, random_state=0), self.X, self.y)
+        self.assertEqual(len(result["selected"]), 1)
+        matrix = FeatureMatrix(self.X, self.y).select(["noise", "signal_b"])
+        self.assertEqual(matrix.columns, ["noise", "signal_b"])
+        np.testing.assert_array_equal(matrix.values, self.X[["noise", "signal_b"]].to_numpy(dtype=np.float32))
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            FeaturePruner("shap")
+        with self.assertRaises(ValueError):
+            FeaturePruner(scoring="log_loss")
+
+if __name__ == "__main__":
+    unittest.main()
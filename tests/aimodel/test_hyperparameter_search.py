@@ -0,0 +1,54 @@
+#python -m unittest discover -s tests/aimodel -p "test_hyperparameter_search.py"
+
+import unittest
+import numpy as np
+import pandas as pd
+from aimodel.hyperparameter_search import HyperparameterSearch, sample_params
+from aimodel.model_engine import ModelEngine
+from aimodel.time_series_cv import WalkForwardCV
+
+class TestHyperparameterSearch(unittest.TestCase):
+    def test_sample_params(self):
+        rng = np.random.default_rng(0)
+        distributions = {
+            "n_estimators": {"type": "int", "low": 10, "high": 20},
+            "learning_rate": {"type": "float", "low": 0.01, "high": 0.1, "log": True},
+            "max_depth": [None, 3],
+        }
+        for _ in range(50):
+            params = sample_params(distributions, rng)
+            self.assertIsInstance(params["n_estimators"], int)
+            self.assertTrue(10 <= params["n_estimators"] <= 20)
+            self.assertTrue(0.01 <= params["learning_rate"] <= 0.1)
+            self.assertIn(params["max_depth"], [None, 3])
+
+    def test_hyperband_brackets(self):
+        search = HyperparameterSearch("xgboost", strategy="hyperband", factor=3, min_resource=1 / 9)
+        self.assertEqual([n for n, _ in search.brackets()], [9, 5, 3])
+        np.testing.assert_allclose([budget for _, budget in search.brackets()], [1 / 9, 1 / 3, 1])
+
+    def test_successive_halving_keeps_the_best_candidates(self):
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(3000, 4)), columns=list("abcd"))
+        y = pd.Series((X["a"] + 0.5 * rng.normal(size=3000) > 0).astype(int))
+        search = HyperparameterSearch(
+            "logisticRegression", n_candidates=9, factor=3, min_resource=1 / 3,
+            cv=WalkForwardCV(n_splits=3, purge=1), n_jobs=2
+        )
+        results = search.fit(X, y)
+
+        first_rung = [trial for trial in results["trials"] if trial["budget"] < 1.0]
+        finalists = [trial for trial in results["trials"] if trial["budget"] == 1.0]
+        self.assertEqual((len(first_rung), len(finalists)), (9, 3))
+        best_of_first_rung = sorted(first_rung, key=lambda trial: trial["score"], reverse=True)[:3]
+        self.assertEqual([trial["params"] for trial in best_of_first_rung], [trial["params"] for trial in finalists])
+        self.assertEqual(results["best_score"], max(trial["score"] for trial in finalists))
+        self.assertGreater(results["best_score"], 0.7)
+
+    def test_format_params_round_trip(self):
+        params = {"n_estimators": 120, "learning_rate": 0.05, "max_depth": None, "max_features": "sqrt"}
+        engine = ModelEngine({"method": "randomForest", "params": ModelEngine.format_params(params)})
+        self.assertEqual(engine.params, params)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#python -m unittest discover -s tests/aimodel -p "test_incremental_training.py"
+
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from xgboost import XGBClassifier
+from aimodel.incremental_training import continue_training, supports_incremental
+
+class TestIncrementalTraining(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(size=(1200, 4)), columns=list("abcd"))
+        self.y = pd.Series(np.digitize(self.X["a"] + 0.3 * rng.normal(size=1200), [-0.5, 0.5]))
+        self.X_old, self.y_old = self.X.iloc[:1000], self.y.iloc[:1000]
+        self.X_new, self.y_new = self.X.iloc[1000:], self.y.iloc[1000:]
+
+    def test_xgboost_continues_boosting(self):
+        model = XGBClassifier(n_estimators=20, max_depth=3).fit(self.X_old, self.y_old)
+        updated = continue_training(model, self.X_new, self.y_new, n_estimators=10)
+        self.assertEqual(updated.get_booster().num_boosted_rounds(), 30)
+        self.assertEqual(list(updated.classes_), [0, 1, 2])
+        self.assertGreater((updated.predict(self.X_new) == self.y_new).mean(), 0.7)
+
+    def test_random_forest_grows_and_forgets_oldest_trees(self):
+        model = RandomForestClassifier(n_estimators=20, random_state=0).fit(self.X_old, self.y_old)
+        first_trees = list(model.estimators_)
+        continue_training(model, self.X_new, self.y_new, n_estimators=10)
+        self.assertEqual(len(model.estimators_), 30)
+        self.assertEqual(model.estimators_[:20], first_trees)
+
+        continue_training(model, self.X_new, self.y_new, n_estimators=10, max_estimators=25)
+        self.assertEqual(len(model.estimators_), 25)
+        self.assertEqual(model.predict_proba(self.X_new).shape, (200, 3))
+
+    def test_window_missing_a_class_keeps_the_class_layout(self):
+        window = self.y_new != 2
+        for model in (XGBClassifier(n_estimators=5).fit(self.X_old, self.y_old),
+                      RandomForestClassifier(n_estimators=5, random_state=0).fit(self.X_old, self.y_old)):
+            with self.subTest(model=type(model).__name__):
+                updated = continue_training(model, self.X_new[window], self.y_new[window], n_estimators=5)
+                self.assertEqual(list(updated.classes_), [0, 1, 2])
+                self.assertEqual(updated.predict_proba(self.X_new).shape, (200, 3))
+
+    def test_partial_fit_models(self):
+        model = SGDClassifier(loss="log_loss", random_state=0).fit(self.X_old, self.y_old)
+        coef = model.coef_.copy()
+        continue_training(model, self.X_new, self.y_new)
+        self.assertFalse(np.array_equal(coef, model.coef_))
+
+    def test_unsupported_models_and_unseen_classes(self):
+        model = LogisticRegression().fit(self.X_old, self.y_old)
+        self.assertFalse(supports_incremental(model))
+        with self.assertRaises(ValueError):
+            continue_training(model, self.X_new, self.y_new)
+
+        forest = RandomForestClassifier(n_estimators=5).fit(self.X_old, self.y_old.clip(upper=1))
+        with self.assertRaises(ValueError):
+            continue_training(forest, self.X_new, self.y_new)
+
+if __name__ == "__main__":
+    unittest.main()
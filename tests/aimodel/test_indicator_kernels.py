@@ -0,0 +1,85 @@
+#python -m unittest discover -s tests/aimodel -p "test_indicator_kernels.py"
+
+import unittest
+import numpy as np
+from aimodel import indicator_kernels as kernels
+from aimodel import rolling_kernels
+from aimodel.feature_engine import FeatureEngine
+from benchmarks.feature_memory import synthetic_ohlcv
+
+try:
+    import talib
+except ImportError:
+    talib = None
+
+INDICATORS_CONFIG = [
+    {"name": "RSI", "params": {"timeperiod": 14}},
+    {"name": "MACD", "params": {"fastperiod": 12, "slowperiod": 26, "signalperiod": 9}},
+    {"name": "Simple Moving Average (SMA)", "params": {"window": 20}},
+    {"name": "Exponential Moving Average (EMA)", "params": {"span": 20}},
+    {"name": "Average True Range (ATR)", "params": {"timeperiod": 14}},
+    {"name": "Stochastic Oscillator", "params": {"fastk_period": 14, "slowk_period": 3, "slowk_matype": 0, "slowd_period": 3, "slowd_matype": 0}},
+    {"name": "Bollinger Band", "params": {"timeperiod": 20, "nbdevup": 2, "nbdevdn": 2, "matype": 0}},
+    {"name": "Percentage Price Oscillator (PPO)", "params": {"fastperiod": 12, "slowperiod": 26, "matype": 1}},
+]
+
+@unittest.skipIf(talib is None, "TA-Lib is not installed")
+class TestIndicatorKernelsMatchTalib(unittest.TestCase):
+    def setUp(self):
+        df = synthetic_ohlcv(5000)
+        self.high, self.low, self.close = (df[column].to_numpy() for column in ("high", "low", "close"))
+        self.df = df
+
+    def assertMatches(self, actual, expected):
+        np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+        # Absolute tolerance scaled to the series: oscillators cross zero, where relative error is meaningless
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9 * np.nanmax(np.abs(expected)))
+
+    def test_single_output_indicators(self):
+        self.assertMatches(kernels.rsi(self.close, 14, smoothing="wilder"), talib.RSI(self.close, 14))
+        self.assertMatches(kernels.rolling_mean(self.close, 20), talib.SMA(self.close, 20))
+        self.assertMatches(kernels.ema(self.close, 20, seed="sma"), talib.EMA(self.close, 20))
+        self.assertMatches(kernels.atr(self.high, self.low, self.close, 14), talib.ATR(self.high, self.low, self.close, 14))
+        for matype in kernels.MA_TYPES:
+            for period in (1, 7, 20):
+                self.assertMatches(kernels.moving_average(self.close, period, matype), talib.MA(self.close, period, matype))
+            self.assertMatches(kernels.ppo(self.close, 12, 26, matype), talib.PPO(self.close, 12, 26, matype))
+
+    def test_multi_output_indicators(self):
+        macd = kernels.macd(self.close, 12, 26, 9, seed="sma")
+        expected_macd, expected_signal, _ = talib.MACD(self.close, 12, 26, 9)
+        self.assertMatches(macd[:, 0], expected_macd)
+        self.assertMatches(macd[:, 1], expected_signal)
+        for matype in kernels.MA_TYPES:
+            stoch = rolling_kernels.stoch(self.high, self.low, self.close, 14, 3, matype, 3, matype)
+            for actual, expected in zip(stoch.T, talib.STOCH(self.high, self.low, self.close, 14, 3, matype, 3, matype)):
+                self.assertMatches(actual, expected)
+            bands = rolling_kernels.bollinger_bands(self.close, 20, 2, 2, matype)
+            for actual, expected in zip(bands.T, talib.BBANDS(self.close, 20, 2, 2, matype)):
+                self.assertMatches(actual, expected)
+
+    def test_feature_engine_backends_agree(self):
+        expected = FeatureEngine(INDICATORS_CONFIG, backend="talib").compute(self.df)
+        actual = FeatureEngine(INDICATORS_CONFIG, backend="numpy").compute(self.df)
+        self.assertEqual(list(actual.columns), list(expected.columns))
+        self.assertEqual(len(actual), len(expected))
+        for column in FeatureEngine(INDICATORS_CONFIG).columns:
+            self.assertMatches(actual[column].to_numpy(), expected[column].to_numpy())
+
+class TestIndicatorKernels(unittest.TestCase):
+    def test_flat_series_reads_zero_like_talib(self):
+        flat = np.full(50, 100.0)
+        self.assertTrue((kernels.rsi(flat, 14, smoothing="wilder")[14:] == 0).all())
+        stoch = rolling_kernels.stoch(flat, flat, flat, 5, 3, 0, 3, 0)
+        self.assertTrue((stoch[8:] == 0).all())
+
+    def test_unsupported_options(self):
+        with self.assertRaises(ValueError):
+            kernels.moving_average(np.arange(10.0), 3, matype=9)
+        with self.assertRaises(ValueError):
+            FeatureEngine([{"name": "Percentage Price Oscillator (PPO)", "params": {"fastperiod": 12, "slowperiod": 26, "matype": 9}}])
+        with self.assertRaises(ValueError):
+            FeatureEngine([], backend="cython")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+#python -m unittest discover -s tests/aimodel -p "test_labeling_engine.py"
+
+import unittest
+import numpy as np
+import pandas as pd
+from aimodel.labeling_engine import LabelingEngine
+from benchmarks.feature_memory import synthetic_ohlcv
+from benchmarks.labeling import LABEL_CONFIGS, legacy_add_future_close_and_multiclass_label
+from training.labeling import add_future_close_and_multiclass_label
+
+class TestVectorizedLabeling(unittest.TestCase):
+    def setUp(self):
+        self.df = synthetic_ohlcv(5000)
+
+    def test_methods_match_legacy_implementations(self):
+        for name, label_config, legacy in LABEL_CONFIGS:
+            with self.subTest(method=name):
+                actual = LabelingEngine(label_config).apply_labeling_strategy(self.df)
+                expected = legacy(self.df, **label_config["params"])
+                if name == "next_step":
+                    # The legacy version kept the tail rows without a future close, labeled HOLD
+                    expected = expected.iloc[:len(actual)]
+                self.assertEqual(list(actual.columns), list(expected.columns))
+                pd.testing.assert_index_equal(actual.index, expected.index)
+                np.testing.assert_array_equal(np.asarray(actual["label"]), np.asarray(expected["label"]))
+                for column in ("predicted_return", "touch_bars", "touch_time"):
+                    if column in expected:
+                        np.testing.assert_array_equal(actual[column], expected[column])
+                if "realized_return" in expected:
+                    np.testing.assert_allclose(actual["realized_return"], expected["realized_return"], rtol=1e-12)
+
+    def test_int8_labels(self):
+        label_config = LABEL_CONFIGS[0][1]
+        labeled = LabelingEngine(label_config).apply_labeling_strategy(self.df)
+        self.assertEqual(labeled["label"].dtype, np.int8)
+        self.assertTrue(np.isin(labeled["label"], [-1, 0, 1]).all())
+        self.assertEqual(LabelingEngine(label_config, label_dtype=np.int64).apply_labeling_strategy(self.df)["label"].dtype, np.int64)
+
+    def test_training_multiclass_label_matches_legacy(self):
+        actual = add_future_close_and_multiclass_label(self.df, label_dtype=np.int8)
+        expected = legacy_add_future_close_and_multiclass_label(self.df)
+        self.assertEqual(actual["label"].dtype, np.int8)
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    def test_triple_barrier_uses_first_touch_of_the_path(self):
+        # The high touches the upper barrier on bar 2 although the close at maxTime is below the entry
+        df = pd.DataFrame({
+            "close": [100.0, 100.5, 101.0, 99.0, 98.0, 97.0],
+            "high": [100.0, 101.0, 103.0, 99.5, 98.5, 97.5],
+            "low": [100.0, 100.0, 100.5, 97.0, 97.5, 96.5],
+        })
+        label_config = {"method": "Triple-Barrier Labeling", "params": {"upper_barrier": 0.02, "lower_barrier": 0.02, "maxTime": 3}}
+        labeled = LabelingEngine(label_config).apply_labeling_strategy(df)
+        self.assertEqual(list(labeled["label"]), [1, 1, -1])
+        self.assertEqual(list(labeled["touch_bars"]), [2, 1, 1])
+        np.testing.assert_allclose(labeled["realized_return"], [0.02, 0.02, -0.02])
+
+    def test_triple_barrier_atr_scaled_barriers(self):
+        label_config = {"method": "Triple-Barrier Labeling", "params": {"upper_barrier": 3.0, "lower_barrier": 3.0, "maxTime": 10, "atr_period": 14}}
+        labeled = LabelingEngine(label_config).apply_labeling_strategy(self.df)
+        # ATR needs 14 bars of history and the last 10 rows have no full window
+        self.assertEqual(len(labeled), len(self.df) - 24)
+        touched = labeled["label"] != 0
+        self.assertTrue(touched.any() and (~touched).any())
+        self.assertTrue((labeled.loc[touched, "touch_bars"] <= 10).all())
+        self.assertTrue((np.sign(labeled.loc[touched, "realized_return"]) == labeled.loc[touched, "label"]).all())
+
+    def test_label_sweep_matches_individual_labeling(self):
+        engine = LabelingEngine({"method": "Next-Step Classification"})
+        results = engine.label_sweep(self.df, [1, 5, 20], [0.0, 0.001, 0.005])
+        self.assertEqual(len(results), 9)
+        for result in results:
+            label_config = {"method": "Next-Step Classification", "params": {
+                "horizon": result["horizon"], "threshold": result["threshold"], "threshold_type": "percent"}}
+            labeled = LabelingEngine(label_config).apply_labeling_strategy(self.df)
+            expected = {label: int((labeled["label"] == label).sum()) for label in (-1, 0, 1)}
+            self.assertEqual(result["label_distribution"], expected)
+            self.assertEqual(result["total"], len(labeled))
+            self.assertAlmostEqual(sum(result["label_proportions"].values()), 1.0)
+            self.assertTrue(0.0 <= result["normalized_entropy"] <= 1.0)
+
+    def test_bin_edges_follow_pd_cut(self):
+        df = pd.DataFrame({"close": [100.0, 101.0, 99.0, 99.0, 105.0, 104.0]})
+        label_config = {"method": "Multi-Class Trend Labeling", "params": {"timeHorizon": 1, "bins": [-0.02, 0.0, 0.02], "bin_labels": ["down", "up"]}}
+        labeled = LabelingEngine(label_config).apply_labeling_strategy(df)
+        expected = pd.cut((df["close"].shift(-1) - df["close"]) / df["close"], bins=[-0.02, 0.0, 0.02], labels=["down", "up"]).dropna()
+        pd.testing.assert_index_equal(labeled.index, expected.index)
+        self.assertEqual(list(labeled["label"]), list(expected))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+#python -m unittest discover -s tests/aimodel -p "test_model_engine.py"
+
+import unittest
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from xgboost import XGBClassifier
+from aimodel.incremental_training import continue_training
+from aimodel.model_engine import FOREST_BATCH_TREES, ModelEngine, adopt_booster
+
+class TestModelEngineTraining(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(size=(3000, 4)), columns=["a", "b", "c", "d"])
+        self.y = pd.Series(np.digitize(self.X["a"] + rng.normal(size=3000), [-0.5, 0.5]))
+
+    def engine(self, method, params):
+        engine = ModelEngine.from_params(method, params)
+        engine.create_model()
+        return engine
+
+    def test_full_training_by_default(self):
+        summary = self.engine("xgboost", {"n_estimators": 15, "max_depth": 2}).train_model(self.X, self.y)
+        self.assertEqual((summary["requested_rounds"], summary["used_rounds"], summary["stopped_by"]), (15, 15, None))
+
+    def test_early_stopping_keeps_the_best_rounds(self):
+        engine = self.engine("xgboost", {"n_estimators": 500, "learning_rate": 0.5, "max_depth": 6})
+        summary = engine.train_model(self.X, self.y, early_stopping={"rounds": 5, "validation_size": 0.2, "gap": 10})
+        self.assertEqual(summary["stopped_by"], "early_stopping")
+        self.assertLess(summary["used_rounds"], 500)
+        self.assertEqual(engine.model.get_booster().num_boosted_rounds(), summary["used_rounds"])
+        self.assertIsNone(engine.model.get_params()["early_stopping_rounds"])
+        # The saved model can still be updated without a validation set
+        updated = continue_training(engine.model, self.X.iloc[:200], self.y.iloc[:200], n_estimators=3)
+        self.assertEqual(updated.get_booster().num_boosted_rounds(), summary["used_rounds"] + 3)
+
+    def test_time_budget_stops_tree_growth(self):
+        booster = self.engine("xgboost", {"n_estimators": 200, "max_depth": 2})
+        summary = booster.train_model(self.X, self.y, time_budget=0)
+        self.assertEqual((summary["used_rounds"], summary["stopped_by"]), (1, "time_budget"))
+        self.assertIsNone(booster.model.get_params()["callbacks"])
+
+        forest = self.engine("randomForest", {"n_estimators": 50, "max_depth": 3})
+        summary = forest.train_model(self.X, self.y, time_budget=0)
+        self.assertEqual((summary["used_rounds"], summary["stopped_by"]), (FOREST_BATCH_TREES, "time_budget"))
+        self.assertEqual(len(forest.model.estimators_), FOREST_BATCH_TREES)
+        self.assertFalse(forest.model.warm_start)
+
+    def test_sample_weights_reach_every_fit(self):
+        # Rows of class 2 without weight cannot be learned, whichever path fits the model
+        weight = np.where(self.y == 2, 0.0, 1.0)
+        for method, params, early_stopping in [
+            ("xgboost", {"n_estimators": 20, "max_depth": 3}, {"rounds": 5, "gap": 10}),
+            ("randomForest", {"n_estimators": 10, "max_depth": 4}, None),
+            ("sgdClassifier", {"random_state": 0}, None),
+        ]:
+            engine = self.engine(method, params)
+            engine.train_model(self.X, self.y, early_stopping=early_stopping, sample_weight=weight)
+            self.assertLess((engine.model.predict(self.X) == 2).mean(), 0.02, method)
+
+    def test_adopted_booster_predicts_like_a_fitted_model(self):
+        # adopt_booster sets private XGBClassifier attributes; this fails if an XGBoost upgrade changes them
+        fitted = XGBClassifier(n_estimators=10, max_depth=2).fit(self.X, self.y)
+        adopted = adopt_booster(XGBClassifier(n_estimators=10, max_depth=2), fitted.get_booster().copy(), n_classes=3)
+        np.testing.assert_allclose(adopted.predict_proba(self.X), fitted.predict_proba(self.X))
+        np.testing.assert_array_equal(adopted.predict(self.X), fitted.predict(self.X))
+        self.assertEqual((adopted.n_classes_, adopted.get_booster().num_boosted_rounds()), (3, 10), xgb.__version__)
+
+if __name__ == "__main__":
+    unittest.main()
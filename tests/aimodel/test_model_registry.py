@@ -0,0 +1,61 @@
+#python -m unittest discover -s tests/aimodel -p "test_model_registry.py"
+
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from aimodel.model_registry import ModelRegistry, data_hash, load_artifact
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.registry = ModelRegistry(self.folder.name)
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(size=(500, 3)), columns=["a", "b", "c"])
+        self.y = pd.Series((self.X["a"] > 0).astype(int), name="label")
+        self.model = RandomForestClassifier(n_estimators=10, random_state=0).fit(self.X, self.y)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_versions_and_metadata(self):
+        self.assertIsNone(self.registry.latest_version("rf"))
+        first = self.registry.register("rf", self.model, self.X.columns, label_mapping={-1: 0, 0: 1, 1: 2},
+                                       data_hash=data_hash(self.X, self.y), metrics={"accuracy": 0.9})
+        second = self.registry.register("rf", self.model, self.X.columns, parent_version=1)
+        self.assertEqual((first["version"], second["version"]), (1, 2))
+        self.assertEqual(self.registry.versions("rf"), [1, 2])
+
+        metadata = self.registry.metadata("rf", 1)
+        self.assertEqual(metadata["feature_columns"], ["a", "b", "c"])
+        self.assertEqual(metadata["label_mapping"], {"-1": 0, "0": 1, "1": 2})
+        self.assertEqual(metadata["metrics"], {"accuracy": 0.9})
+        self.assertEqual(self.registry.metadata("rf")["parent_version"], 1)
+        self.assertFalse([entry for entry in os.listdir(os.path.join(self.folder.name, "rf")) if entry.startswith(".staging")])
+        with self.assertRaises(FileNotFoundError):
+            self.registry.metadata("rf", 3)
+
+    def test_memory_mapped_cached_load(self):
+        self.registry.register("rf", self.model, self.X.columns)
+        model, metadata = self.registry.load("rf")
+        np.testing.assert_array_equal(model.predict(self.X), self.model.predict(self.X))
+
+        arrays = {"weights": np.arange(100_000, dtype=np.float64)}
+        self.registry.register("arrays", arrays, [])
+        self.assertIsInstance(self.registry.load("arrays")[0]["weights"], np.memmap)
+
+        again, _ = self.registry.load("rf")
+        self.assertIs(model, again)
+        private, _ = self.registry.load("rf", mmap_mode=None, cache=False)
+        self.assertIsNot(private, model)
+        self.assertIs(load_artifact(self.registry.artifact_path("rf")), model)
+
+    def test_data_hash(self):
+        self.assertEqual(data_hash(self.X, self.y), data_hash(self.X.copy(), self.y.copy()))
+        self.assertNotEqual(data_hash(self.X, self.y), data_hash(self.X.iloc[:-1], self.y.iloc[:-1]))
+        self.assertNotEqual(data_hash(self.X), data_hash(self.X.rename(columns={"a": "z"})))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+#python -m unittest discover -s tests/aimodel -p "test_out_of_core.py"
+
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from xgboost import XGBClassifier
+from aimodel.columnar_store import ColumnarStore
+from aimodel.labeling_engine import LabelingEngine
+from aimodel.out_of_core import StoreChunks, chunk_rows_for_budget, predict_out_of_core, train_out_of_core
+
+LABEL_CONFIG = {"method": "Next-Step Classification", "params": {"horizon": 3, "threshold": 0.001, "threshold_type": "percent"}}
+MAPPING = {-1: 0, 0: 1, 1: 2}
+
+class TestOutOfCore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        n = 5000
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+        # The next closes are predictable from the momentum feature, so a trained model beats chance
+        self.df = pd.DataFrame({
+            "close_time": np.arange(n, dtype=np.int64) * 60_000,
+            "close": close,
+            "momentum": np.concatenate([np.log(close[3:] / close[:-3]), np.zeros(3)]) + rng.normal(0, 1e-4, n),
+            "noise": rng.normal(size=n),
+        })
+        self.store = ColumnarStore(self.tmp.name)
+        for start in range(0, n, 1200):
+            self.store.append(self.df.iloc[start:start + 1200])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunks_match_labeling_the_whole_range(self):
+        chunks = StoreChunks(self.store, ["momentum", "noise"], LABEL_CONFIG, chunk_rows=700, rows=slice(0, 4000), label_mapping=MAPPING)
+        X = pd.concat([X for X, _ in chunks], ignore_index=True)
+        y = np.concatenate([y for _, y in chunks])
+        expected = LabelingEngine(LABEL_CONFIG).apply_labeling_strategy(self.df)
+        expected = expected[expected.index < 4000]
+        np.testing.assert_array_equal(y, expected["label"].map(MAPPING).to_numpy())
+        np.testing.assert_array_equal(X.to_numpy(), expected[["momentum", "noise"]].to_numpy(dtype=np.float32))
+        self.assertEqual(chunks.classes, {0, 1, 2})
+        self.assertEqual(chunks.data_hash(), StoreChunks(self.store, ["momentum", "noise"], LABEL_CONFIG, 1500, slice(0, 4000), MAPPING).data_hash())
+
+    def test_chunks_read_the_labeling_warmup(self):
+        df = self.df.assign(high=self.df["close"] * 1.001, low=self.df["close"] * 0.999)
+        store = ColumnarStore(f"{self.tmp.name}/ohlc")
+        store.append(df)
+        label_configs = [
+            {"method": "Triple-Barrier Labeling", "params": {"upper_barrier": 1.0, "lower_barrier": 1.0, "maxTime": 5, "atr_period": 14}},
+            {"method": "Event-Based Labeling", "params": {"lookahead": 5, "eventDefinition": [
+                "momentum crosses above 0", {"expression": "close < close[3]", "label": "SELL"}]}},
+        ]
+        for label_config in label_configs:
+            chunks = StoreChunks(store, ["momentum", "noise"], label_config, chunk_rows=700, rows=slice(0, 4000))
+            y = np.concatenate([y for _, y in chunks])
+            expected = LabelingEngine(label_config).apply_labeling_strategy(df)
+            expected = expected[expected.index < 4000]
+            np.testing.assert_array_equal(y, expected["label"].to_numpy())
+            self.assertEqual(chunks.labeled_rows, len(expected))
+
+    def test_trains_xgboost_in_external_memory(self):
+        train = StoreChunks(self.store, ["momentum", "noise"], LABEL_CONFIG, 1000, slice(0, 4000), MAPPING)
+        test = StoreChunks(self.store, ["momentum", "noise"], LABEL_CONFIG, 1000, slice(4003, None), MAPPING)
+        model, summary = train_out_of_core(XGBClassifier(n_estimators=20, max_depth=3), train, cache_dir=self.tmp.name)
+        self.assertEqual((summary["mode"], summary["chunks"], summary["rows"]), ("external_memory", 4, 4000))
+        y_test, y_pred = predict_out_of_core(model, test)
+        self.assertGreater((y_test == y_pred).mean(), 0.8)
+        self.assertEqual(model.predict_proba(self.df[["momentum", "noise"]].iloc[:5]).shape, (5, 3))
+
+    def test_partial_fit_epochs(self):
+        train = StoreChunks(self.store, ["momentum", "noise"], LABEL_CONFIG, 1000, slice(0, 4000))
+        model, summary = train_out_of_core(SGDClassifier(loss="log_loss", random_state=0), train, epochs=3)
+        self.assertEqual((summary["mode"], summary["epochs"]), ("partial_fit", 3))
+        y_test, y_pred = predict_out_of_core(model, StoreChunks(self.store, ["momentum", "noise"], LABEL_CONFIG, 1000, slice(4003, None)))
+        self.assertGreater((y_test == y_pred).mean(), 0.7)
+        self.assertEqual(list(model.classes_), [-1, 0, 1])
+
+    def test_rejects_unsupported_inputs(self):
+        with self.assertRaises(ValueError):
+            StoreChunks(self.store, ["momentum"], {"method": "Multi-Class Trend Labeling", "params": {"timeHorizon": 3, "bins": 3, "bin_labels": [0, 1, 2]}}, 1000)
+        with self.assertRaises(ValueError):
+            train_out_of_core(object(), StoreChunks(self.store, ["momentum"], LABEL_CONFIG, 1000))
+        self.assertEqual(chunk_rows_for_budget(32, 1), 1000)
+        self.assertEqual(chunk_rows_for_budget(32, 512), 512 * 1024 * 1024 // (32 * 48))
+
+if __name__ == "__main__":
+    unittest.main()
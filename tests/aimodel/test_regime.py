@@ -0,0 +1,87 @@
+#python -m unittest discover -s tests/aimodel -p "test_regime.py"
+
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+from xgboost import XGBClassifier
+from aimodel.feature_matrix import FeatureMatrix
+from aimodel.regime import BEAR, BULL, REGIME_COLUMN, SIDEWAYS, RegimeClassifier, RegimeRouter
+
+class TestRegimeClassifier(unittest.TestCase):
+    def test_trends_and_warmup(self):
+        close = np.concatenate([np.full(50, 100.0), np.linspace(100, 150, 100), np.linspace(150, 90, 100)])
+        regimes = RegimeClassifier(window=20, band=0.01).classify(close)
+        self.assertTrue((regimes[:50] == SIDEWAYS).all())
+        self.assertEqual(regimes[140], BULL)
+        self.assertEqual(regimes[240], BEAR)
+
+    def test_grace_period_matches_bar_by_bar_switching(self):
+        rng = np.random.default_rng(0)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 3000)))
+        raw = RegimeClassifier(window=30, band=0.005).classify(close)
+        confirmed = RegimeClassifier(window=30, band=0.005, confirm_bars=4).classify(close)
+        expected, current, run = [], SIDEWAYS, 0
+        for i, regime in enumerate(raw):
+            run = run + 1 if i and regime == raw[i - 1] else 1
+            if run >= 4:
+                current = regime
+            expected.append(current)
+        np.testing.assert_array_equal(confirmed, expected)
+        self.assertLess(np.count_nonzero(np.diff(confirmed)), np.count_nonzero(np.diff(raw)))
+
+class TestRegimeRouter(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 3000
+        self.X = pd.DataFrame(rng.normal(size=(n, 2)), columns=["a", "b"])
+        self.regimes = rng.integers(0, 3, n)
+        # Each regime follows its own rule, which a single shallow tree cannot learn for all of them at once
+        y = np.where(self.regimes == BULL, self.X["a"] > 0, np.where(self.regimes == BEAR, self.X["a"] < 0, self.X["b"] > 0))
+        self.matrix = FeatureMatrix(self.X, y.astype(int))
+        self.estimator = DecisionTreeClassifier(max_depth=2, random_state=0)
+        self.fallback = DecisionTreeClassifier(max_depth=2, random_state=0).fit(self.X, self.matrix.labels)
+
+    def test_routes_each_bar_to_its_regime_model(self):
+        router = RegimeRouter.train(self.estimator, self.matrix, self.regimes, self.fallback, min_rows=100, n_jobs=2)
+        inputs = self.X.assign(**{REGIME_COLUMN: self.regimes})
+        predictions = router.predict(inputs)
+        expected = [router.models[router.routes[regime]].predict(self.X.iloc[[i]])[0] for i, regime in enumerate(self.regimes[:200])]
+        np.testing.assert_array_equal(predictions[:200], expected)
+        self.assertGreater((predictions == self.matrix.labels).mean(), 0.95)
+        self.assertLess((self.fallback.predict(self.X) == self.matrix.labels).mean(), 0.9)
+        self.assertEqual(router.predict_proba(inputs.iloc[[5]]).shape, (1, 2))
+        self.assertEqual({summary["model"] for summary in router.summary.values()}, {"regime"})
+
+    def test_small_regimes_use_the_fallback(self):
+        regimes = np.where(np.arange(len(self.X)) < 50, BEAR, SIDEWAYS)
+        router = RegimeRouter.train(self.estimator, self.matrix, regimes, self.fallback, min_rows=100, n_jobs=1)
+        self.assertEqual(router.summary["bear"]["model"], "fallback")
+        self.assertEqual(router.summary["bull"]["reason"], "fewer than 100 rows")
+        self.assertIs(router.models[router.routes[BEAR]], self.fallback)
+        with self.assertRaises(ValueError):
+            router.predict(self.X)
+
+    def test_regime_models_use_the_sample_weights(self):
+        weights = np.random.default_rng(1).uniform(0.1, 5.0, len(self.X))
+        matrix = FeatureMatrix(self.X, self.matrix.labels, sample_weight=weights)
+        router = RegimeRouter.train(self.estimator, matrix, self.regimes, self.fallback, min_rows=100, n_jobs=1)
+        rows = np.flatnonzero(self.regimes == BULL)
+        expected = DecisionTreeClassifier(max_depth=2, random_state=0).fit(self.X.iloc[rows], self.matrix.labels[rows], sample_weight=weights[rows])
+        np.testing.assert_allclose(router.models[router.routes[BULL]].tree_.value, expected.tree_.value)
+
+    def test_regime_models_split_the_cores(self):
+        estimator = RandomForestClassifier(n_estimators=5, max_depth=2, n_jobs=-1, random_state=0)
+        router = RegimeRouter.train(estimator, self.matrix, self.regimes, self.fallback, min_rows=100, n_jobs=6)
+        self.assertEqual({model.n_jobs for model in router.models[1:]}, {2})
+        self.assertEqual(estimator.n_jobs, -1)
+
+    def test_time_budget_stops_regime_models(self):
+        estimator = XGBClassifier(n_estimators=50, max_depth=2)
+        router = RegimeRouter.train(estimator, self.matrix, self.regimes, self.fallback, min_rows=100, n_jobs=1, time_budget=0)
+        self.assertEqual({(summary["used_rounds"], summary["stopped_by"]) for summary in router.summary.values()}, {(1, "time_budget")})
+        self.assertEqual(router.models[1].get_booster().num_boosted_rounds(), 1)
+
+if __name__ == "__main__":
+    unittest.main()
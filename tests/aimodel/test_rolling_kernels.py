@@ -0,0 +1,60 @@
+#python -m unittest discover -s tests/aimodel -p "test_rolling_kernels.py"
+
+import unittest
+import numpy as np
+import pandas as pd
+from aimodel import rolling_kernels
+from aimodel.feature_engine import FeatureEngine
+from benchmarks.feature_memory import synthetic_ohlcv
+
+class TestRollingKernels(unittest.TestCase):
+    def setUp(self):
+        self.df = synthetic_ohlcv(3000)
+        self.close = self.df["close"]
+        self.returns = pd.Series(rolling_kernels.log_returns(self.close.to_numpy()))
+
+    def assertMatches(self, actual, expected, rtol=1e-7):
+        expected = np.asarray(expected, dtype=float)
+        np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+        np.testing.assert_allclose(actual, expected, rtol=rtol)
+
+    def test_moments_match_pandas(self):
+        for window in (20, 200, 2000):
+            self.assertMatches(rolling_kernels.rolling_std(self.returns.to_numpy(), window), self.returns.rolling(window).std())
+            self.assertMatches(rolling_kernels.rolling_skew(self.returns.to_numpy(), window), self.returns.rolling(window).skew())
+            self.assertMatches(rolling_kernels.rolling_kurt(self.returns.to_numpy(), window), self.returns.rolling(window).kurt(), rtol=1e-6)
+
+    def test_extremes_match_pandas_exactly(self):
+        close = self.close.copy()
+        close.iloc[500] = np.nan
+        for window in (1, 2, 20, 200, 2000):
+            np.testing.assert_array_equal(rolling_kernels.rolling_max(close.to_numpy(), window), close.rolling(window).max())
+            np.testing.assert_array_equal(rolling_kernels.rolling_min(close.to_numpy(), window), close.rolling(window).min())
+
+    def test_realized_volatility_and_volume_weighted_return(self):
+        volume = self.df["volume"]
+        simple = self.close.pct_change()
+        self.assertMatches(rolling_kernels.realized_volatility(self.close.to_numpy(), 20), np.sqrt((self.returns ** 2).rolling(20).sum()))
+        self.assertMatches(
+            rolling_kernels.volume_weighted_return(self.close.to_numpy(), volume.to_numpy(), 20),
+            (simple * volume).rolling(20).sum() / volume.where(simple.notna()).rolling(20).sum(),
+        )
+
+    def test_feature_engine_rolling_statistics(self):
+        config = [
+            {"name": "Rolling Z-Score", "params": {"window": 20}},
+            {"name": "Realized Volatility", "params": {"window": 30}},
+            {"name": "Rolling Skew", "params": {"window": 50}},
+            {"name": "Rolling Kurtosis", "params": {"window": 50}},
+            {"name": "Rolling Min/Max Distance", "params": {"window": 100}},
+            {"name": "Volume-Weighted Return", "params": {"window": 20}},
+        ]
+        result = FeatureEngine(config).compute(self.df)
+        self.assertEqual(len(result), len(self.df) - 99)
+        self.assertTrue((result["close_dist_max_100"] <= 0).all())
+        self.assertTrue((result["close_dist_min_100"] >= 0).all())
+        expected = (self.close - self.close.rolling(20).mean()) / self.close.rolling(20).std()
+        np.testing.assert_allclose(result["close_zscore_20"], expected.iloc[99:], rtol=1e-6)
+
+if __name__ == "__main__":
+    unittest.main()
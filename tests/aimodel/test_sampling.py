@@ -0,0 +1,57 @@
+#python -m unittest discover -s tests/aimodel -p "test_sampling.py"
+
+import unittest
+import numpy as np
+from aimodel.sampling import MajoritySampler
+
+class TestMajoritySampler(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.labels = rng.choice([-1, 0, 1], size=20000, p=[0.1, 0.8, 0.1])
+
+    def test_stratified_keeps_minorities_and_reweights(self):
+        result = MajoritySampler("stratified", max_ratio=1.5).sample(self.labels)
+        rows, weights = result["rows"], result["sample_weight"]
+        kept = self.labels[rows]
+        self.assertTrue((np.diff(rows) > 0).all())
+        for label in (-1, 1):
+            self.assertEqual((kept == label).sum(), (self.labels == label).sum())
+        largest_minority = max((self.labels == -1).sum(), (self.labels == 1).sum())
+        self.assertAlmostEqual((kept == 0).sum() / (1.5 * largest_minority), 1.0, delta=0.05)
+        # The weighted sample has the class counts of the full training set
+        self.assertAlmostEqual(weights[kept == 0].sum() / (self.labels == 0).sum(), 1.0, delta=0.05)
+        self.assertTrue((weights[kept != 0] == 1).all())
+        summary = result["summary"]
+        self.assertEqual((summary["rows_before"], summary["rows_after"]), (20000, len(rows)))
+        self.assertEqual(summary["label_distribution_after"][1], summary["label_distribution_before"][1])
+
+    def test_time_decay_prefers_recent_rows(self):
+        result = MajoritySampler("time_decay", max_ratio=1.0, half_life=500, reweight=False).sample(self.labels)
+        rows = result["rows"]
+        hold = rows[self.labels[rows] == 0]
+        self.assertIsNone(result["sample_weight"])
+        self.assertGreater((hold >= 15000).sum(), 3 * (hold < 5000).sum())
+        newest_hold = np.flatnonzero(self.labels == 0)[-50:]
+        self.assertTrue(np.isin(newest_hold, rows).all())
+        self.assertAlmostEqual(len(hold) / result["summary"]["label_distribution_before"][1], 1.0, delta=0.1)
+
+    def test_time_decay_with_a_short_half_life(self):
+        # The oldest rows decay far below the smallest float over 1500 half-lives
+        labels = np.where(np.random.default_rng(0).random(300_000) < 0.9, 0, 1)
+        with np.errstate(divide="raise", invalid="raise"):
+            result = MajoritySampler("time_decay", half_life=200, random_state=0).sample(labels)
+        target = (labels == 1).sum()
+        kept_hold = result["summary"]["label_distribution_after"][0]
+        self.assertAlmostEqual(kept_hold / target, 1.0, delta=0.05)
+        self.assertTrue(np.isfinite(result["sample_weight"]).all())
+
+    def test_balanced_sets_are_left_alone(self):
+        labels = np.tile([-1, 0, 1], 100)
+        result = MajoritySampler().sample(labels)
+        np.testing.assert_array_equal(result["rows"], np.arange(300))
+        self.assertEqual(result["summary"]["reduction"], 0.0)
+        with self.assertRaises(ValueError):
+            MajoritySampler("random")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+#python -m unittest discover -s tests/aimodel -p "test_stage_profiler.py"
+
+import os
+import pstats
+import tempfile
+import time
+import unittest
+import numpy as np
+import pandas as pd
+from aimodel.stage_profiler import StageProfiler
+
+class TestStageProfiler(unittest.TestCase):
+    def test_stages_record_time_memory_and_shape(self):
+        progress = []
+        profiler = StageProfiler(lambda stage, value: progress.append((stage, value))).start()
+        with profiler.stage("fetch", 0.1) as stage:
+            stage.shape(pd.DataFrame(np.zeros((100, 3))))
+        with profiler.stage("allocate", 0.5) as stage:
+            block = np.ones((4_000_000,))
+            time.sleep(0.02)
+            stage.shape(block)
+        del block
+        with profiler.stage("sleep"):
+            time.sleep(0.05)
+
+        self.assertEqual(progress, [("fetch", 0.1), ("allocate", 0.5)])
+        fetch, allocate, sleep = profiler.summary()["stages"]
+        self.assertEqual((fetch["stage"], fetch["rows"], fetch["columns"]), ("fetch", 100, 3))
+        self.assertEqual((allocate["rows"], allocate["columns"]), (4_000_000, None))
+        if allocate["peak_memory_delta_bytes"] is not None:
+            self.assertGreater(allocate["peak_memory_delta_bytes"], 16 * 2**20)
+        self.assertGreaterEqual(sleep["wall_seconds"], 0.05)
+        self.assertLess(sleep["cpu_seconds"], sleep["wall_seconds"])
+
+    def test_failed_stage_is_recorded(self):
+        profiler = StageProfiler().start()
+        with self.assertRaises(RuntimeError):
+            with profiler.stage("train_model", 0.7):
+                raise RuntimeError("cancelled")
+        self.assertTrue(profiler.stages[0]["failed"])
+
+    def test_cprofile_stats_are_dumped(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "builds", "build.pstats")
+            profiler = StageProfiler(profile_path=path).start()
+            with profiler.stage("work"):
+                sorted(range(10_000), key=lambda value: -value)
+            profiler.stop()
+            self.assertEqual(profiler.summary()["pstats_path"], path)
+            self.assertGreater(pstats.Stats(path).total_calls, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+#python -m unittest discover -s tests/aimodel -p "test_time_series_cv.py"
+
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from aimodel.labeling_engine import LabelingEngine
+from aimodel.time_series_cv import WalkForwardCV, holdout_split
+
+class TestWalkForwardCV(unittest.TestCase):
+    def test_folds_never_train_on_or_near_the_test_window(self):
+        cv = WalkForwardCV(n_splits=4, purge=5, embargo=3)
+        folds = cv.split(1000)
+        self.assertEqual(len(folds), 4)
+        self.assertEqual(folds[-1][1].stop, 1000)
+        for (train, test), (_, next_test) in zip(folds, folds[1:] + [(None, None)]):
+            self.assertEqual(train.start, 0)
+            self.assertEqual(test.start - train.stop, 8)
+            if next_test is not None:
+                self.assertEqual(test.stop, next_test.start)
+
+    def test_rolling_training_window(self):
+        folds = WalkForwardCV(n_splits=3, test_size=100, train_size=200, purge=2).split(1000)
+        self.assertEqual([(train.start, train.stop, test.start, test.stop) for train, test in folds],
+                         [(498, 698, 700, 800), (598, 798, 800, 900), (698, 898, 900, 1000)])
+
+    def test_too_few_rows(self):
+        with self.assertRaises(ValueError):
+            WalkForwardCV(n_splits=5, test_size=100, purge=10).split(500)
+        with self.assertRaises(ValueError):
+            holdout_split(10, test_size=0.5, gap=5)
+
+    def test_holdout_split(self):
+        train, test = holdout_split(100, test_size=0.2, gap=3)
+        self.assertEqual((train.start, train.stop, test.start, test.stop), (0, 77, 80, 100))
+
+    def test_parallel_evaluation_matches_serial(self):
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(3000, 4)), columns=list("abcd"))
+        y = pd.Series((X["a"] + 0.5 * rng.normal(size=3000) > 0).astype(int))
+        cv = WalkForwardCV(n_splits=3, purge=1)
+        parallel = cv.evaluate(LogisticRegression(), X, y, n_jobs=2)
+        serial = cv.evaluate(LogisticRegression(), X, y, n_jobs=1)
+        self.assertEqual(len(parallel["folds"]), 3)
+        for a, b in zip(parallel["folds"], serial["folds"]):
+            self.assertEqual(a["accuracy"], b["accuracy"])
+            self.assertGreater(a["fit_seconds"], 0)
+        self.assertGreater(parallel["mean"]["accuracy"], 0.7)
+
+    def test_label_horizon(self):
+        self.assertEqual(LabelingEngine({"method": "Triple-Barrier Labeling", "params": {"maxTime": 12}}).label_horizon(), 12)
+        self.assertEqual(LabelingEngine({"method": "Next-Step Classification", "params": {"horizon": 3}}).label_horizon(), 3)
+        self.assertEqual(LabelingEngine({"method": "Unknown"}).label_horizon(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
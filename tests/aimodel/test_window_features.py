@@ -0,0 +1,46 @@
+#python -m unittest discover -s tests/aimodel -p "test_window_features.py"
+
+import unittest
+import numpy as np
+import pandas as pd
+from aimodel.window_features import window_matrix, lag_matrix, rolling_returns, rolling_differences
+from aimodel.feature_engine import FeatureEngine
+
+class TestWindowFeatures(unittest.TestCase):
+    def setUp(self):
+        self.close = pd.Series(np.linspace(100.0, 130.0, 31) + np.sin(np.arange(31)))
+
+    def test_lag_matrix_matches_shift(self):
+        lags = lag_matrix(self.close.to_numpy(), 5)
+        self.assertEqual(lags.shape, (31, 5))
+        for lag in range(1, 6):
+            np.testing.assert_array_equal(lags[:, lag - 1], self.close.shift(lag).to_numpy())
+
+    def test_lag_matrix_is_a_view(self):
+        windows = window_matrix(self.close.to_numpy(), 4)
+        lags = lag_matrix(self.close.to_numpy(), 3)
+        self.assertIsNotNone(windows.base)
+        self.assertFalse(lags.flags.owndata)
+        self.assertFalse(lags.flags.writeable)
+
+    def test_returns_and_differences(self):
+        returns = rolling_returns(self.close.to_numpy(), [1, 3])
+        differences = rolling_differences(self.close.to_numpy(), [2])
+        np.testing.assert_allclose(returns[:, 1], self.close.pct_change(3).to_numpy())
+        np.testing.assert_allclose(differences[:, 0], self.close.diff(2).to_numpy())
+
+    def test_feature_engine_window_features(self):
+        df = pd.DataFrame({"close": self.close, "volume": self.close * 10})
+        config = [
+            {"name": "Lag Features", "params": {"lag_period": 3, "columns": ["close", "volume"]}},
+            {"name": "Rolling Returns", "params": {"periods": [1, 5]}},
+            {"name": "Rolling Differences", "params": {"periods": 2, "columns": ["volume"]}},
+        ]
+        result = FeatureEngine(config).compute(df)
+        self.assertEqual(len(result), len(df) - 5)
+        self.assertIn("volume_lag_3", result.columns)
+        np.testing.assert_allclose(result["close_return_5"], df["close"].pct_change(5).iloc[5:])
+        np.testing.assert_allclose(result["volume_diff_2"], df["volume"].diff(2).iloc[5:])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+#python -m unittest discover -s tests/training -p "test_realtime_prediction.py"
+
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+from aimodel.feature_engine import FeatureEngine, TRAINING_FEATURES_CONFIG
+from aimodel.feature_matrix import FeatureMatrix
+from aimodel.model_registry import ARTIFACT_FILE, ModelRegistry
+from aimodel.regime import REGIME_COLUMN, RegimeClassifier, RegimeRouter
+from benchmarks.feature_memory import synthetic_ohlcv
+from training.realtime_prediction import DEFAULT_FEATURE_COLUMNS, predict_realtime_data
+
+REGIME_CONFIG = {"window": 50, "band": 0.002}
+
+class TestRealtimePrediction(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.df = synthetic_ohlcv(3000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_regime_router_predicts_the_live_bar(self):
+        features = FeatureEngine(TRAINING_FEATURES_CONFIG).compute(self.df)
+        regimes = RegimeClassifier.from_config(REGIME_CONFIG).classify(self.df["close"])[features.index]
+        labels = np.random.default_rng(0).integers(0, 3, len(features))
+        matrix = FeatureMatrix(features[DEFAULT_FEATURE_COLUMNS], labels)
+        estimator = DecisionTreeClassifier(max_depth=3, random_state=0)
+        fallback = DecisionTreeClassifier(max_depth=3, random_state=0).fit(matrix.frame(), labels)
+        router = RegimeRouter.train(estimator, matrix, regimes, fallback, min_rows=100, n_jobs=1)
+        version = ModelRegistry(self.tmp.name).register(
+            "router", router, DEFAULT_FEATURE_COLUMNS + [REGIME_COLUMN], regimes={"config": REGIME_CONFIG, "models": router.summary}
+        )
+
+        realtime = {"close": self.df["close"].iloc[-1] * 1.01}
+        prediction = predict_realtime_data(realtime, self.df, os.path.join(version["path"], ARTIFACT_FILE))
+
+        live = pd.concat([self.df, self.df.iloc[[-1]].assign(close=realtime["close"], high=realtime["close"])], ignore_index=True)
+        live[REGIME_COLUMN] = RegimeClassifier.from_config(REGIME_CONFIG).classify(live["close"])
+        expected = router.predict(FeatureEngine(TRAINING_FEATURES_CONFIG).compute(live).iloc[[-1]])[0]
+        self.assertIsNotNone(prediction)
+        self.assertEqual(prediction, expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+#python -m unittest discover -s tests/training -p "test_training_scheduler.py"
+
+import unittest
+import numpy as np
+from benchmarks.training_scheduler import training_frame
+from training.model_training import create_model
+from training.training_scheduler import allocate_cores, train_models
+
+class TestTrainingScheduler(unittest.TestCase):
+    def test_allocation_stays_within_budget(self):
+        model_types = ["random_forest", "logistic_regression", "svm", "xgboost"]
+        for n_cores in (1, 2, 4, 8, 13):
+            with self.subTest(n_cores=n_cores):
+                concurrent, allocation = allocate_cores(model_types, n_cores)
+                self.assertEqual(concurrent, min(4, n_cores))
+                self.assertLessEqual(sum(allocation.values()), max(n_cores, 4))
+                self.assertEqual(allocation["logistic_regression"], 1)
+                self.assertEqual(allocation["svm"], 1)
+
+        concurrent, allocation = allocate_cores(model_types, 8)
+        self.assertEqual(sum(allocation.values()), 8)
+        self.assertEqual((allocation["random_forest"], allocation["xgboost"]), (3, 3))
+        self.assertEqual(allocate_cores(model_types, 8, max_concurrent=2)[0], 2)
+
+    def test_allocation_with_fewer_slots_than_models(self):
+        model_types = ["random_forest", "logistic_regression", "svm", "xgboost"]
+        concurrent, allocation = allocate_cores(model_types, 16, max_concurrent=2)
+        self.assertEqual(concurrent, 2)
+        self.assertEqual(allocation, {"random_forest": 8, "logistic_regression": 1, "svm": 1, "xgboost": 8})
+        # Any two fits running at once stay within the budget
+        self.assertLessEqual(allocation["random_forest"] + allocation["xgboost"], 16)
+        self.assertEqual(allocate_cores(model_types, 3, max_concurrent=2)[1]["xgboost"], 1)
+
+    def test_concurrent_models_match_serial_fits(self):
+        X, y = training_frame(2000)
+        model_types = ["random_forest", "logistic_regression"]
+        report = train_models(X, y, model_types, n_cores=2)
+        self.assertEqual(set(report["models"]), set(model_types))
+        self.assertGreater(report["wall_seconds"], 0)
+        self.assertAlmostEqual(report["serial_seconds"], sum(report["fit_seconds"].values()))
+        for model_type in model_types:
+            with self.subTest(model_type=model_type):
+                expected = create_model(model_type).fit(X, y).predict(X)
+                np.testing.assert_array_equal(report["models"][model_type].predict(X), expected)
+
+if __name__ == "__main__":
+    unittest.main()
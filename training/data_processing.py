@@ -1,4 +1,7 @@
 import pandas as pd
+from aimodel import indicator_kernels as kernels
+from aimodel.feature_engine import FeatureEngine, TRAINING_FEATURES_CONFIG
+from aimodel.window_features import lag_matrix
 
 def process_dataframe(df):
     try:
@@ -6,16 +9,16 @@ def process_dataframe(df):
         if not all(col in df.columns for col in required_columns):
             raise ValueError(f"Input DataFrame must contain the columns: {', '.join(required_columns)}")
 
-        df = df.copy()
+        # astype builds the one new frame; the caller's frame is left untouched
+        numerical_columns = ["open", "high", "low", "close", "volume"]
+        df = df.astype({col: float for col in numerical_columns})
         df["open_time"] = pd.to_datetime(df["open_time"], unit='ms')
         df["close_time"] = pd.to_datetime(df["close_time"], unit='ms')
 
-        numerical_columns = ["open", "high", "low", "close", "volume"]
-        for col in numerical_columns:
-            df[col] = df[col].astype(float)
-
-        df = df.dropna()
-        df = df.sort_values(by="open_time", ascending=True)
+        if df.isna().any(axis=None):
+            df = df.dropna()
+        if not df["open_time"].is_monotonic_increasing:
+            df = df.sort_values(by="open_time", ascending=True)
 
         return df
 
@@ -25,70 +28,29 @@ def process_dataframe(df):
 
 # Function to calculate RSI
 def calculate_rsi(df, column='close', period=14):
-    delta = df[column].diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-
-    avg_gain = gain.rolling(window=period, min_periods=period).mean()
-    avg_loss = loss.rolling(window=period, min_periods=period).mean()
-
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    '''
-    print("Delta:", delta.tail())
-    print("Gain:", gain.tail())
-    print("Loss:", loss.tail())
-    print("Average Gain:", avg_gain.tail())
-    print("Average Loss:", avg_loss.tail())
-    print("RSI:", rsi.tail())
-    '''
-    return rsi
+    rsi = kernels.rsi(df[column].to_numpy(), timeperiod=period, smoothing="sma")
+    return pd.Series(rsi, index=df.index)
 
 # Function to calculate MACD and Signal Line
 def calculate_macd(df, column='close', short_span=12, long_span=26, signal_span=9):
-    ema_12 = df[column].ewm(span=short_span, adjust=False).mean()
-    ema_26 = df[column].ewm(span=long_span, adjust=False).mean()
-    macd = ema_12 - ema_26
-    signal_line = macd.ewm(span=signal_span, adjust=False).mean()
-    '''
-    print("EMA_12:", ema_12.tail().tolist())
-    print("EMA_26:", ema_26.tail().tolist())
-    print("MACD:", (ema_12 - ema_26).tail().tolist())
-    '''
-    return macd, signal_line
+    macd = kernels.macd(df[column].to_numpy(), short_span, long_span, signal_span)
+    return pd.Series(macd[:, 0], index=df.index), pd.Series(macd[:, 1], index=df.index)
 
 # Function to add lagged features
 def add_lagged_features(df, columns, lags):
     for column in columns:
+        lagged = lag_matrix(df[column].to_numpy(), lags)
         for lag in range(1, lags + 1):
-            df[f"{column}_lag_{lag}"] = df[column].shift(lag)
+            df[f"{column}_lag_{lag}"] = lagged[:, lag - 1]
     return df
 
 # Main function to add technical indicators
 def add_technical_indicators(df):
     try:
-        df = df.copy()
-
-        # Add RSI
-        df['RSI_14'] = calculate_rsi(df)
-
-        # Add MACD and Signal Line
-        df['MACD'], df['Signal_Line'] = calculate_macd(df)
-
-        # Debugging MACD calculations
-        print("Debug MACD Calculations:")
-        print(f"EMA_12: {df['MACD'].iloc[-1] if not df.empty else 'N/A'}")
-        print(f"Signal Line: {df['Signal_Line'].iloc[-1] if not df.empty else 'N/A'}")
-
-        # Add lagged features
-        df = add_lagged_features(df, ['close', 'volume'], lags=2)
-
-        # Drop rows with NaN values introduced by rolling or lagging
-        df = df.dropna()
-
-        return df
+        # RSI_14, MACD/Signal_Line and close/volume lags from the shared feature engine;
+        # warm-up rows with NaN values are dropped by the engine
+        return FeatureEngine(TRAINING_FEATURES_CONFIG).compute(df)
 
     except Exception as e:
         print(f"Error adding technical indicators: {e}")
         return None
-
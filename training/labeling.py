@@ -1,23 +1,20 @@
-def add_future_close_and_multiclass_label(df, positive_threshold=0.09, negative_threshold=-0.09):
-    try:
-        df = df.copy()
-        df['future_close'] = df['close'].shift(-1)
-        df['pct_change'] = (df['future_close'] - df['close']) / df['close'] * 100
-
-        # Debugging: Print intermediate DataFrame with pct_change
-        print("\nIntermediate DataFrame with pct_change:")
-        print(df[['close', 'future_close', 'pct_change']])
+import logging
+import numpy as np
+from aimodel import labeling_kernels as kernels
 
-        # Adjusted labeling logic
-        df['label'] = df['pct_change'].apply(
-            lambda x: 2 if x > positive_threshold else (0 if x < negative_threshold else 1)
-        )
+def add_future_close_and_multiclass_label(df, positive_threshold=0.09, negative_threshold=-0.09, label_dtype=np.int64):
+    try:
+        close = df['close'].to_numpy(dtype=np.float64)
+        future_close = kernels.future_values(close, 1)
+        pct_change = kernels.future_change(close, 1)
+        pct_change *= 100
 
-        df = df.dropna()
-        df = df.drop(columns=['pct_change'])
+        # 2 above the positive threshold, 0 below the negative one, 1 in between
+        label = kernels.threshold_labels(pct_change, positive_threshold, negative_threshold, labels=(0, 1, 2), dtype=label_dtype)
 
-        return df
+        df = df.assign(future_close=future_close, label=label)
+        return df.dropna()
 
     except Exception as e:
-        print(f"Error adding future_close and labels: {e}")
+        logging.error(f"Error adding future_close and labels: {e}", exc_info=True)
         return None
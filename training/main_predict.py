@@ -3,8 +3,9 @@ from flask import Flask
 from common import Config, db, get_all_ohlcv_data
 from training.data_processing import process_dataframe, add_technical_indicators
 from training.labeling import add_future_close_and_multiclass_label
-from training.model_training import train_and_save_models  # Updated function
+from training.training_scheduler import train_and_save_models_concurrently
 from training.realtime_prediction import predict_realtime_data
+from aimodel.model_registry import ModelRegistry
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -41,12 +42,11 @@ if __name__ == "__main__":
                         
                         # Specify model types to train
                         model_types = ["random_forest", "logistic_regression", "svm", "xgboost"]
-                        for model_type in model_types:
-                            model_path = os.path.join(MODEL_DIR, f"{model_type}_model.joblib")
-                            train_and_save_models(df_with_labels, feature_columns, MODEL_DIR, model_type=model_type)
+                        # Fit them concurrently, splitting the machine's cores between them
+                        train_and_save_models_concurrently(df_with_labels, feature_columns, MODEL_DIR, model_types, n_cores=os.cpu_count())
 
                         # Step 6: Perform Real-Time Prediction
                         realtime_data = {"close": 105.5}
-                        model_path = os.path.join(MODEL_DIR, "random_forest_model.joblib")  # Example model for prediction
+                        model_path = ModelRegistry(MODEL_DIR).artifact_path("random_forest")  # Latest version of the example model
                         prediction = predict_realtime_data(realtime_data, df_with_labels, model_path)
                         print(f"Real-time prediction: {prediction}")
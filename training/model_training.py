@@ -1,10 +1,39 @@
-from joblib import dump
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.svm import SVC
 from xgboost import XGBClassifier
 from sklearn.metrics import classification_report, accuracy_score
-from sklearn.model_selection import train_test_split
+from aimodel.model_registry import ModelRegistry, data_hash
+from aimodel.time_series_cv import holdout_split
+
+# Estimator factories by model type; ``n_jobs`` is the thread count of the models that can use several cores
+MODEL_FACTORIES = {
+    "random_forest": lambda n_jobs: RandomForestClassifier(random_state=42, n_jobs=n_jobs),
+    "logistic_regression": lambda n_jobs: LogisticRegression(random_state=42, max_iter=1000),
+    "svm": lambda n_jobs: SVC(random_state=42, probability=True),
+    "xgboost": lambda n_jobs: XGBClassifier(random_state=42, eval_metric='logloss', n_jobs=n_jobs),
+}
+
+# Model types whose fit runs on more than one core
+MULTITHREADED_MODELS = {"random_forest", "xgboost"}
+
+def create_model(model_type, n_jobs=None):
+    """
+    Create an untrained estimator of the given type.
+
+    Args:
+        model_type (str): 'random_forest', 'logistic_regression', 'svm' or 'xgboost'.
+        n_jobs (int): Threads for multithreaded models; None keeps the estimator default.
+
+    Returns:
+        The estimator.
+
+    Raises:
+        ValueError: If the model type is not supported.
+    """
+    if model_type not in MODEL_FACTORIES:
+        raise ValueError(f"Unsupported model type: {model_type}")
+    return MODEL_FACTORIES[model_type](n_jobs)
 
 def train_and_save_models(df, features, models_dir, model_type="random_forest"):
     """
@@ -17,22 +46,14 @@ def train_and_save_models(df, features, models_dir, model_type="random_forest"):
         model_type (str): The type of model to train. Options: 'random_forest', 'logistic_regression', 'svm', 'xgboost'.
     """
     try:
-        # Split dataset into training and testing
-        train_df, test_df = train_test_split(df, test_size=0.2, random_state=42)
+        # Split dataset chronologically; the last training label uses the first test close, so it is dropped
+        train_rows, test_rows = holdout_split(len(df), test_size=0.2, gap=1)
+        train_df, test_df = df.iloc[train_rows], df.iloc[test_rows]
         X_train, y_train = train_df[features], train_df['label']
         X_test, y_test = test_df[features], test_df['label']
 
         # Initialize the selected model
-        if model_type == "random_forest":
-            model = RandomForestClassifier(random_state=42)
-        elif model_type == "logistic_regression":
-            model = LogisticRegression(random_state=42, max_iter=1000)
-        elif model_type == "svm":
-            model = SVC(random_state=42, probability=True)
-        elif model_type == "xgboost":
-            model = XGBClassifier(random_state=42, use_label_encoder=False, eval_metric='logloss')
-        else:
-            raise ValueError(f"Unsupported model type: {model_type}")
+        model = create_model(model_type)
 
         # Train the model
         model.fit(X_train, y_train)
@@ -44,10 +65,12 @@ def train_and_save_models(df, features, models_dir, model_type="random_forest"):
         print("Classification Report:")
         print(classification_report(y_test, y_pred))
 
-        # Save the model
-        model_path = f"{models_dir}/{model_type}_model.joblib"
-        dump(model, model_path)
-        print(f"Model saved to {model_path}")
+        # Register the model as a new version
+        version = ModelRegistry(models_dir).register(
+            model_type, model, features, data_hash=data_hash(X_train, y_train),
+            metrics={"accuracy": accuracy_score(y_test, y_pred)}, params=model.get_params()
+        )
+        print(f"Model saved to {version['path']}")
 
     except Exception as e:
         print(f"Error training and saving model: {e}")
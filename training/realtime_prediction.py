@@ -1,14 +1,24 @@
 import os  
-from joblib import load
+from aimodel.feature_engine import FeatureEngine, TRAINING_FEATURES_CONFIG, select_features_config
+from aimodel.model_registry import artifact_metadata, load_predictor
+from aimodel.regime import REGIME_COLUMN, RegimeClassifier
 import pandas as pd
-from training.data_processing import add_technical_indicators
+
+# Inputs of models saved before the registry recorded them
+DEFAULT_FEATURE_COLUMNS = ["open", "high", "low", "close", "volume", "RSI_14", "MACD", "Signal_Line", "close_lag_1", "close_lag_2", "volume_lag_1", "volume_lag_2"]
 
 def predict_realtime_data(realtime_data, historical_data, model_path):
     try:
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"Model not found at {model_path}")
 
-        model = load(model_path)
+        # Cached and memory-mapped: repeated predictions do not reload the model, and tree ensembles use
+        # their compiled predictor
+        model = load_predictor(model_path)
+        metadata = artifact_metadata(model_path)
+        model_inputs = metadata["feature_columns"] if metadata else DEFAULT_FEATURE_COLUMNS
+        regime_config = ((metadata or {}).get("regimes") or {}).get("config")
+        feature_columns = [column for column in model_inputs if column != REGIME_COLUMN]
 
         last_row = historical_data.iloc[-1].copy()
         last_row["close"] = realtime_data["close"]
@@ -16,11 +26,14 @@ def predict_realtime_data(realtime_data, historical_data, model_path):
         last_row["low"] = min(last_row["low"], realtime_data["close"])
 
         historical_data = pd.concat([historical_data, pd.DataFrame([last_row])], ignore_index=True)
-        historical_data = add_technical_indicators(historical_data)
+        if regime_config is not None:
+            # Regime-routed models read the regime of each bar, classified as in training
+            historical_data[REGIME_COLUMN] = RegimeClassifier.from_config(regime_config).classify(historical_data["close"])
+        # Only the indicators behind the model's (possibly pruned) inputs are computed
+        historical_data = FeatureEngine(select_features_config(TRAINING_FEATURES_CONFIG, feature_columns)).compute(historical_data)
 
         latest_features = historical_data.iloc[[-1]]
-        feature_columns = ["open", "high", "low", "close", "volume", "RSI_14", "MACD", "Signal_Line", "close_lag_1", "close_lag_2", "volume_lag_1", "volume_lag_2"]
-        X_realtime = latest_features[feature_columns]
+        X_realtime = latest_features[model_inputs]
 
         prediction = model.predict(X_realtime)
         return prediction[0]
@@ -0,0 +1,135 @@
+import os
+import time
+
+from joblib import Parallel, delayed
+from sklearn.metrics import accuracy_score, classification_report
+from aimodel.model_registry import ModelRegistry, data_hash
+from aimodel.time_series_cv import holdout_split
+
+from training.model_training import MULTITHREADED_MODELS, create_model
+
+
+def allocate_cores(model_types, n_cores=None, max_concurrent=None):
+    """
+    Split a core budget across model fits that run at the same time.
+
+    Every concurrent fit gets one core; the cores left over go round-robin to the multithreaded models
+    (random forest, XGBoost), since logistic regression and SVM fit on a single core anyway. When there are
+    more models than concurrent fits, each of the ``concurrent`` slots owns ``n_cores // concurrent`` cores and
+    a multithreaded model uses all of its slot's.
+
+    Args:
+        model_types (list): Model types to train.
+        n_cores (int): Total core budget. Defaults to all cores.
+        max_concurrent (int): Upper bound on fits running at once. Defaults to one per model, within the budget.
+
+    Returns:
+        tuple: (number of concurrent fits, dict of model type -> ``n_jobs``).
+    """
+    n_cores = max(1, n_cores or os.cpu_count() or 1)
+    concurrent = max(1, min(len(model_types), n_cores, max_concurrent or len(model_types)))
+    allocation = {model_type: 1 for model_type in model_types}
+
+    multithreaded = [model_type for model_type in model_types if model_type in MULTITHREADED_MODELS]
+    if concurrent == len(model_types) and multithreaded:
+        # Every fit runs at once, so the spare cores are known exactly
+        for i in range(n_cores - concurrent):
+            allocation[multithreaded[i % len(multithreaded)]] += 1
+    elif concurrent < len(model_types):
+        # Fits take turns on the concurrent slots, so each multithreaded fit gets a whole slot's share
+        for model_type in multithreaded:
+            allocation[model_type] = n_cores // concurrent
+    return concurrent, allocation
+
+
+def _fit(model_type, n_jobs, X_train, y_train):
+    start = time.perf_counter()
+    model = create_model(model_type, n_jobs=n_jobs)
+    model.fit(X_train, y_train)
+    return model_type, model, time.perf_counter() - start
+
+
+def train_models(X_train, y_train, model_types, n_cores=None, max_concurrent=None):
+    """
+    Fit several models concurrently within a core budget.
+
+    The fits run in worker processes. The feature matrix is handed over once: joblib dumps its array (or the
+    DataFrame's block) to a memory-mapped file that every worker reads, instead of pickling a copy per model.
+
+    Args:
+        X_train (array-like): Feature matrix.
+        y_train (array-like): Labels.
+        model_types (list): Model types to train.
+        n_cores (int): Total core budget. Defaults to all cores.
+        max_concurrent (int): Upper bound on fits running at once.
+
+    Returns:
+        dict: ``models`` (model type -> fitted model), ``fit_seconds`` (model type -> fit time), ``n_jobs``
+        (model type -> threads), ``concurrent``, ``wall_seconds`` and ``serial_seconds`` (sum of the fit times).
+    """
+    concurrent, allocation = allocate_cores(model_types, n_cores, max_concurrent)
+
+    start = time.perf_counter()
+    results = Parallel(n_jobs=concurrent, backend="loky", max_nbytes="1M", mmap_mode="r")(
+        delayed(_fit)(model_type, allocation[model_type], X_train, y_train) for model_type in model_types
+    )
+    wall_seconds = time.perf_counter() - start
+
+    fit_seconds = {model_type: seconds for model_type, _, seconds in results}
+    return {
+        "models": {model_type: model for model_type, model, _ in results},
+        "fit_seconds": fit_seconds,
+        "n_jobs": allocation,
+        "concurrent": concurrent,
+        "wall_seconds": wall_seconds,
+        "serial_seconds": sum(fit_seconds.values()),
+    }
+
+
+def train_and_save_models_concurrently(df, features, models_dir, model_types, n_cores=None, max_concurrent=None):
+    """
+    Concurrent counterpart of ``train_and_save_models`` for several model types on the same split.
+
+    Args:
+        df (DataFrame): The dataset containing features and labels.
+        features (list): List of feature column names.
+        models_dir (str): Directory path to save the models.
+        model_types (list): Model types to train.
+        n_cores (int): Total core budget. Defaults to all cores.
+        max_concurrent (int): Upper bound on fits running at once.
+
+    Returns:
+        dict: The ``train_models`` report plus ``accuracy`` per model type.
+    """
+    try:
+        # Split dataset chronologically; the last training label uses the first test close, so it is dropped
+        train_rows, test_rows = holdout_split(len(df), test_size=0.2, gap=1)
+        train_df, test_df = df.iloc[train_rows], df.iloc[test_rows]
+        X_train, y_train = train_df[features], train_df['label']
+        X_test, y_test = test_df[features], test_df['label']
+
+        report = train_models(X_train, y_train, model_types, n_cores=n_cores, max_concurrent=max_concurrent)
+        report["accuracy"] = {}
+        for model_type, model in report["models"].items():
+            # Evaluate the model
+            y_pred = model.predict(X_test)
+            report["accuracy"][model_type] = accuracy_score(y_test, y_pred)
+            print(f"Model Type: {model_type} (n_jobs={report['n_jobs'][model_type]}, fit {report['fit_seconds'][model_type]:.2f}s)")
+            print("Accuracy:", report["accuracy"][model_type])
+            print("Classification Report:")
+            print(classification_report(y_test, y_pred))
+
+            # Register the model as a new version
+            version = ModelRegistry(models_dir).register(
+                model_type, model, features, data_hash=data_hash(X_train, y_train),
+                metrics={"accuracy": report["accuracy"][model_type]}, params=model.get_params()
+            )
+            print(f"Model saved to {version['path']}")
+
+        print(f"Trained {len(model_types)} models in {report['wall_seconds']:.2f}s wall time "
+              f"({report['serial_seconds']:.2f}s of fitting, {report['concurrent']} at a time)")
+        return report
+
+    except Exception as e:
+        print(f"Error training and saving models: {e}")
+        raise e